@@ -0,0 +1,114 @@
+## Exportación de personas a CSV y a líneas de texto: pico de memoria y
+## filas por segundo de las funciones que construyen todo en memoria
+## (format_data_for_excel, format_data_for_display y la versión anterior
+## con f-strings y join, sin entrecomillar) frente a write_data_for_excel,
+## que escribe al archivo por bloques, e iter_data_for_display.
+## Las personas llegan de un generador, así que la entrada no cuenta.
+## Después compara el tiempo de las mismas funciones con la entrada ya en
+## memoria como lista de diccionarios, como columnas y repartida en un pool
+## de procesos.
+## Uso: python bench_format_data.py [número_filas] [procesos]
+import os
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from format_data import (
+    format_data_for_display,
+    format_data_for_excel,
+    iter_data_for_display,
+    write_data_for_excel,
+)
+
+
+def generate_people(size):
+    for i in range(size):
+        yield {
+            "given_name": f"Nombre{i}",
+            "family_name": f"Apellido{i % 1000}",
+            "title": "Senior Software Engineer",
+        }
+
+
+# Implementación anterior de format_data_for_excel, como referencia.
+def join_excel(people):
+    rows = [f"{p['given_name']},{p['family_name']},{p['title']}" for p in people]
+    return "\n".join(["given,family,title"] + rows)
+
+
+# Cada variante recibe las personas y el archivo de salida, y termina con
+# el resultado escrito en él.
+VARIANTS = {
+    "join (anterior)": lambda people, file: file.write(join_excel(people)),
+    "format_data_for_excel": (
+        lambda people, file: file.write(format_data_for_excel(people))
+    ),
+    "write_data_for_excel": write_data_for_excel,
+    "format_data_for_display": (
+        lambda people, file: file.write("\n".join(format_data_for_display(people)))
+    ),
+    "iter_data_for_display": (
+        lambda people, file: file.writelines(
+            line + "\n" for line in iter_data_for_display(people)
+        )
+    ),
+}
+
+
+# Segundos y pico de memoria asignada (en bytes) de una variante. El
+# tiempo se mide sin tracemalloc, que ralentiza cada asignación.
+def measure(variant, size, path):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        start = time.perf_counter()
+        variant(generate_people(size), file)
+        seconds = time.perf_counter() - start
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        tracemalloc.start()
+        variant(generate_people(size), file)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return seconds, peak, os.path.getsize(path)
+
+
+# Filas por segundo de format_data_for_display y format_data_for_excel
+# con la entrada en memoria: filas, columnas y columnas con workers.
+def engine_rates(size, workers):
+    rows = list(generate_people(size))
+    columns = {
+        name: [person[name] for person in rows]
+        for name in ("given_name", "family_name", "title")
+    }
+    inputs = {
+        "filas": (rows, None),
+        "columnas": (columns, None),
+        f"columnas, {workers} procesos": (columns, workers),
+    }
+    for function in (format_data_for_display, format_data_for_excel):
+        for name, (data, processes) in inputs.items():
+            seconds = min(timeit.repeat(
+                lambda: function(data, workers=processes), number=1, repeat=3
+            ))
+            label = f"{function.__name__} ({name})"
+            print(f"{label:<50}{size / seconds:>12,.0f}")
+
+
+def main(size=1_000_000, workers=os.cpu_count()):
+    print(f"{size} filas")
+    print(f"{'función':<26}{'filas/s':>12}{'pico MiB':>10}{'salida MiB':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "people.csv")
+        for name, variant in VARIANTS.items():
+            seconds, peak, output = measure(variant, size, path)
+            print(
+                f"{name:<26}{size / seconds:>12,.0f}"
+                f"{peak / 2**20:>10.1f}{output / 2**20:>12.1f}"
+            )
+    print()
+    print(f"{'entrada en memoria':<50}{'filas/s':>12}")
+    engine_rates(size, workers)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,84 @@
+## Generación de primos: la comprensión con división de prueba de
+## test_assert_examples.py frente a la criba de un bytearray, la criba
+## segmentada, la criba con NumPy (si está instalado) y Miller-Rabin número
+## a número. Después, para un límite grande, tiempo y pico de memoria de
+## las cribas.
+## Uso: python bench_primes.py [límite_división_prueba] [límite_criba]
+import sys
+import time
+import tracemalloc
+from importlib.util import find_spec
+
+from primes import is_prime, iter_primes, primes_array, primes_up_to
+
+# primes_array solo se mide si NumPy está instalado.
+HAS_NUMPY = find_spec("numpy") is not None
+
+
+# Implementación de test_assert_examples.py, como referencia.
+def trial_division(limit):
+    return {
+        num
+        for num in range(2, limit + 1)
+        if not any(num % div == 0 for div in range(2, num))
+    }
+
+
+def miller_rabin(limit):
+    return [n for n in range(limit + 1) if is_prime(n)]
+
+
+def segmented(limit):
+    return list(iter_primes(limit))
+
+
+# Consume la criba segmentada sin guardar los primos, como un recorrido
+# por streaming.
+def segmented_count(limit):
+    return sum(1 for _ in iter_primes(limit))
+
+
+def timed(function, limit):
+    start = time.perf_counter()
+    function(limit)
+    return time.perf_counter() - start
+
+
+def peak_memory(function, limit):
+    tracemalloc.start()
+    function(limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(trial_limit=20_000, sieve_limit=10_000_000):
+    functions = {
+        "división de prueba": trial_division,
+        "Miller-Rabin": miller_rabin,
+        "primes_up_to": primes_up_to,
+        "iter_primes": segmented,
+    }
+    if HAS_NUMPY:
+        functions["primes_array"] = primes_array
+    print(f"primos hasta {trial_limit}")
+    reference = timed(trial_division, trial_limit)
+    for name, function in functions.items():
+        seconds = timed(function, trial_limit)
+        print(
+            f"{name:<22}{seconds * 1e3:>10.2f}ms"
+            f"{reference / seconds:>10.0f}x"
+        )
+
+    del functions["división de prueba"], functions["Miller-Rabin"]
+    functions["iter_primes (streaming)"] = segmented_count
+    print()
+    print(f"primos hasta {sieve_limit}")
+    for name, function in functions.items():
+        seconds = timed(function, sieve_limit)
+        peak = peak_memory(function, sieve_limit)
+        print(f"{name:<24}{seconds:>8.2f}s{peak / 2**20:>10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -1,33 +1,183 @@
-def format_data_for_display(people):
+import csv
+import io
+import os
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from operator import itemgetter
+
+# Claves de cada persona (o nombres de las columnas), en el orden de
+# salida.
+COLUMNS = ("given_name", "family_name", "title")
+
+# Cabecera de la exportación CSV.
+EXCEL_HEADER = ("given", "family", "title")
+
+# Filas de cada bloque que se formatea de una vez (y, con workers, de cada
+# tarea del pool de procesos). write_data_for_excel escribe un bloque por
+# llamada a write: limita la memoria sin hacer una escritura por fila.
+CHUNK_ROWS = 10_000
+
+# Columnas de cada persona en el orden de la cabecera.
+_excel_row = itemgetter(*COLUMNS)
+
+
+def format_data_for_display(people, workers=None):
     """
     Recibe una lista de diccionarios con las claves:
     - given_name
     - family_name
     - title
 
+    o, en formato columnar, un diccionario con esas tres claves y una
+    lista (o array) por columna.
+
     Devuelve una lista de strings con el formato:
     "Nombre Apellido: Cargo"
+
+    Con workers > 1 los bloques de CHUNK_ROWS filas se formatean en un
+    pool de ese número de procesos, conservando el orden. Cada bloque se
+    serializa de ida y de vuelta, así que solo compensa con varios núcleos
+    libres y entradas grandes.
+    """
+    return list(iter_data_for_display(people, workers))
+
+
+def iter_data_for_display(people, workers=None):
+    """
+    Versión perezosa de format_data_for_display: recibe cualquier
+    iterable de diccionarios (también un generador) o columnas y produce
+    las líneas bloque a bloque, sin construir la lista.
     """
-    return [f"{p['given_name']} {p['family_name']}: {p['title']}" for p in people]
+    blocks = _format_blocks(_display_block, people, CHUNK_ROWS, workers)
+    return chain.from_iterable(blocks)
 
 
-def format_data_for_excel(people):
+def format_data_for_excel(people, workers=None):
     """
     Recibe una lista de diccionarios con las claves:
     - given_name
     - family_name
     - title
 
+    o, en formato columnar, un diccionario con esas tres claves y una
+    lista (o array) por columna.
+
     Devuelve un string en formato CSV con cabecera:
     given,family,title
     nombre,apellido,cargo
+
+    Los campos con comas, comillas o saltos de línea se entrecomillan.
+    Con workers > 1 los bloques se formatean en un pool de procesos (ver
+    format_data_for_display). Para exportaciones grandes,
+    write_data_for_excel escribe el CSV en un archivo sin construir el
+    string completo.
+    """
+    blocks = _format_blocks(_csv_block, people, CHUNK_ROWS, workers)
+    header = ",".join(EXCEL_HEADER) + "\n"
+    # Sin el salto de línea de la última fila.
+    return "".join(chain([header], (text for _, text in blocks)))[:-1]
+
+
+def write_data_for_excel(people, destination, chunk_rows=CHUNK_ROWS,
+                         workers=None):
+    """
+    Escribe en destination (una ruta o un archivo de texto abierto) el
+    mismo CSV que format_data_for_excel, terminado en salto de línea.
+
+    people puede ser cualquier iterable (también un generador) o columnas:
+    se recorre una sola vez y en memoria solo se tienen chunk_rows filas a
+    la vez (con workers > 1, unos pocos bloques por proceso), que se
+    escriben en el archivo de una vez. Las rutas se abren en UTF-8 y se
+    cierran al terminar; los archivos abiertos no se cierran.
+
+    Devuelve el número de filas escritas, sin contar la cabecera.
+    """
+    if chunk_rows < 1:
+        raise ValueError("Chunk rows must be a positive number")
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "w", encoding="utf-8", newline="") as file:
+            return write_data_for_excel(people, file, chunk_rows, workers)
+    destination.write(",".join(EXCEL_HEADER) + "\n")
+    count = 0
+    for rows, text in _format_blocks(_csv_block, people, chunk_rows, workers):
+        destination.write(text)
+        count += rows
+    return count
+
+
+def _rows(people):
+    """
+    Tuplas (nombre, apellido, cargo) de una lista de diccionarios o de un
+    diccionario de columnas.
+    """
+    if isinstance(people, Mapping):
+        columns = [people[name] for name in COLUMNS]
+        if len({len(column) for column in columns}) > 1:
+            raise ValueError("Columns must have the same length")
+        return zip(*columns)
+    return map(_excel_row, people)
+
+
+def _format_blocks(function, people, chunk_rows, workers):
+    """
+    Aplica function a cada bloque de hasta chunk_rows filas y produce los
+    resultados en orden.
+
+    Con workers > 1 y más de un bloque, los bloques se reparten en un pool
+    de procesos con como mucho dos tareas pendientes por proceso, así que
+    un generador de entrada no se carga entero en memoria.
+    """
+    rows = _rows(people)
+    blocks = iter(lambda: list(islice(rows, chunk_rows)), [])
+    first = next(blocks, None)
+    if first is None:
+        return
+    if not workers or workers < 2 or len(first) < chunk_rows:
+        yield function(first)
+        yield from map(function, blocks)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for block in chain([first], blocks):
+            pending.append(executor.submit(function, block))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _display_block(rows):
+    """Líneas "Nombre Apellido: Cargo" de un bloque de filas."""
+    return [f"{given} {family}: {title}" for given, family, title in rows]
+
+
+def _csv_block(rows):
+    """
+    CSV de un bloque de filas como par (filas, texto), cada fila terminada
+    en salto de línea.
+
+    Si todos los campos son strings cada fila se une con ",".join; si no,
+    con f-strings, como el formato original. Solo si el texto revela algún
+    campo que necesite comillas (con comas, comillas o saltos de línea) se
+    rehace con el módulo csv, bastante más lento.
     """
-    # Cabecera CSV
-    cabecera = "given,family,title"
-    # Filas con los datos de cada persona
-    filas = [
-        f"{p['given_name']},{p['family_name']},{p['title']}"
-        for p in people
-    ]
-    # Unir cabecera + filas separadas por salto de línea
-    return "\n".join([cabecera] + filas)
+    try:
+        text = "\n".join(map(",".join, rows)) + "\n"
+    except TypeError:
+        text = "".join([
+            f"{given},{family},{title}\n" for given, family, title in rows
+        ])
+    if (
+        text.count(",") != 2 * len(rows)
+        or text.count("\n") != len(rows)
+        or '"' in text
+        or "\r" in text
+    ):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        # str() como las f-strings (csv escribiría None como vacío).
+        writer.writerows([map(str, row) for row in rows])
+        text = buffer.getvalue()
+    return len(rows), text
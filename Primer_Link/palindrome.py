@@ -0,0 +1,149 @@
+import mmap
+import re
+
+# Caracteres que se leen de cada extremo en cada paso del recorrido con dos
+# punteros: acota la memoria a dos bloques normalizados, sea cual sea el
+# tamaño del texto.
+CHUNK_SIZE = 64 * 1024
+
+# Todo lo que no es alfanumérico según str.isalnum (\w equivale a isalnum
+# más el guion bajo).
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+# Bytes que no son alfanuméricos ASCII, como bytes.isalnum.
+_NON_ALNUM_BYTES = bytes(
+    byte for byte in range(256) if not bytes([byte]).isalnum()
+)
+
+
+def is_palindrome(text, chunk_size=CHUNK_SIZE):
+    """
+    Verifica si un texto es un palíndromo, ignorando mayúsculas, espacios
+    y signos de puntuación.
+
+    text puede ser un str o un objeto de bytes (bytes, bytearray,
+    memoryview o mmap); con bytes solo cuentan las letras y los dígitos
+    ASCII.
+
+    Recorre el texto con dos punteros, uno desde cada extremo, saltando lo
+    que no es alfanumérico y terminando en la primera diferencia. En lugar
+    de construir la copia normalizada completa y su inversa, normaliza
+    bloques de chunk_size caracteres de cada extremo, así que la memoria
+    no depende del tamaño del texto.
+    """
+    if isinstance(text, str):
+        normalize = _normalize_str
+    else:
+        normalize = _normalize_bytes
+    if len(text) <= chunk_size:
+        normalized = normalize(text)
+        return normalized == normalized[::-1]
+    return _two_pointer_check(text, normalize, chunk_size)
+
+
+def is_palindrome_file(path, chunk_size=CHUNK_SIZE):
+    """
+    Verifica si el contenido de un archivo es un palíndromo (con las reglas
+    de is_palindrome para bytes) proyectándolo en memoria con mmap: el
+    sistema operativo carga solo las páginas que se leen, así que admite
+    archivos de varios gigabytes.
+    """
+    with open(path, "rb") as file:
+        # mmap no admite archivos vacíos.
+        if not file.seek(0, 2):
+            return True
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return is_palindrome(data, chunk_size)
+
+
+def check_many(texts):
+    """
+    Aplica is_palindrome a cada texto de un iterable y devuelve la lista
+    de resultados en el mismo orden.
+    """
+    return [is_palindrome(text) for text in texts]
+
+
+def longest_palindrome(text):
+    """
+    Devuelve la subcadena palindrómica más larga de text (str o bytes),
+    literal, sin ignorar mayúsculas ni puntuación; si hay varias de la
+    misma longitud, la primera.
+
+    Usa el algoritmo de Manacher, lineal en la longitud del texto: reutiliza
+    el radio del palíndromo reflejado respecto al centro del palíndromo que
+    llega más a la derecha, así que cada comparación nueva amplía ese
+    límite. Los palíndromos de longitud impar y par se calculan por
+    separado, sin intercalar separadores en una copia del texto.
+    """
+    n = len(text)
+    best_start, best_length = 0, 0
+    # Radios de los palíndromos impares (centro en i) y pares (centro
+    # entre i - 1 e i).
+    for odd in (True, False):
+        radii = [0] * n
+        left, right = 0, -1
+        for i in range(n):
+            if i > right:
+                radius = 1 if odd else 0
+            else:
+                mirror = left + right - i + (0 if odd else 1)
+                radius = min(radii[mirror], right - i + 1)
+            offset = 0 if odd else 1
+            while (
+                i - radius - offset >= 0
+                and i + radius < n
+                and text[i - radius - offset] == text[i + radius]
+            ):
+                radius += 1
+            radii[i] = radius
+            if i + radius - 1 > right:
+                left, right = i - radius - offset + 1, i + radius - 1
+            length = 2 * radius - 1 if odd else 2 * radius
+            start = i - radius + 1 if odd else i - radius
+            if length > best_length:
+                best_start, best_length = start, length
+    return text[best_start:best_start + best_length]
+
+
+def _normalize_str(text):
+    """Letras y dígitos de text en minúsculas, carácter a carácter."""
+    # map(str.lower) conserva la minúscula de cada carácter (str.lower del
+    # texto entero convertiría una sigma final en ς).
+    return "".join(map(str.lower, _NON_ALNUM.sub("", text)))
+
+
+def _normalize_bytes(data):
+    """Letras y dígitos ASCII de data en minúsculas."""
+    return bytes(data).translate(None, _NON_ALNUM_BYTES).lower()
+
+
+def _two_pointer_check(text, normalize, chunk_size):
+    """
+    Compara el principio normalizado de text con su final normalizado e
+    invertido, leyendo bloques de chunk_size caracteres de cada extremo
+    hasta que los punteros se cruzan o aparece una diferencia.
+    """
+    start, end = 0, len(text)
+    # Parte normalizada ya leída de cada extremo y aún no comparada; la del
+    # final, invertida.
+    front = back = normalize(text[:0])
+    while start < end:
+        if not front:
+            stop = min(start + chunk_size, end)
+            front = normalize(text[start:stop])
+            start = stop
+            continue
+        if not back:
+            stop = max(end - chunk_size, start)
+            back = normalize(text[stop:end])[::-1]
+            end = stop
+            continue
+        size = min(len(front), len(back))
+        if front[:size] != back[:size]:
+            return False
+        front, back = front[size:], back[size:]
+    # Los punteros se han cruzado: lo que queda sin comparar es el centro
+    # del texto, leído desde un extremo o desde el otro.
+    middle = front + back[::-1]
+    return middle == middle[::-1]
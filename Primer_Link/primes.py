@@ -0,0 +1,151 @@
+from itertools import compress
+from math import isqrt
+
+# Números impares de cada segmento de iter_primes: la criba segmentada
+# solo tiene en memoria un bytearray de este tamaño y los primos base
+# hasta la raíz del límite.
+SEGMENT_SIZE = 1 << 18
+
+# Primos pequeños: divisores de prueba rápidos y bases de Miller-Rabin. Con
+# estas 13 bases el test es determinista para todo n < 3.3 * 10**24, que
+# incluye todos los enteros de 64 bits.
+_SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def primes_up_to(limit):
+    """
+    Devuelve la lista de primos menores o iguales que limit, en orden.
+
+    Usa la criba de Eratóstenes sobre un bytearray con un byte por número
+    impar (los pares no se guardan): cada primo tacha sus múltiples con una
+    sola asignación por slice, que recorre la memoria en C.
+    """
+    if limit < 2:
+        return []
+    sieve = _odd_sieve(limit)
+    return [2, *compress(range(1, limit + 1, 2), sieve)]
+
+
+def iter_primes(limit=None, segment_size=SEGMENT_SIZE):
+    """
+    Genera los primos menores o iguales que limit (sin límite si es None)
+    en orden, con una criba segmentada.
+
+    Cada segmento cubre segment_size números impares consecutivos y se
+    criba con los primos base hasta la raíz de su final, así que la
+    memoria no depende del límite: sirve para recorrer primos hasta
+    límites muy grandes o hasta que el consumidor pare.
+    """
+    if segment_size < 1:
+        raise ValueError("Segment size must be a positive number")
+    if limit is not None and limit < 2:
+        return
+    yield 2
+    base_primes = []
+    base_limit = 1
+    low = 3
+    while limit is None or low <= limit:
+        high = low + 2 * segment_size
+        if limit is not None:
+            high = min(high, limit + 1)
+        root = isqrt(high - 1)
+        if root > base_limit:
+            # Se amplían de golpe al doble para no recalcularlos en cada
+            # segmento.
+            base_limit = max(root, 2 * base_limit)
+            base_primes = primes_up_to(base_limit)[1:]
+        numbers = range(low, high, 2)
+        segment = bytearray([1]) * len(numbers)
+        for prime in base_primes:
+            square = prime * prime
+            if square >= high:
+                break
+            # Primer múltiplo impar de prime en el segmento, sin tachar el
+            # propio primo.
+            start = max(square, -(-low // prime) * prime)
+            if not start & 1:
+                start += prime
+            index = (start - low) // 2
+            multiples = len(range(index, len(numbers), prime))
+            segment[index::prime] = bytes(multiples)
+        yield from compress(numbers, segment)
+        low = high
+
+
+def primes_array(limit):
+    """
+    Versión vectorizada de primes_up_to con NumPy: devuelve un array de
+    int64 con los primos menores o iguales que limit. Requiere numpy, que
+    solo se importa al llamarla.
+    """
+    import numpy as np
+
+    if limit < 2:
+        return np.array([], dtype=np.int64)
+    sieve = np.ones((limit + 1) // 2, dtype=bool)
+    sieve[0] = False
+    for index in range(1, (isqrt(limit) - 1) // 2 + 1):
+        if sieve[index]:
+            prime = 2 * index + 1
+            sieve[prime * prime // 2::prime] = False
+    primes = 2 * np.flatnonzero(sieve).astype(np.int64) + 1
+    return np.concatenate((np.array([2], dtype=np.int64), primes))
+
+
+def is_prime(n):
+    """
+    Verifica si un entero es primo con el test de Miller-Rabin.
+
+    Con las bases de _SMALL_PRIMES el resultado es exacto para todo n
+    menor que 3.3 * 10**24 (todos los enteros de 64 bits); por encima es
+    un test de primo probable muy fiable. Cada comprobación es
+    O(log(n)**3), sin recorrer los divisores.
+    """
+    if n < 2:
+        return False
+    for prime in _SMALL_PRIMES:
+        if n % prime == 0:
+            return n == prime
+    # n - 1 = d * 2**s con d impar.
+    s = ((n - 1) & (1 - n)).bit_length() - 1
+    d = (n - 1) >> s
+    for base in _SMALL_PRIMES:
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def next_prime(n):
+    """
+    Devuelve el menor primo mayor o igual que n, por ejemplo para elegir
+    una capacidad prima para una tabla hash.
+    """
+    if n <= 2:
+        return 2
+    candidate = n | 1
+    while not is_prime(candidate):
+        candidate += 2
+    return candidate
+
+
+def _odd_sieve(limit):
+    """
+    Criba de Eratóstenes de los impares hasta limit: el byte i vale 1 si
+    2 * i + 1 es primo.
+    """
+    size = (limit + 1) // 2
+    sieve = bytearray([1]) * size
+    sieve[0] = 0
+    for index in range(1, (isqrt(limit) - 1) // 2 + 1):
+        if sieve[index]:
+            prime = 2 * index + 1
+            start = prime * prime // 2
+            sieve[start::prime] = bytes(len(range(start, size, prime)))
+    return sieve
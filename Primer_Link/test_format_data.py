@@ -1,5 +1,15 @@
 import pytest
-from format_data import format_data_for_display, format_data_for_excel
+import csv
+import io
+from itertools import count, islice
+
+import format_data
+from format_data import (
+    format_data_for_display,
+    format_data_for_excel,
+    iter_data_for_display,
+    write_data_for_excel,
+)
 ## Este test verifica las funciones de formateo de datos para visualización y exportación a Excel.
 @pytest.fixture
 def example_people_data():
@@ -25,4 +35,125 @@ def test_format_data_for_display(example_people_data):
 def test_format_data_for_excel(example_people_data):
     assert format_data_for_excel(example_people_data) == """given,family,title
 Jorge,Vazquez,Senior Software Engineer
-Pedro,Perez,Project Manager"""
\ No newline at end of file
+Pedro,Perez,Project Manager"""
+
+## Genera personas bajo demanda, como una consulta que devuelve millones
+## de filas.
+def generate_people(size):
+    for i in range(size):
+        yield {"given_name": f"Nombre{i}", "family_name": "Apellido", "title": "Cargo"}
+
+
+## Los campos con comas, comillas o saltos de línea se entrecomillan y el
+## CSV se lee de vuelta con los mismos valores.
+def test_format_data_for_excel_quotes_fields():
+    people = [
+        {"given_name": "Ana, María", "family_name": 'O"Neil', "title": "Jefa\nde área"},
+    ]
+    output = format_data_for_excel(people)
+    assert output == 'given,family,title\n"Ana, María","O""Neil","Jefa\nde área"'
+    assert list(csv.reader(io.StringIO(output))) == [
+        ["given", "family", "title"],
+        ["Ana, María", 'O"Neil', "Jefa\nde área"],
+    ]
+
+
+## write_data_for_excel escribe el mismo CSV en un archivo abierto o en una
+## ruta y devuelve el número de filas.
+def test_write_data_for_excel(example_people_data, tmp_path):
+    file = io.StringIO()
+    assert write_data_for_excel(example_people_data, file) == 2
+    assert file.getvalue() == format_data_for_excel(example_people_data) + "\n"
+
+    path = tmp_path / "people.csv"
+    assert write_data_for_excel(iter(example_people_data), path) == 2
+    assert path.read_text(encoding="utf-8") == file.getvalue()
+    assert write_data_for_excel([], str(path)) == 0
+    assert path.read_text(encoding="utf-8") == "given,family,title\n"
+
+
+## Escribe la cabecera y después bloques de chunk_rows filas, una llamada a
+## write por bloque, recorriendo un generador una sola vez.
+@pytest.mark.parametrize("size", [0, 4, 5, 11])
+def test_write_data_for_excel_in_chunks(size):
+    class RecordingFile(io.StringIO):
+        def __init__(self):
+            super().__init__()
+            self.writes = []
+
+        def write(self, text):
+            self.writes.append(text)
+            return super().write(text)
+
+    file = RecordingFile()
+    assert write_data_for_excel(generate_people(size), file, chunk_rows=5) == size
+    assert len(file.writes) == 1 + -(-size // 5)
+    assert file.getvalue() == format_data_for_excel(generate_people(size)) + "\n"
+    with pytest.raises(ValueError):
+        write_data_for_excel([], file, chunk_rows=0)
+
+
+## iter_data_for_display produce las líneas bajo demanda, también de un
+## iterable infinito.
+def test_iter_data_for_display(example_people_data):
+    assert list(iter_data_for_display(iter(example_people_data))) == (
+        format_data_for_display(example_people_data)
+    )
+    people = ({"given_name": i, "family_name": "X", "title": "Y"} for i in count())
+    assert list(islice(iter_data_for_display(people), 3)) == [
+        "0 X: Y",
+        "1 X: Y",
+        "2 X: Y",
+    ]
+
+
+## Convierte una lista de personas al formato columnar.
+def to_columns(people):
+    return {
+        name: [p[name] for p in people]
+        for name in ("given_name", "family_name", "title")
+    }
+
+
+## En formato columnar la salida es idéntica a la de las filas, también
+## con campos que necesitan comillas o que no son strings.
+def test_format_columns(example_people_data):
+    people = example_people_data + [
+        {"given_name": "Ana, María", "family_name": 'O"Neil', "title": None},
+        {"given_name": 7, "family_name": 3.5, "title": "Intern"},
+    ]
+    columns = to_columns(people)
+    assert format_data_for_display(columns) == format_data_for_display(people)
+    assert format_data_for_excel(columns) == format_data_for_excel(people)
+    assert format_data_for_excel(to_columns(example_people_data)) == (
+        format_data_for_excel(example_people_data)
+    )
+    file = io.StringIO()
+    assert write_data_for_excel(columns, file) == 4
+    assert file.getvalue() == format_data_for_excel(people) + "\n"
+
+    with pytest.raises(ValueError):
+        format_data_for_excel({**columns, "title": ["Cargo"]})
+
+
+## Con workers los bloques se formatean en un pool de procesos y la salida
+## es idéntica y en el mismo orden.
+def test_format_in_parallel(monkeypatch, tmp_path):
+    monkeypatch.setattr(format_data, "CHUNK_ROWS", 7)
+    people = list(generate_people(100))
+    people[50]["title"] = "Jefe, área"
+
+    for data in (people, to_columns(people)):
+        assert format_data_for_display(data, workers=2) == (
+            format_data_for_display(people)
+        )
+        assert format_data_for_excel(data, workers=2) == (
+            format_data_for_excel(people)
+        )
+    path = tmp_path / "people.csv"
+    assert write_data_for_excel(
+        generate_people(100), path, chunk_rows=9, workers=3
+    ) == 100
+    assert path.read_text(encoding="utf-8") == (
+        format_data_for_excel(generate_people(100)) + "\n"
+    )
@@ -1,9 +1,20 @@
 from pickle import FALSE
 
+import random
+
 import pytest
-## Esta función verifica si una cadena es un palíndromo,
-## ignorando mayúsculas, espacios y signos de puntuación.
-def is_palindrome(s):
+
+from palindrome import (
+    check_many,
+    is_palindrome,
+    is_palindrome_file,
+    longest_palindrome,
+)
+
+
+## Implementación original con copias normalizada e invertida, como
+## referencia.
+def copy_is_palindrome(s):
     normalized = ''.join(c.lower() for c in s if c.isalnum())
     return normalized == normalized[::-1]
 
@@ -19,4 +30,80 @@ def is_palindrome(s):
     ("abab", False),
 ])
 def test_is_palindrome(maybe_palindrome, expected_result):
-    assert is_palindrome(maybe_palindrome) == expected_result
\ No newline at end of file
+    assert is_palindrome(maybe_palindrome) == expected_result
+
+
+## Con bloques pequeños, el recorrido con dos punteros da el mismo
+## resultado que la versión con copias, también con caracteres no ASCII.
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7])
+def test_two_pointer_matches_copies(chunk_size):
+    rng = random.Random(chunk_size)
+    alphabet = "aAbB1 ,.¿?ÁáΣσ_"
+    for _ in range(2000):
+        half = "".join(rng.choices(alphabet, k=rng.randrange(12)))
+        text = half + rng.choice(["", "x", ", "]) + half[::-1]
+        if rng.random() < 0.5:
+            text = "".join(rng.choices(alphabet, k=rng.randrange(25)))
+        assert is_palindrome(text, chunk_size) == copy_is_palindrome(text)
+
+
+## Con bytes solo cuentan las letras y los dígitos ASCII, y se admiten
+## bytes, bytearray y memoryview sin convertirlos a str.
+@pytest.mark.parametrize("chunk_size", [2, 64])
+def test_is_palindrome_bytes(chunk_size):
+    data = "Anita lava la tiña, ¿eh? añitA".encode()
+    assert is_palindrome(b"A man, a plan, a canal: Panama!", chunk_size)
+    assert not is_palindrome(b"abca", chunk_size)
+    assert is_palindrome(bytearray(b"No 'x' in Nixon"), chunk_size)
+    assert is_palindrome(memoryview(b"Step on no pets"), chunk_size)
+    assert is_palindrome(data, chunk_size) is copy_is_palindrome(
+        data.decode("ascii", "ignore")
+    )
+
+
+## Los archivos se comprueban proyectados en memoria, por bloques.
+def test_is_palindrome_file(tmp_path):
+    path = tmp_path / "text.txt"
+    half = b"Dabale arroz a la zorra el abad. " * 1000
+    path.write_bytes(half + half[::-1])
+    assert is_palindrome_file(path, chunk_size=1000)
+    path.write_bytes(half + b"x" + half + b"y")
+    assert not is_palindrome_file(path, chunk_size=1000)
+    path.write_bytes(b"")
+    assert is_palindrome_file(path)
+
+
+## check_many devuelve un resultado por texto, en orden.
+def test_check_many():
+    assert check_many(["Bob", "abc", "", b"Ana"]) == [True, False, True, True]
+    assert check_many(iter([])) == []
+
+
+## longest_palindrome coincide con la búsqueda por fuerza bruta.
+@pytest.mark.parametrize("text, expected", [
+    ("", ""),
+    ("a", "a"),
+    ("babad", "bab"),
+    ("cbbd", "bb"),
+    ("forgeeksskeegfor", "geeksskeeg"),
+    (b"xabacabay", b"abacaba"),
+])
+def test_longest_palindrome(text, expected):
+    assert longest_palindrome(text) == expected
+
+
+def test_longest_palindrome_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(500):
+        text = "".join(rng.choices("ab", k=rng.randrange(20)))
+        expected = max(
+            (
+                text[i:j]
+                for i in range(len(text))
+                for j in range(i + 1, len(text) + 1)
+                if text[i:j] == text[i:j][::-1]
+            ),
+            key=len,
+            default="",
+        )
+        assert longest_palindrome(text) == expected
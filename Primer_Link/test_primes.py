@@ -0,0 +1,82 @@
+from itertools import islice
+
+import pytest
+
+from primes import (
+    iter_primes,
+    is_prime,
+    next_prime,
+    primes_array,
+    primes_up_to,
+)
+
+
+## Primos por división de prueba, como en test_assert_examples.py, como
+## referencia.
+def trial_division_primes(limit):
+    return [
+        num
+        for num in range(2, limit + 1)
+        if not any(num % div == 0 for div in range(2, num))
+    ]
+
+
+EXPECTED = trial_division_primes(2000)
+
+
+## La criba coincide con la división de prueba en cualquier límite,
+## incluidos los que son primos, cuadrados o menores que 2.
+@pytest.mark.parametrize(
+    "limit", [-5, 0, 1, 2, 3, 4, 9, 25, 49, 97, 100, 2000]
+)
+def test_primes_up_to(limit):
+    expected = [prime for prime in EXPECTED if prime <= limit]
+    assert primes_up_to(limit) == expected
+
+
+## La criba segmentada da los mismos primos con segmentos de cualquier
+## tamaño, y sin límite genera primos mientras se pidan.
+@pytest.mark.parametrize("segment_size", [1, 2, 7, 64, 1 << 18])
+def test_iter_primes(segment_size):
+    for limit in (1, 2, 3, 10, 11, 121, 2000):
+        expected = [prime for prime in EXPECTED if prime <= limit]
+        assert list(iter_primes(limit, segment_size)) == expected
+    unbounded = iter_primes(segment_size=segment_size)
+    assert list(islice(unbounded, len(EXPECTED))) == EXPECTED
+    assert list(iter_primes(10**6, segment_size=1000)) == primes_up_to(10**6)
+    with pytest.raises(ValueError):
+        next(iter_primes(10, segment_size=0))
+
+
+## La versión con NumPy devuelve los mismos primos.
+def test_primes_array():
+    np = pytest.importorskip("numpy")
+    for limit in (0, 1, 2, 3, 100, 2000, 10**5):
+        primes = primes_array(limit)
+        assert primes.dtype == np.int64
+        assert primes.tolist() == primes_up_to(limit)
+
+
+## Miller-Rabin coincide con la criba y acierta con primos y compuestos de
+## 64 bits, incluidos los pseudoprimos fuertes para las bases pequeñas.
+def test_is_prime():
+    sieve = set(primes_up_to(10**5))
+    assert [n for n in range(-10, 10**5) if is_prime(n)] == sorted(sieve)
+
+    assert is_prime(2**61 - 1)
+    assert is_prime(18446744073709551557)  # Mayor primo de 64 bits.
+    assert not is_prime(2**64 - 1)
+    assert not is_prime(3215031751)  # Pseudoprimo fuerte para 2, 3, 5 y 7.
+    assert not is_prime(3825123056546413051)  # Para las bases hasta 23.
+    # Pseudoprimo fuerte para las bases hasta 37, por debajo de 3.3 * 10**24.
+    assert not is_prime(318665857834031151167461)
+    assert not is_prime((2**31 - 1) * (2**61 - 1))
+
+
+## next_prime devuelve el menor primo mayor o igual que n.
+@pytest.mark.parametrize("n, expected", [
+    (-3, 2), (0, 2), (2, 2), (3, 3), (4, 5), (14, 17), (97, 97), (100, 101),
+    (2**32, 4294967311),
+])
+def test_next_prime(n, expected):
+    assert next_prime(n) == expected
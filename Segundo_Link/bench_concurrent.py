@@ -0,0 +1,72 @@
+## Rendimiento multihilo: ConcurrentHashTable frente a una HashTable
+## protegida por un único lock, con 90% lecturas y 10% escrituras. Solo
+## escala con el número de hilos en builds de CPython sin GIL.
+## Uso: python bench_concurrent.py [operaciones_por_hilo]
+import random
+import sys
+import threading
+import time
+
+from concurrent_hashtable import ConcurrentHashTable
+from hashtable import HashTable
+
+
+# HashTable compartida con un lock global para lecturas y escrituras.
+class LockedHashTable:
+    def __init__(self):
+        self._table = HashTable()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._table.get(key, default)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._table[key] = value
+
+
+def worker(hash_table, operations, seed, barrier):
+    rng = random.Random(seed)
+    keys = [rng.randrange(100_000) for _ in range(operations)]
+    barrier.wait()
+    for i, key in enumerate(keys):
+        if i % 10 == 0:
+            hash_table[key] = i
+        else:
+            hash_table.get(key)
+
+
+# Operaciones por segundo con threads hilos trabajando a la vez.
+def throughput(hash_table, threads, operations):
+    for key in range(0, 100_000, 2):
+        hash_table[key] = key
+    barrier = threading.Barrier(threads + 1)
+    workers = [
+        threading.Thread(
+            target=worker, args=(hash_table, operations, seed, barrier)
+        )
+        for seed in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * operations / (time.perf_counter() - start)
+
+
+def main(operations=200_000):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    state = "activo" if gil else "desactivado"
+    print(f"{operations} operaciones por hilo, GIL {state}")
+    print(f"{'hilos':<7}{'lock global ops/s':>20}{'concurrente ops/s':>20}")
+    for threads in (1, 2, 4, 8):
+        locked = throughput(LockedHashTable(), threads, operations)
+        striped = throughput(ConcurrentHashTable(), threads, operations)
+        print(f"{threads:<7}{locked:>20,.0f}{striped:>20,.0f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,73 @@
+## Conteo de frecuencias de un flujo de tokens con HashTable: el patrón de
+## dos pasos (get seguido de asignación, o in seguido de [] y asignación),
+## que busca cada token dos o tres veces, frente a increment y
+## update_with, que lo buscan una sola vez. dict como referencia.
+## Uso: python bench_counting.py [número_tokens] [vocabulario]
+import random
+import sys
+import time
+
+from hashtable import HashTable
+
+
+# Flujo de tokens con frecuencias de Zipf (el de rango r aparece con
+# probabilidad proporcional a 1/r), como las palabras de un texto.
+def token_stream(size, vocabulary):
+    words = [f"token{rank}" for rank in range(vocabulary)]
+    weights = [1 / rank for rank in range(1, vocabulary + 1)]
+    return random.Random(0).choices(words, weights, k=size)
+
+
+def count_get_and_set(table, tokens):
+    for token in tokens:
+        table[token] = table.get(token, 0) + 1
+
+
+def count_contains_and_set(table, tokens):
+    for token in tokens:
+        if token in table:
+            table[token] += 1
+        else:
+            table[token] = 1
+
+
+def count_increment(table, tokens):
+    increment = table.increment
+    for token in tokens:
+        increment(token)
+
+
+def count_update_with(table, tokens):
+    update_with = table.update_with
+    for token in tokens:
+        update_with(token, lambda count: count + 1, 0)
+
+
+def main(size=10_000_000, vocabulary=50_000):
+    tokens = token_stream(size, vocabulary)
+    expected = {}
+    start = time.perf_counter()
+    for token in tokens:
+        expected[token] = expected.get(token, 0) + 1
+    reference = time.perf_counter() - start
+    print(f"{size} tokens, {len(expected)} distintos")
+    print(f"{'dict get + set':<24}{reference:>8.2f}s")
+    variants = {
+        "get + set": count_get_and_set,
+        "in + [] + set": count_contains_and_set,
+        "update_with": count_update_with,
+        "increment": count_increment,
+    }
+    baseline = None
+    for name, count in variants.items():
+        table = HashTable()
+        start = time.perf_counter()
+        count(table, tokens)
+        seconds = time.perf_counter() - start
+        assert dict(table.items_view()) == expected
+        baseline = baseline or seconds
+        print(f"{name:<24}{seconds:>8.2f}s{baseline / seconds:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,72 @@
+## Peor caso de las búsquedas con hashing cuckoo frente al resto de
+## estrategias: ranuras visitadas como máximo en aciertos y fallos y
+## latencia p99 y máxima (sin instrumentar), con tablas llenas al 2/3 y
+## al 90% y claves uniformes, agrupadas y adversarias.
+## Uso: python bench_cuckoo.py [número_claves]
+import sys
+import time
+
+from bench_probing import CountingHashTable, key_sets, probe_lengths
+from hashtable import (
+    CUCKOO_BUCKET_SIZE,
+    CUCKOO_HASHES,
+    PROBING_STRATEGIES,
+    HashTable,
+)
+
+LOAD_FACTORS = (2 / 3, 0.9)
+
+
+# Tabla de la clase dada con las claves, llena hasta load_factor.
+def build(cls, keys, load_factor, probing):
+    hash_table = cls(
+        capacity=int(len(keys) / load_factor) + 1,
+        max_load_factor=load_factor,
+        probing=probing,
+    )
+    for key in keys:
+        hash_table[key] = key
+    return hash_table
+
+
+# Latencias de búsqueda de cada clave, en nanosegundos, ordenadas.
+def lookup_latencies(hash_table, keys):
+    clock = time.perf_counter_ns
+    latencies = []
+    for key in keys:
+        start = clock()
+        key in hash_table
+        latencies.append(clock() - start)
+    return sorted(latencies)
+
+
+def percentile(sorted_values, fraction):
+    position = int(len(sorted_values) * fraction)
+    return sorted_values[min(len(sorted_values) - 1, position)]
+
+
+def main(size=2000):
+    bound = CUCKOO_HASHES * CUCKOO_BUCKET_SIZE
+    print(f"{size} claves por tabla; cuckoo visita como mucho {bound} ranuras")
+    print(
+        f"{'claves':<13}{'carga':>6}  {'sondeo':<11}{'max hit':>9}"
+        f"{'max miss':>10}{'p99 ns':>9}{'max ns':>9}"
+    )
+    for name, keys in key_sets(size).items():
+        present, absent = keys[:size], keys[size:]
+        for load_factor in LOAD_FACTORS:
+            for probing in PROBING_STRATEGIES:
+                counting = build(CountingHashTable, present, load_factor, probing)
+                hits = probe_lengths(counting, present)
+                misses = probe_lengths(counting, absent)
+                hash_table = build(HashTable, present, load_factor, probing)
+                latencies = lookup_latencies(hash_table, present + absent)
+                print(
+                    f"{name:<13}{load_factor:>6.2f}  {probing:<11}"
+                    f"{max(hits):>9}{max(misses):>10}"
+                    f"{percentile(latencies, 0.99):>9}{latencies[-1]:>9}"
+                )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,52 @@
+## Arranque de un proceso con una tabla de consulta grande: reconstruirla con
+## HashTable.from_dict frente a abrir un FileHashTable ya creado con mmap.
+## Uso: python bench_file_hashtable.py [pares] [busquedas]
+import os
+import random
+import sys
+import tempfile
+import time
+
+from file_hashtable import FileHashTable
+from hashtable import HashTable
+
+
+def main(size=1_000_000, count=10_000):
+    data = {f"key{i}": i for i in range(size)}
+    keys = [f"key{i}" for i in random.sample(range(size), count)]
+    path = os.path.join(tempfile.mkdtemp(), "lookup.fht")
+
+    start = time.perf_counter()
+    FileHashTable.create(path, data).close()
+    created = time.perf_counter() - start
+    print(f"{size} pares, fichero de {os.path.getsize(path) / 2**20:.1f} MiB")
+    print(f"crear el fichero (una vez): {created:.2f} s")
+
+    start = time.perf_counter()
+    local = HashTable.from_dict(data)
+    rebuilt = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        local[key]
+    local_lookups = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mapped = FileHashTable.open(path)
+    opened = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        mapped[key]
+    mapped_lookups = time.perf_counter() - start
+    mapped.close()
+
+    print(f"{'':<24}{'from_dict':>12}{'mmap':>12}")
+    print(f"{'arranque (ms)':<24}{rebuilt * 1e3:>12.1f}{opened * 1e3:>12.3f}")
+    print(
+        f"{'búsqueda (us)':<24}{local_lookups / count * 1e6:>12.2f}"
+        f"{mapped_lookups / count * 1e6:>12.2f}"
+    )
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
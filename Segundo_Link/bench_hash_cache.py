@@ -0,0 +1,84 @@
+## Benchmark del hash almacenado por entrada con claves caras de hashear.
+## Compara HashTable con una variante que, como la implementación original,
+## vuelve a llamar a hash() al redimensionar y compara claves sin mirar
+## antes el hash. Uso: python bench_hash_cache.py
+import time
+
+from hashtable import DELETED_INDEX, EMPTY_INDEX, HashTable
+
+
+# Clave con __hash__ y __eq__ costosos (tupla larga de strings), que
+# cuenta las llamadas a ambos métodos.
+class ExpensiveKey:
+    hash_calls = 0
+    eq_calls = 0
+
+    def __init__(self, value):
+        self.parts = tuple(f"{value}-{i}" for i in range(50))
+
+    def __hash__(self):
+        ExpensiveKey.hash_calls += 1
+        return hash(self.parts)
+
+    def __eq__(self, other):
+        ExpensiveKey.eq_calls += 1
+        return self.parts == other.parts
+
+
+# Variante sin caché de hashes: rehace hash(key) de cada clave al
+# redimensionar y llama a __eq__ en cada paso del sondeo.
+class RehashingHashTable(HashTable):
+    __slots__ = ()
+
+    def _lookup(self, key, hash_value):
+        free = None
+        for index in self._probe(hash_value):
+            entry = self._indices[index]
+            if entry == EMPTY_INDEX:
+                return (index if free is None else free), -1
+            if entry == DELETED_INDEX:
+                if free is None:
+                    free = index
+            elif self._keys[entry] == key:
+                return index, entry
+        return free, -1
+
+    def _resize_and_rehash(self, capacity=None):
+        super()._resize_and_rehash(capacity)
+        for entry, key in enumerate(self._keys):
+            self._hashes[entry] = hash(key)
+
+
+def run(table_class, keys, missing):
+    ExpensiveKey.hash_calls = ExpensiveKey.eq_calls = 0
+    start = time.perf_counter()
+    hash_table = table_class(capacity=8)
+    for i, key in enumerate(keys):
+        hash_table[key] = i
+    for key in keys:
+        hash_table[key]
+    for key in missing:
+        key in hash_table
+    elapsed = time.perf_counter() - start
+    return elapsed, ExpensiveKey.hash_calls, ExpensiveKey.eq_calls
+
+
+def main(size=20_000):
+    keys = [ExpensiveKey(i) for i in range(size)]
+    missing = [ExpensiveKey(-i) for i in range(1, size + 1)]
+    print(f"{size} claves caras: inserción + aciertos + fallos")
+    print(f"{'tabla':<22}{'segundos':>10}{'__hash__':>12}{'__eq__':>12}")
+    results = {}
+    for table_class in (RehashingHashTable, HashTable):
+        elapsed, hash_calls, eq_calls = run(table_class, keys, missing)
+        results[table_class] = elapsed
+        print(
+            f"{table_class.__name__:<22}{elapsed:>10.3f}"
+            f"{hash_calls:>12}{eq_calls:>12}"
+        )
+    speedup = results[RehashingHashTable] / results[HashTable]
+    print(f"mejora: x{speedup:.2f}")
+
+
+if __name__ == "__main__":
+    main()
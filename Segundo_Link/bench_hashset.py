@@ -0,0 +1,100 @@
+## HashSet frente a una HashTable con valores de relleno y frente a set:
+## memoria del almacenamiento por clave y tiempo de unión, intersección,
+## diferencia y subconjunto entre un conjunto grande y uno pequeño.
+## Uso: python bench_hashset.py [claves_grande] [claves_pequeño]
+import sys
+import timeit
+
+from hashset import HashSet
+from hashtable import HashTable
+
+
+# Bytes del almacenamiento de una tabla (array de índices y columnas
+# densas), sin contar las claves.
+def storage_bytes(table):
+    columns = [table._indices, table._hashes, table._keys]
+    if isinstance(table, HashTable):
+        columns.append(table._values)
+    return sum(sys.getsizeof(column) for column in columns)
+
+
+# Operaciones con una HashTable usada como conjunto, como se hacía antes
+# de HashSet: cada resultado se construye clave a clave.
+def table_union(a, b):
+    result = a.copy()
+    for key in b:
+        result[key] = None
+    return result
+
+
+def table_intersection(a, b):
+    return HashTable.from_items((key, None) for key in b if key in a)
+
+
+def table_difference(a, b):
+    return HashTable.from_items((key, None) for key in b if key not in a)
+
+
+def table_subset(a, b):
+    return all(key in a for key in b)
+
+
+def best(function, number=5):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def main(large=200_000, small=2_000):
+    large_keys = range(large)
+    small_keys = range(large - small // 2, large + small // 2)
+    sets = {
+        "HashSet": (
+            HashSet.from_iterable(large_keys),
+            HashSet.from_iterable(small_keys),
+        ),
+        "HashTable": (
+            HashTable.from_dict(dict.fromkeys(large_keys)),
+            HashTable.from_dict(dict.fromkeys(small_keys)),
+        ),
+        "set": (set(large_keys), set(small_keys)),
+    }
+    operations = {
+        "HashSet": {
+            "a | b": lambda a, b: a | b,
+            "a & b": lambda a, b: a & b,
+            "b - a": lambda a, b: b - a,
+            "b <= a": lambda a, b: b <= a,
+        },
+        "HashTable": {
+            "a | b": table_union,
+            "a & b": table_intersection,
+            "b - a": table_difference,
+            "b <= a": table_subset,
+        },
+        "set": {
+            "a | b": lambda a, b: a | b,
+            "a & b": lambda a, b: a & b,
+            "b - a": lambda a, b: b - a,
+            "b <= a": lambda a, b: b <= a,
+        },
+    }
+    print(f"a: {large} claves, b: {small} claves (la mitad en a)")
+    large_set, _ = sets["HashSet"]
+    large_table, _ = sets["HashTable"]
+    print(
+        f"bytes por clave: HashSet {storage_bytes(large_set) / large:.1f}, "
+        f"HashTable {storage_bytes(large_table) / large:.1f}"
+    )
+    print(f"{'operación':<10}" + "".join(f"{name:>12}" for name in sets))
+    for operation in operations["HashSet"]:
+        times = []
+        for name, (a, b) in sets.items():
+            function = operations[name][operation]
+            times.append(best(lambda: function(a, b)))
+        print(
+            f"{operation:<10}"
+            + "".join(f"{seconds * 1e3:>10.2f}ms" for seconds in times)
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,40 @@
+## Latencia por inserción con y sin redimensionado incremental: percentiles
+## p50/p99 y máximo. Uso: python bench_incremental_resize.py [número_claves]
+import sys
+import time
+
+from hashtable import HashTable
+
+
+# Tiempos de cada inserción, en microsegundos.
+def insert_latencies(size, incremental_resize):
+    hash_table = HashTable(incremental_resize=incremental_resize)
+    latencies = []
+    clock = time.perf_counter_ns
+    for i in range(size):
+        start = clock()
+        hash_table[i] = i
+        latencies.append((clock() - start) / 1000)
+    return latencies
+
+
+def percentile(sorted_values, fraction):
+    position = int(len(sorted_values) * fraction)
+    return sorted_values[min(len(sorted_values) - 1, position)]
+
+
+def main(size=1_000_000):
+    print(f"{size} inserciones (microsegundos por inserción)")
+    print(f"{'modo':<14}{'p50':>8}{'p99':>8}{'max':>12}{'total s':>10}")
+    for incremental_resize in (False, True):
+        latencies = sorted(insert_latencies(size, incremental_resize))
+        name = "incremental" if incremental_resize else "de golpe"
+        print(
+            f"{name:<14}{percentile(latencies, 0.5):>8.2f}"
+            f"{percentile(latencies, 0.99):>8.2f}{latencies[-1]:>12.1f}"
+            f"{sum(latencies) / 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,57 @@
+## Join de arrays de identificadores enteros: IntHashTable con operaciones
+## vectorizadas (put_many, get_many, contains_many) frente a HashTable y
+## dict clave a clave.
+## Uso: python bench_int_hashtable.py [claves] [consultas]
+import sys
+import time
+
+import numpy as np
+
+from hashtable import HashTable
+from int_hashtable import IntHashTable
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main(size=1_000_000, queries=1_000_000):
+    rng = np.random.default_rng(0)
+    keys = rng.choice(2**62, size=size, replace=False).astype(np.int64)
+    values = np.arange(size, dtype=np.int64)
+    # La mitad de las consultas existen y la otra mitad no.
+    lookups = np.concatenate(
+        [
+            rng.choice(keys, queries // 2),
+            rng.integers(-(2**62), 0, queries // 2),
+        ]
+    )
+    key_list = keys.tolist()
+    value_list = values.tolist()
+    lookup_list = lookups.tolist()
+
+    print(f"{size} claves, {queries} consultas (50% aciertos)")
+    print(f"{'':<12}{'carga (s)':>12}{'get (s)':>12}{'contains (s)':>14}")
+
+    load, table = timed(lambda: IntHashTable.from_arrays(keys, values))
+    get, _ = timed(lambda: table.get_many(lookups, default=-1))
+    contains, _ = timed(lambda: table.contains_many(lookups))
+    print(f"{'IntHashTable':<12}{load:>12.2f}{get:>12.2f}{contains:>14.2f}")
+
+    load, table = timed(
+        lambda: HashTable.from_dict(dict(zip(key_list, value_list)))
+    )
+    get, _ = timed(lambda: [table.get(key, -1) for key in lookup_list])
+    contains, _ = timed(lambda: [key in table for key in lookup_list])
+    print(f"{'HashTable':<12}{load:>12.2f}{get:>12.2f}{contains:>14.2f}")
+
+    load, table = timed(lambda: dict(zip(key_list, value_list)))
+    get, _ = timed(lambda: [table.get(key, -1) for key in lookup_list])
+    contains, _ = timed(lambda: [key in table for key in lookup_list])
+    print(f"{'dict':<12}{load:>12.2f}{get:>12.2f}{contains:>14.2f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
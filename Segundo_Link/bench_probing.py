@@ -0,0 +1,71 @@
+## Comparación de estrategias de sondeo: longitud media y máxima de sondeo
+## en aciertos y fallos para claves uniformes, agrupadas y adversarias.
+## Uso: python bench_probing.py
+import random
+import statistics
+
+from hashtable import PROBING_STRATEGIES, HashTable
+
+
+# HashTable que cuenta cuántas ranuras produce cada sondeo.
+class CountingHashTable(HashTable):
+    __slots__ = ()
+    probes = 0
+
+    def _probe(self, hash_value):
+        for index in super()._probe(hash_value):
+            CountingHashTable.probes += 1
+            yield index
+
+
+# Longitud de sondeo de cada búsqueda de la lista de claves.
+def probe_lengths(hash_table, keys):
+    lengths = []
+    for key in keys:
+        CountingHashTable.probes = 0
+        key in hash_table
+        lengths.append(CountingHashTable.probes)
+    return lengths
+
+
+# Conjuntos de claves: enteros uniformes, rachas de enteros consecutivos
+# (agrupamiento primario) y múltiplos de 2**20, que con capacidades
+# potencia de dos caen todos en la misma ranura de origen.
+def key_sets(size, seed=0):
+    rng = random.Random(seed)
+    uniform = rng.sample(range(size * 100), 2 * size)
+    clustered = []
+    while len(clustered) < 2 * size:
+        start = rng.randrange(size * 100)
+        clustered.extend(range(start, start + 32))
+    clustered = list(dict.fromkeys(clustered))[: 2 * size]
+    adversarial = [i << 20 for i in range(1, 2 * size + 1)]
+    return {
+        "uniform": uniform,
+        "clustered": clustered,
+        "adversarial": adversarial,
+    }
+
+
+def main(size=2000):
+    print(f"{size} claves por tabla, factor de carga máximo 2/3")
+    header = f"{'claves':<13}{'sondeo':<11}"
+    header += f"{'media hit':>10}{'max hit':>9}{'media miss':>12}{'max miss':>10}"
+    print(header)
+    for name, keys in key_sets(size).items():
+        present, absent = keys[:size], keys[size:]
+        for probing in PROBING_STRATEGIES:
+            hash_table = CountingHashTable(probing=probing)
+            for key in present:
+                hash_table[key] = key
+            hits = probe_lengths(hash_table, present)
+            misses = probe_lengths(hash_table, absent)
+            print(
+                f"{name:<13}{probing:<11}"
+                f"{statistics.mean(hits):>10.2f}{max(hits):>9}"
+                f"{statistics.mean(misses):>12.2f}{max(misses):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
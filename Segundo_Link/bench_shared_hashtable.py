@@ -0,0 +1,80 @@
+## Compartir una tabla de solo lectura con procesos trabajadores: enviar una
+## HashTable serializada a cada proceso frente a adjuntarse por nombre a una
+## SharedHashTable. Mide el coste de preparar la tabla en cada trabajador y
+## el tiempo total de un pool que hace búsquedas sobre ella.
+## Uso: python bench_shared_hashtable.py [pares] [busquedas_por_tarea]
+import multiprocessing
+import pickle
+import random
+import sys
+import time
+
+from hashtable import HashTable
+from shared_hashtable import SharedHashTable
+
+_table = None
+
+
+def init_worker(hash_table):
+    global _table
+    _table = hash_table
+
+
+def lookups(args):
+    seed, count, size = args
+    rng = random.Random(seed)
+    return sum(_table.get(f"key{rng.randrange(size)}", 0) for _ in range(count))
+
+
+# Segundos por llamada de function, repitiéndola repeat veces.
+def timed(function, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def pool_time(hash_table, size, count, workers=4, tasks=16):
+    start = time.perf_counter()
+    with multiprocessing.Pool(
+        workers, initializer=init_worker, initargs=(hash_table,)
+    ) as pool:
+        pool.map(lookups, [(seed, count, size) for seed in range(tasks)])
+    return time.perf_counter() - start
+
+
+def main(size=200_000, count=20_000):
+    data = {f"key{i}": i for i in range(size)}
+    local = HashTable.from_dict(data)
+    shared = SharedHashTable.create(data)
+    try:
+        payload = pickle.dumps(local)
+        print(f"{size} pares, {count} búsquedas por tarea")
+        print(f"{'':<22}{'HashTable':>14}{'SharedHashTable':>18}")
+        print(
+            f"{'bytes enviados':<22}{len(payload):>14,}"
+            f"{len(pickle.dumps(shared)):>18,}"
+        )
+        unpickle = timed(lambda: pickle.loads(payload))
+        attach = timed(lambda: SharedHashTable.attach(shared.name).close())
+        print(f"{'preparar (ms)':<22}{unpickle * 1e3:>14.2f}{attach * 1e3:>18.3f}")
+
+        # Con reemplazo, como las tareas del pool: count puede superar size.
+        keys = [f"key{i}" for i in random.choices(range(size), k=count)]
+        local_get = timed(lambda: [local.get(key) for key in keys])
+        shared_get = timed(lambda: [shared.get(key) for key in keys])
+        print(
+            f"{'búsqueda (us)':<22}{local_get / count * 1e6:>14.2f}"
+            f"{shared_get / count * 1e6:>18.2f}"
+        )
+
+        local_pool = pool_time(local, size, count)
+        shared_pool = pool_time(shared, size, count)
+        print(f"{'pool de 4 (s)':<22}{local_pool:>14.2f}{shared_pool:>18.2f}")
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,79 @@
+## Guardar y cargar una HashTable: instantánea binaria (dump/load, que
+## también usa pickle) frente a serializar la lista de pares de _slots con
+## pickle y reinsertarlos, y frente a repr() + eval().
+## Uso: python bench_snapshot.py [pares]
+import io
+import pickle
+import sys
+import time
+
+from hashtable import HashTable
+
+
+def snapshot_round_trip(hash_table):
+    file = io.BytesIO()
+    hash_table.dump(file)
+    data = file.getvalue()
+    return data, lambda: HashTable.load(io.BytesIO(data))
+
+
+def slots_round_trip(hash_table):
+    data = pickle.dumps(hash_table._slots, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load():
+        slots = pickle.loads(data)
+        return HashTable.from_items(
+            (pair for pair in slots if isinstance(pair, tuple)),
+            size_hint=len(hash_table),
+        )
+
+    return data, load
+
+
+def repr_round_trip(hash_table):
+    data = repr(hash_table).encode()
+    return data, lambda: eval(data, {"HashTable": HashTable})
+
+
+# Segundos de guardar y de cargar, y tamaño en bytes.
+def measure(round_trip, hash_table, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        data, load = round_trip(hash_table)
+    saved = (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loaded = load()
+    loaded_time = (time.perf_counter() - start) / repeat
+    assert loaded == hash_table
+    return saved, loaded_time, len(data)
+
+
+def main(size=200_000):
+    datasets = {
+        "str -> int": {f"key{i}": i for i in range(size)},
+        "int -> str": {i: f"value{i}" for i in range(size)},
+        "tuple -> float": {(i, i % 7): i / 3 for i in range(size)},
+    }
+    formats = {
+        "dump/load": snapshot_round_trip,
+        "pickle de _slots": slots_round_trip,
+        "repr/eval": repr_round_trip,
+    }
+    print(f"{size} pares")
+    print(
+        f"{'datos':<16}{'formato':<18}{'guardar (ms)':>14}"
+        f"{'cargar (ms)':>14}{'MiB':>8}"
+    )
+    for name, data in datasets.items():
+        hash_table = HashTable.from_dict(data)
+        for format_name, round_trip in formats.items():
+            saved, loaded, size_bytes = measure(round_trip, hash_table)
+            print(
+                f"{name:<16}{format_name:<18}{saved * 1e3:>14.1f}"
+                f"{loaded * 1e3:>14.1f}{size_bytes / 2**20:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
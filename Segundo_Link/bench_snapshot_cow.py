@@ -0,0 +1,92 @@
+## Tomar una foto de solo lectura de una HashTable y seguir escribiendo en
+## ella: snapshot() (O(1), copia por bloques solo lo que se modifica
+## después) frente a copy() (copia todo el almacenamiento), con distinto
+## número de escrituras tras la foto. Mide también el coste de leer de la
+## instantánea frente a la copia y el de escribir sin instantáneas.
+## Uso: python bench_snapshot_cow.py [pares] [repeticiones]
+import random
+import sys
+import time
+
+from hashtable import HashTable
+
+
+# La foto sigue viva mientras se escribe: una instantánea descartada ya no
+# recibe copias de bloques.
+def copy_and_write(hash_table, keys):
+    frozen = hash_table.copy()
+    for key in keys:
+        hash_table[key] = -1
+    return frozen
+
+
+def snapshot_and_write(hash_table, keys):
+    frozen = hash_table.snapshot()
+    for key in keys:
+        hash_table[key] = -1
+    return frozen
+
+
+# Mejor tiempo de function(hash_table, keys) en repeat repeticiones.
+def timed(function, hash_table, keys, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(hash_table, keys)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def read_all(table, keys):
+    start = time.perf_counter()
+    for key in keys:
+        table[key]
+    return time.perf_counter() - start
+
+
+def main(size=1_000_000, repeat=5):
+    hash_table = HashTable.from_dict({i: i for i in range(size)})
+    print(f"{size} pares")
+    print(
+        f"{'escrituras':>10}{'copy()':>12}{'snapshot()':>12}"
+        f"{'mejora':>10}"
+    )
+    for writes in (0, 10, 100, 1_000, 10_000, 100_000):
+        if writes > size:
+            break
+        keys = random.sample(range(size), writes)
+        copy_seconds = timed(copy_and_write, hash_table, keys, repeat)
+        snapshot_seconds = timed(
+            snapshot_and_write, hash_table, keys, repeat
+        )
+        print(
+            f"{writes:>10}{copy_seconds * 1e3:>10.2f}ms"
+            f"{snapshot_seconds * 1e3:>10.2f}ms"
+            f"{copy_seconds / snapshot_seconds:>9.1f}x"
+        )
+
+    print()
+    keys = random.sample(range(size), min(size, 100_000))
+    copy = hash_table.copy()
+    snapshot = hash_table.snapshot()
+    for name, table in (
+        ("lectura de la copia", copy),
+        ("lectura de la instantánea", snapshot),
+    ):
+        print(f"{name:<30}{read_all(table, keys) * 1e3:>10.2f}ms")
+    # La copia no tiene instantáneas; hash_table comparte sus columnas con
+    # snapshot y copia cada bloque la primera vez que lo modifica.
+    for name, table in (
+        ("escritura sin instantáneas", copy),
+        ("escritura con instantánea", hash_table),
+    ):
+        start = time.perf_counter()
+        for key in keys:
+            table[key] = None
+        seconds = time.perf_counter() - start
+        print(f"{name:<30}{seconds * 1e3:>10.2f}ms")
+    assert all(snapshot[key] is not None for key in keys)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,273 @@
+## Suite de benchmarks reproducible de HashTable frente a dict: inserción,
+## búsquedas con acierto y con fallo, borrado y reinserción (churn),
+## iteración, len, copy e ==, con claves uniformes, agrupadas, adversarias
+## para el sondeo y con hash constante, a varios tamaños. Guarda los
+## resultados en JSON y puede compararlos con otro JSON de referencia,
+## terminando con código 1 si alguna operación empeora más de la tolerancia.
+## Uso:
+##   python bench_suite.py [--sizes 100 1000 ...] [--output resultados.json]
+##   python bench_suite.py --baseline referencia.json [--tolerance 0.1]
+import argparse
+import datetime
+import json
+import platform
+import sys
+import timeit
+
+from bench_probing import key_sets
+from hashtable import HashTable
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Con hash constante cada operación es O(n) en ambas estructuras, así que
+# ese conjunto solo se mide hasta este tamaño.
+MAX_CONSTANT_HASH_SIZE = 1_000
+
+# Tiempo mínimo de cada medida: las operaciones rápidas se repiten hasta
+# alcanzarlo para que el ruido del reloj no domine.
+MIN_MEASURE_TIME = 0.05
+
+RESULTS_VERSION = 1
+
+
+# Clave con hash constante: todas colisionan, como en los tests que
+# parchean hash() con return_value fijo, pero también afecta a dict.
+class ConstantHashKey:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return 24
+
+    def __eq__(self, other):
+        return isinstance(other, ConstantHashKey) and self.value == other.value
+
+
+# Conjuntos de claves de tamaño 2 * size: la primera mitad se inserta y la
+# segunda se usa para las búsquedas con fallo.
+def workloads(size):
+    keys = key_sets(size)
+    if size <= MAX_CONSTANT_HASH_SIZE:
+        keys["constant-hash"] = [ConstantHashKey(i) for i in range(2 * size)]
+    return keys
+
+
+# Operaciones medidas. Cada una recibe el constructor de la estructura y
+# una tabla ya llena, y devuelve la función a cronometrar; el tiempo se
+# divide entre el número de claves insertadas.
+def insert(factory, table, present, absent):
+    def run():
+        new_table = factory()
+        for key in present:
+            new_table[key] = key
+
+    return run
+
+
+def lookup_hit(factory, table, present, absent):
+    def run():
+        for key in present:
+            table[key]
+
+    return run
+
+
+def lookup_miss(factory, table, present, absent):
+    def run():
+        for key in absent:
+            key in table
+
+    return run
+
+
+def delete_churn(factory, table, present, absent):
+    half = present[: len(present) // 2]
+
+    def run():
+        for key in half:
+            del table[key]
+        for key in half:
+            table[key] = key
+
+    return run
+
+
+def iterate(factory, table, present, absent):
+    def run():
+        for _ in table:
+            pass
+
+    return run
+
+
+def length(factory, table, present, absent):
+    calls = range(len(present))
+
+    def run():
+        for _ in calls:
+            len(table)
+
+    return run
+
+
+def copy(factory, table, present, absent):
+    return table.copy
+
+
+def equality(factory, table, present, absent):
+    other = table.copy()
+    return lambda: table == other
+
+
+OPERATIONS = {
+    "insert": insert,
+    "lookup_hit": lookup_hit,
+    "lookup_miss": lookup_miss,
+    "delete_churn": delete_churn,
+    "iterate": iterate,
+    "len": length,
+    "copy": copy,
+    "eq": equality,
+}
+
+STRUCTURES = {"hashtable": HashTable, "dict": dict}
+
+
+# Mejor tiempo por llamada de function entre repeat medidas.
+def best_time(function, repeat):
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= MIN_MEASURE_TIME:
+            break
+        number *= 2 if elapsed > MIN_MEASURE_TIME / 10 else 10
+    times = [elapsed] + timer.repeat(repeat - 1, number)
+    return min(times) / number
+
+
+# Mide todas las operaciones y devuelve una lista de resultados con los
+# nanosegundos por clave de HashTable y de dict.
+def run_suite(sizes, repeat, operations=OPERATIONS):
+    results = []
+    for size in sizes:
+        for keys_name, keys in workloads(size).items():
+            present, absent = keys[:size], keys[size:]
+            tables = {}
+            for name, factory in STRUCTURES.items():
+                table = factory()
+                for key in present:
+                    table[key] = key
+                tables[name] = table
+            for operation in operations:
+                result = {"keys": keys_name, "size": size, "operation": operation}
+                for name, factory in STRUCTURES.items():
+                    function = OPERATIONS[operation](
+                        factory, tables[name], present, absent
+                    )
+                    seconds = best_time(function, repeat)
+                    result[f"{name}_ns"] = seconds / size * 1e9
+                results.append(result)
+                print(format_result(result), flush=True)
+    return results
+
+
+def format_result(result):
+    ratio = result["hashtable_ns"] / result["dict_ns"]
+    return (
+        f"{result['keys']:<14}{result['size']:>9}  {result['operation']:<14}"
+        f"{result['hashtable_ns']:>12.1f}{result['dict_ns']:>10.1f}"
+        f"{ratio:>9.1f}x"
+    )
+
+
+# Compara con una ejecución de referencia. Por defecto compara el cociente
+# HashTable / dict de cada operación, que no depende de la velocidad de la
+# máquina; con absolute, los nanosegundos de HashTable. Devuelve las
+# operaciones que empeoran más de tolerance (fracción).
+def compare(results, baseline, tolerance, absolute=False):
+    def metric(result):
+        if absolute:
+            return result["hashtable_ns"]
+        return result["hashtable_ns"] / result["dict_ns"]
+
+    reference = {
+        (result["keys"], result["size"], result["operation"]): metric(result)
+        for result in baseline["results"]
+    }
+    regressions = []
+    print(f"\n{'claves':<14}{'tamaño':>9}  {'operación':<14}{'cambio':>10}")
+    for result in results:
+        key = (result["keys"], result["size"], result["operation"])
+        if key not in reference:
+            continue
+        change = metric(result) / reference[key] - 1
+        flag = ""
+        if change > tolerance:
+            regressions.append((key, change))
+            flag = "  REGRESIÓN"
+        print(f"{key[0]:<14}{key[1]:>9}  {key[2]:<14}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de HashTable frente a dict."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES)
+    )
+    parser.add_argument(
+        "--operations", nargs="+", choices=list(OPERATIONS), default=list(OPERATIONS)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="fichero JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="fichero JSON de referencia")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="empeoramiento máximo admitido frente a la referencia (0.1 = 10%%)",
+    )
+    parser.add_argument(
+        "--absolute",
+        action="store_true",
+        help="comparar tiempos absolutos en lugar del cociente frente a dict",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(
+        f"{'claves':<14}{'tamaño':>9}  {'operación':<14}"
+        f"{'HashTable ns':>12}{'dict ns':>10}{'cociente':>10}"
+    )
+    results = run_suite(args.sizes, args.repeat, args.operations)
+    document = {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance, args.absolute)
+        if regressions:
+            print(f"\n{len(regressions)} operaciones empeoran más del "
+                  f"{args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
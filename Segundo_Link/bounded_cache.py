@@ -0,0 +1,381 @@
+import functools
+import sys
+import time
+from typing import NamedTuple
+
+from hashtable import MISSING, HashTable
+
+# Políticas de expulsión seleccionables en el constructor:
+# - "lru": expulsa la entrada usada hace más tiempo.
+# - "lfu": expulsa la entrada usada menos veces (y, entre ellas, la usada
+#   hace más tiempo).
+# También se admite cualquier objeto con los métodos de _LRUPolicy.
+LRU = "lru"
+LFU = "lfu"
+EVICTION_POLICIES = (LRU, LFU)
+
+
+# Contadores de una caché, al estilo de functools.lru_cache().cache_info().
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    bytes: int
+
+
+# Entrada de la caché. Es a la vez nodo de las listas doblemente enlazadas
+# de las políticas (intrusivas: no hace falta otro objeto por entrada).
+class _Entry:
+    __slots__ = (
+        "key",
+        "hash",
+        "value",
+        "size",
+        "expires",
+        "frequency",
+        "prev",
+        "next",
+    )
+
+    def __init__(self, key=None, hash_value=0, value=None, size=0, expires=None):
+        self.key = key
+        self.hash = hash_value
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.frequency = 1
+        self.prev = self.next = self
+
+
+# Operaciones O(1) sobre una lista circular con nodo centinela: la cabeza
+# (sentinel.next) es la más reciente y la cola (sentinel.prev) la más
+# antigua.
+def _push_front(sentinel, entry):
+    entry.prev = sentinel
+    entry.next = sentinel.next
+    sentinel.next.prev = entry
+    sentinel.next = entry
+
+
+def _unlink(entry):
+    entry.prev.next = entry.next
+    entry.next.prev = entry.prev
+    entry.prev = entry.next = entry
+
+
+# Política LRU: una sola lista en orden de uso.
+class _LRUPolicy:
+    __slots__ = ("_sentinel",)
+
+    def __init__(self):
+        self._sentinel = _Entry()
+
+    # Registra una entrada nueva.
+    def insert(self, entry):
+        _push_front(self._sentinel, entry)
+
+    # Registra un uso de la entrada.
+    def touch(self, entry):
+        _unlink(entry)
+        _push_front(self._sentinel, entry)
+
+    # Olvida la entrada (borrada, caducada o expulsada).
+    def remove(self, entry):
+        _unlink(entry)
+
+    # Entrada a expulsar.
+    def victim(self):
+        return self._sentinel.prev
+
+    def clear(self):
+        self._sentinel = _Entry()
+
+
+# Política LFU en O(1): una lista por frecuencia de uso (guardadas en una
+# HashTable frecuencia -> centinela) y la frecuencia mínima presente. Si un
+# uso vacía la lista de la frecuencia mínima, la nueva mínima es la de la
+# entrada usada. Si la vacía un borrado (o una caducidad), victim() busca
+# la mínima entre las frecuencias presentes, sin recorrer las intermedias.
+class _LFUPolicy:
+    __slots__ = ("_lists", "_min_frequency")
+
+    def __init__(self):
+        self._lists = HashTable()
+        self._min_frequency = 0
+
+    def insert(self, entry):
+        sentinel = self._lists.get(entry.frequency)
+        if sentinel is None:
+            sentinel = self._lists[entry.frequency] = _Entry()
+        _push_front(sentinel, entry)
+        if len(self._lists) == 1 or entry.frequency < self._min_frequency:
+            self._min_frequency = entry.frequency
+
+    def touch(self, entry):
+        frequency = entry.frequency
+        self.remove(entry)
+        entry.frequency += 1
+        self.insert(entry)
+        if frequency == self._min_frequency and frequency not in self._lists:
+            self._min_frequency = entry.frequency
+
+    def remove(self, entry):
+        sentinel = entry.prev if entry.next is entry.prev else None
+        _unlink(entry)
+        if sentinel is not None and sentinel.next is sentinel:
+            del self._lists[entry.frequency]
+
+    def victim(self):
+        if self._min_frequency not in self._lists:
+            self._min_frequency = min(self._lists)
+        return self._lists[self._min_frequency].prev
+
+    def clear(self):
+        self._lists = HashTable()
+        self._min_frequency = 0
+
+
+_POLICIES = {LRU: _LRUPolicy, LFU: _LFUPolicy}
+
+
+# Tamaño en bytes por defecto de una entrada: el de la clave más el del
+# valor, sin seguir referencias.
+def _default_sizeof(key, value):
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class BoundedCache:
+    # Caché sobre HashTable con límite de entradas (max_entries), de bytes
+    # (max_bytes, medidos con sizeof(clave, valor)) o ambos. Al superarlos
+    # se expulsan entradas según policy (ver EVICTION_POLICIES). ttl (en
+    # segundos, None = sin caducidad) es la vida por defecto de cada
+    # entrada; put() admite otra por entrada. Las entradas caducadas se
+    # eliminan al acceder a ellas, así que cuentan en len() hasta entonces.
+    # get y put son O(1): la HashTable guarda para cada clave su entrada,
+    # que es también el nodo de las listas de la política.
+    __slots__ = (
+        "_entries",
+        "_policy",
+        "_max_entries",
+        "_max_bytes",
+        "_ttl",
+        "_sizeof",
+        "_clock",
+        "_bytes",
+        "_hits",
+        "_misses",
+        "_evictions",
+        "_expirations",
+    )
+
+    def __init__(
+        self,
+        max_entries=None,
+        max_bytes=None,
+        policy=LRU,
+        ttl=None,
+        sizeof=_default_sizeof,
+        clock=time.monotonic,
+    ):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("Max entries must be a positive number")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("Max bytes must be a positive number")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("TTL must be a positive number")
+        if isinstance(policy, str):
+            if policy not in _POLICIES:
+                raise ValueError(f"Unknown eviction policy: {policy!r}")
+            policy = _POLICIES[policy]()
+        self._entries = HashTable()
+        self._policy = policy
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    # Número de entradas, incluidas las caducadas aún no eliminadas.
+    def __len__(self):
+        return len(self._entries)
+
+    # Membresía sin contar acierto ni fallo ni cambiar el orden de uso.
+    def __contains__(self, key):
+        return self._live_entry(key, hash(key)) is not None
+
+    def __getitem__(self, key):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        hash_value = hash(key)
+        entry = self._entries._get(key, hash_value, None)
+        if entry is None:
+            raise KeyError(key)
+        self._remove(entry)
+
+    # Devuelve el valor de la clave y registra el uso, o default si falta o
+    # ha caducado.
+    def get(self, key, default=None):
+        entry = self._live_entry(key, hash(key))
+        if entry is None:
+            self._misses += 1
+            return default
+        self._hits += 1
+        self._policy.touch(entry)
+        return entry.value
+
+    # Guarda el par expulsando las entradas necesarias. ttl sustituye al
+    # del constructor para esta entrada. Un par que por sí solo supera
+    # max_bytes no se guarda.
+    def put(self, key, value, ttl=None):
+        hash_value = hash(key)
+        size = self._sizeof(key, value) if self._max_bytes is not None else 0
+        ttl = self._ttl if ttl is None else ttl
+        expires = None if ttl is None else self._clock() + ttl
+        entry = self._entries._get(key, hash_value, None)
+        if entry is not None:
+            # Fuera de la política mientras se hace sitio, para no
+            # expulsarla a ella misma.
+            self._policy.remove(entry)
+            self._bytes -= entry.size
+            if self._max_bytes is not None and size > self._max_bytes:
+                self._entries._delete(key, hash_value)
+                return
+            self._make_room(size, new_entries=0)
+            entry.value = value
+            entry.size = size
+            entry.expires = expires
+            self._bytes += size
+            self._policy.insert(entry)
+            self._policy.touch(entry)
+            return
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        self._make_room(size, new_entries=1)
+        entry = _Entry(key, hash_value, value, size, expires)
+        self._entries._set(key, hash_value, entry)
+        self._bytes += size
+        self._policy.insert(entry)
+
+    # Vacía la caché sin tocar los contadores.
+    def clear(self):
+        self._entries = HashTable()
+        self._policy.clear()
+        self._bytes = 0
+
+    # Contadores y ocupación actuales.
+    def info(self):
+        return CacheInfo(
+            self._hits,
+            self._misses,
+            self._evictions,
+            self._expirations,
+            len(self._entries),
+            self._bytes,
+        )
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    @property
+    def expirations(self):
+        return self._expirations
+
+    # Bytes ocupados según sizeof (0 si no hay límite de bytes).
+    @property
+    def bytes(self):
+        return self._bytes
+
+    @property
+    def max_entries(self):
+        return self._max_entries
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    # Entrada de la clave si existe y no ha caducado; la caducada se
+    # elimina al encontrarla.
+    def _live_entry(self, key, hash_value):
+        entry = self._entries._get(key, hash_value, None)
+        if entry is None:
+            return None
+        if entry.expires is not None and entry.expires <= self._clock():
+            self._expirations += 1
+            self._remove(entry)
+            return None
+        return entry
+
+    # Expulsa entradas hasta que quepan new_entries entradas más y size
+    # bytes más.
+    def _make_room(self, size, new_entries):
+        max_entries = self._max_entries
+        max_bytes = self._max_bytes
+        while len(self._entries) and (
+            (
+                max_entries is not None
+                and len(self._entries) + new_entries > max_entries
+            )
+            or (max_bytes is not None and self._bytes + size > max_bytes)
+        ):
+            self._evictions += 1
+            self._remove(self._policy.victim())
+
+    def _remove(self, entry):
+        self._policy.remove(entry)
+        self._entries._delete(entry.key, entry.hash)
+        self._bytes -= entry.size
+
+
+# Clave de la caché para una llamada, como en functools.
+_KWARGS_MARK = object()
+
+
+def _call_key(args, kwargs):
+    if not kwargs:
+        return args
+    return args + (_KWARGS_MARK,) + tuple(kwargs.items())
+
+
+# Decorador que memoiza una función en una BoundedCache creada con los
+# argumentos dados. Los argumentos de la función deben ser hashables. La
+# caché queda accesible en el atributo cache de la función decorada.
+def memoize(max_entries=128, **options):
+    def decorator(function):
+        cache = BoundedCache(max_entries, **options)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = _call_key(args, kwargs)
+            value = cache.get(key, MISSING)
+            if value is MISSING:
+                value = function(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,48 @@
+import hashlib
+import pickle
+
+# Codificación binaria de claves y valores para las tablas que viven fuera
+# del proceso (memoria compartida, ficheros). Un byte de tipo precede a los
+# datos: str, bytes e int tienen un camino rápido y el resto va con pickle.
+# Dos claves se consideran iguales si su codificación es idéntica, así que
+# 1, 1.0 y True son claves distintas.
+STR_TAG = ord("s")
+BYTES_TAG = ord("b")
+INT_TAG = ord("i")
+PICKLE_TAG = ord("p")
+
+
+# Codifica un objeto como bytes con su etiqueta de tipo.
+def encode(obj):
+    kind = type(obj)
+    if kind is str:
+        return b"s" + obj.encode("utf-8", "surrogatepass")
+    if kind is bytes:
+        return b"b" + obj
+    if kind is int:
+        size = obj.bit_length() // 8 + 1
+        return b"i" + obj.to_bytes(size, "little", signed=True)
+    return b"p" + pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# Decodifica bytes (o un memoryview, sin copiarlo antes) producidos por
+# encode().
+def decode(data):
+    tag = data[0]
+    body = data[1:]
+    if tag == STR_TAG:
+        return str(body, "utf-8", "surrogatepass")
+    if tag == BYTES_TAG:
+        return bytes(body)
+    if tag == INT_TAG:
+        return int.from_bytes(body, "little", signed=True)
+    if tag == PICKLE_TAG:
+        return pickle.loads(body)
+    raise ValueError(f"Unknown type tag: {tag!r}")
+
+
+# Hash de 64 bits sin signo de una clave codificada. A diferencia de hash(),
+# no depende de PYTHONHASHSEED, así que es el mismo en todos los procesos.
+def stable_hash(data):
+    digest = hashlib.blake2b(data, digest_size=8).digest()
+    return int.from_bytes(digest, "little")
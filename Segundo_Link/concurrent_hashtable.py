@@ -0,0 +1,167 @@
+import threading
+
+from hashtable import _HASH_MASK, MISSING, HashTable
+
+# Multiplicador de Fibonacci (2**64 / número áureo) para repartir los hashes
+# entre segmentos usando sus bits altos. Así el segmento no depende de los
+# bits bajos, que son los que usa cada segmento para elegir ranura.
+_FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+class ConcurrentHashTable:
+    # Tabla hash para varios hilos con lock striping: el espacio de claves
+    # se reparte entre segmentos independientes (cada uno una HashTable con
+    # su propio lock, que crece por su cuenta), así que las escrituras en
+    # segmentos distintos no compiten.
+    #
+    # Las lecturas no toman el lock: cada segmento tiene un contador de
+    # secuencia (seqlock) que los escritores ponen impar mientras modifican
+    # el segmento. Una lectura que ve la secuencia impar, cambiada al
+    # terminar o que falla a mitad se repite con el lock.
+    __slots__ = ("_segments", "_locks", "_sequences", "_shift")
+
+    # Crea la tabla con capacity ranuras repartidas entre segments segmentos
+    # (se redondea a potencia de dos). El resto de argumentos se pasan a
+    # cada HashTable, salvo incremental_resize: sus migraciones modifican
+    # la tabla al leer, lo que no admite lecturas sin lock.
+    def __init__(self, capacity=128, segments=16, **options):
+        if segments < 1:
+            raise ValueError("Segments must be a positive number")
+        if options.get("incremental_resize"):
+            raise ValueError("Segments cannot resize incrementally")
+        bits = (segments - 1).bit_length()
+        segments = 1 << bits
+        segment_capacity = max(1, -(-capacity // segments))
+        self._segments = [
+            HashTable(segment_capacity, **options) for _ in range(segments)
+        ]
+        self._locks = [threading.Lock() for _ in range(segments)]
+        self._sequences = [0] * segments
+        self._shift = 64 - bits
+
+    # Número de pares. No bloquea: con escrituras concurrentes es una
+    # foto aproximada.
+    def __len__(self):
+        return sum(len(segment) for segment in self._segments)
+
+    # Itera sobre las claves, segmento a segmento, copiando las claves de
+    # cada uno con su lock tomado.
+    def __iter__(self):
+        for index, segment in enumerate(self._segments):
+            with self._locks[index]:
+                keys = list(segment)
+            yield from keys
+
+    def __getitem__(self, key):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        hash_value = hash(key)
+        self._write(hash_value, HashTable._set, key, hash_value, value)
+
+    def __delitem__(self, key):
+        hash_value = hash(key)
+        self._write(hash_value, HashTable._delete, key, hash_value)
+
+    def __contains__(self, key):
+        return self.get(key, MISSING) is not MISSING
+
+    # Representación al estilo de HashTable.
+    def __repr__(self):
+        items = ", ".join(f"{key!r}: {value!r}" for key, value in self.pairs)
+        return f"{self.__class__.__name__}({{{items}}})"
+
+    # get segura que devuelve default si la clave no existe. Lectura
+    # optimista sin lock (ver la descripción de la clase).
+    def get(self, key, default=None):
+        hash_value = hash(key)
+        index = self._segment_index(hash_value)
+        segment = self._segments[index]
+        sequence = self._sequences[index]
+        if not sequence & 1:
+            try:
+                value = segment._get(key, hash_value, default)
+            except Exception:
+                # Estado intermedio de una escritura: repetir con el lock.
+                pass
+            else:
+                if self._sequences[index] == sequence:
+                    return value
+        with self._locks[index]:
+            return segment._get(key, hash_value, default)
+
+    # Devuelve el valor de la clave; si falta, inserta default y lo
+    # devuelve. Atómico respecto a otros hilos.
+    def setdefault(self, key, default=None):
+        hash_value = hash(key)
+        return self._write(
+            hash_value, HashTable._setdefault, key, hash_value, default
+        )
+
+    # Elimina la clave y devuelve su valor; si falta devuelve default o,
+    # sin default, lanza KeyError. Atómico respecto a otros hilos.
+    def pop(self, key, default=MISSING):
+        hash_value = hash(key)
+        return self._write(
+            hash_value, HashTable._pop, key, hash_value, default
+        )
+
+    # Guarda y devuelve function(valor actual), usando default si la clave
+    # falta. Atómico respecto a otros hilos: function se ejecuta con el lock
+    # del segmento tomado, así que no debe acceder a esta misma tabla.
+    def compute(self, key, function, default=None):
+        hash_value = hash(key)
+        return self._write(
+            hash_value,
+            HashTable._update_with,
+            key,
+            hash_value,
+            function,
+            default,
+        )
+
+    # Pares, claves y valores copiados segmento a segmento con su lock.
+    @property
+    def pairs(self):
+        return set().union(*self._per_segment(lambda segment: segment.pairs))
+
+    @property
+    def keys(self):
+        return set().union(*self._per_segment(lambda segment: segment.keys))
+
+    @property
+    def values(self):
+        parts = self._per_segment(lambda segment: segment.values)
+        return [value for part in parts for value in part]
+
+    # Número de segmentos.
+    @property
+    def segments(self):
+        return len(self._segments)
+
+    # Índice del segmento de un hash, a partir de sus bits altos.
+    def _segment_index(self, hash_value):
+        mixed = (hash_value * _FIBONACCI_MULTIPLIER) & _HASH_MASK
+        return mixed >> self._shift
+
+    # Ejecuta operation(segmento, *args) con el lock del segmento del hash,
+    # con su secuencia impar mientras dura la escritura.
+    def _write(self, hash_value, operation, *args):
+        index = self._segment_index(hash_value)
+        with self._locks[index]:
+            self._sequences[index] += 1
+            try:
+                return operation(self._segments[index], *args)
+            finally:
+                self._sequences[index] += 1
+
+    # Resultados de function(segmento) para cada segmento, con su lock.
+    def _per_segment(self, function):
+        parts = []
+        for index, segment in enumerate(self._segments):
+            with self._locks[index]:
+                parts.append(function(segment))
+        return parts
@@ -0,0 +1,459 @@
+import mmap
+import os
+import struct
+import time
+
+from codec import decode, encode, stable_hash
+from hashtable import (
+    DEFAULT_MAX_LOAD_FACTOR,
+    LINEAR,
+    MISSING,
+    PERTURBED,
+    HashTable,
+    Pair,
+    _capacity_for,
+    _probe_sequence,
+)
+
+# Formato del fichero:
+#   cabecera | capacity buckets de tamaño fijo | registros
+# Cada bucket guarda el hash estable de la clave, la posición absoluta en el
+# fichero de su registro (la clave codificada seguida del valor codificado)
+# y sus tamaños. Un fichero recién creado está a ceros, así que los buckets
+# empiezan vacíos sin escribirlos. Los registros nunca se sobrescriben: una
+# actualización escribe uno nuevo y apunta el bucket a él.
+MAGIC = b"FHT1"
+VERSION = 1
+HEADER = struct.Struct("<4s4B6Q")
+BUCKET = struct.Struct("<QQII")
+
+# Posiciones de los campos de la cabecera que cambian: marca de escritura
+# sin flush(), secuencia de escritura y contadores.
+_DIRTY = 6
+_SEQUENCE, _CAPACITY, _LENGTH, _FILLED, _DATA_SIZE, _DATA_USED = range(
+    8, 56, 8
+)
+_FIELD = struct.Struct("<Q")
+
+# Valores especiales de la posición de un bucket: vacío y borrado.
+EMPTY_OFFSET = 0
+DELETED_OFFSET = 1
+
+# Estrategias de sondeo admitidas en disco y su código en la cabecera.
+# Robin Hood mueve entradas al insertar y borrar, lo que no encaja con
+# lectores que leen el fichero mientras el escritor lo modifica.
+FILE_PROBING_STRATEGIES = (LINEAR, PERTURBED)
+
+# Segundos que un lector espera a que el escritor termine una escritura
+# (secuencia impar). Si la misma secuencia sigue impar pasado ese tiempo,
+# el escritor se da por muerto a mitad de la escritura y se lee sin
+# esperar: como los datos se escriben antes de apuntar el bucket a ellos,
+# se ve el estado anterior o el posterior a la escritura. La comprobación
+# de que la secuencia no cambió durante la lectura se mantiene, así que un
+# escritor vivo pero lento sigue invalidando las lecturas a medias.
+WRITER_TIMEOUT = 1.0
+
+
+# Pares (clave, valor) de un mapping, una HashTable o un iterable de pares.
+def _items(mapping):
+    if isinstance(mapping, HashTable):
+        return mapping.items_view()
+    if hasattr(mapping, "items"):
+        return mapping.items()
+    return mapping
+
+
+class FileHashTable:
+    # Tabla hash persistente en un fichero abierto con mmap: abrirla es O(1)
+    # (solo se lee la cabecera) y el sistema operativo carga las páginas
+    # bajo demanda al buscar. Las búsquedas leen el buffer mapeado y solo
+    # decodifican el valor encontrado. Usa la misma secuencia de sondeo que
+    # HashTable (_probe_sequence) sobre el hash estable de codec.
+    #
+    # Se abre en modo lectura o escritura. Solo debe haber un escritor; los
+    # lectores de otros procesos ven sus cambios al vuelo y repiten la
+    # búsqueda si coincide con una escritura (secuencia impar o cambiada).
+    # Cuando los buckets o el espacio de registros se llenan, el escritor
+    # construye un fichero nuevo más grande junto al actual y lo sustituye
+    # con os.replace, que es atómico: tras una caída queda el fichero viejo
+    # o el nuevo, completos. Los lectores que ya tenían abierto el viejo
+    # siguen viéndolo hasta que lo reabren.
+    #
+    # Las escrituras marcan la cabecera como sucia hasta el siguiente
+    # flush() (o close()). Si el proceso cae antes, al reabrir en escritura
+    # se recuentan los pares; las últimas escrituras pueden perderse. Si cae
+    # a mitad de una escritura, los lectores dejan de esperarla tras
+    # WRITER_TIMEOUT segundos.
+    __slots__ = (
+        "_path",
+        "_file",
+        "_map",
+        "_writable",
+        "_capacity",
+        "_probing",
+        "_stale_sequence",
+    )
+
+    # Crea el fichero path con los pares de mapping y lo abre en escritura.
+    # capacity y data_size se calculan por defecto para los pares iniciales
+    # más un margen de spare (fracción) para escrituras posteriores.
+    @classmethod
+    def create(
+        cls,
+        path,
+        mapping=(),
+        capacity=None,
+        data_size=None,
+        probing=LINEAR,
+        spare=0.25,
+    ):
+        if probing not in FILE_PROBING_STRATEGIES:
+            raise ValueError(f"Unsupported probing strategy: {probing!r}")
+        encoded = [(encode(key), encode(value)) for key, value in _items(mapping)]
+        cls._build(path, encoded, capacity, data_size, probing, spare)
+        return cls.open(path, writable=True)
+
+    # Abre un fichero existente, en solo lectura por defecto.
+    @classmethod
+    def open(cls, path, writable=False):
+        file = open(path, "r+b" if writable else "rb")
+        try:
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            mapped = mmap.mmap(file.fileno(), 0, access=access)
+        except (OSError, ValueError):
+            file.close()
+            raise
+        hash_table = object.__new__(cls)
+        hash_table._path = os.fspath(path)
+        hash_table._file = file
+        hash_table._map = mapped
+        hash_table._writable = writable
+        # Secuencia impar de un escritor dado por muerto (ver WRITER_TIMEOUT).
+        hash_table._stale_sequence = None
+        try:
+            magic, version, probing, *_ = HEADER.unpack_from(mapped)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != VERSION:
+            hash_table.close()
+            raise ValueError(f"{path!r} is not a hash table file")
+        hash_table._probing = FILE_PROBING_STRATEGIES[probing]
+        hash_table._capacity = hash_table._field(_CAPACITY)
+        if writable and mapped[_DIRTY]:
+            hash_table._recount()
+        return hash_table
+
+    # Escribe un fichero temporal con los registros ya codificados y lo
+    # coloca en path de forma atómica.
+    @classmethod
+    def _build(cls, path, encoded, capacity, data_size, probing, spare):
+        if capacity is None:
+            expected = int(len(encoded) * (1 + spare)) + 1
+            capacity = _capacity_for(expected, DEFAULT_MAX_LOAD_FACTOR)
+        if data_size is None:
+            used = sum(len(key) + len(value) for key, value in encoded)
+            data_size = int(used * (1 + spare)) + 1024
+        data_start = HEADER.size + capacity * BUCKET.size
+        temporary = f"{os.fspath(path)}.tmp"
+        with open(temporary, "w+b") as file:
+            file.truncate(data_start + data_size)
+            with mmap.mmap(file.fileno(), 0) as mapped:
+                HEADER.pack_into(
+                    mapped,
+                    0,
+                    MAGIC,
+                    VERSION,
+                    FILE_PROBING_STRATEGIES.index(probing),
+                    0,
+                    0,
+                    0,
+                    capacity,
+                    0,
+                    0,
+                    data_size,
+                    data_start,
+                )
+                hash_table = object.__new__(cls)
+                hash_table._map = mapped
+                hash_table._capacity = capacity
+                hash_table._probing = probing
+                for key, value in encoded:
+                    hash_table._set_encoded(key, value)
+                mapped[_DIRTY] = 0
+                mapped.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._field(_LENGTH)
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def __getitem__(self, key):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, MISSING) is not MISSING
+
+    # Solo en escritura: inserta o actualiza un par, creciendo el fichero
+    # si hace falta.
+    def __setitem__(self, key, value):
+        self._check_writable()
+        data = encode(key)
+        value = encode(value)
+        try:
+            self._set_encoded(data, value)
+        except OverflowError:
+            self._grow(len(data) + len(value))
+            self._set_encoded(data, value)
+
+    # Solo en escritura: borra un par dejando el bucket como borrado.
+    def __delitem__(self, key):
+        self._check_writable()
+        data = encode(key)
+        bucket, found = self._find(data, stable_hash(data))
+        if found is None:
+            raise KeyError(key)
+        self._begin_write()
+        try:
+            BUCKET.pack_into(
+                self._map, self._bucket_position(bucket), 0, DELETED_OFFSET, 0, 0
+            )
+            self._set_field(_LENGTH, self._field(_LENGTH) - 1)
+        finally:
+            self._end_write()
+
+    # get segura que devuelve default si la clave no existe.
+    def get(self, key, default=None):
+        data = encode(key)
+        hash_value = stable_hash(data)
+        deadline = None
+        while True:
+            sequence = self._field(_SEQUENCE)
+            if sequence & 1 and sequence != self._stale_sequence:
+                # El escritor está a mitad de una escritura.
+                if deadline is None:
+                    deadline = time.monotonic() + WRITER_TIMEOUT
+                if time.monotonic() < deadline:
+                    time.sleep(0)
+                    continue
+                # No la ha terminado a tiempo: se da por muerto y ni esta
+                # ni las siguientes búsquedas esperan a esta secuencia.
+                self._stale_sequence = sequence
+            try:
+                _, found = self._find(data, hash_value)
+                if found is None:
+                    value = default
+                else:
+                    offset, key_size, value_size = found
+                    start = offset + key_size
+                    value = decode(self._map[start:start + value_size])
+            except Exception:
+                if self._field(_SEQUENCE) == sequence:
+                    raise
+                continue
+            if self._field(_SEQUENCE) == sequence:
+                return value
+
+    # Pares (clave, valor) en el orden de los buckets. Solo es coherente
+    # si no hay escrituras concurrentes.
+    def items(self):
+        mapped = self._map
+        for bucket in range(self._capacity):
+            _, offset, key_size, value_size = BUCKET.unpack_from(
+                mapped, self._bucket_position(bucket)
+            )
+            if offset <= DELETED_OFFSET:
+                continue
+            key = decode(mapped[offset:offset + key_size])
+            offset += key_size
+            yield key, decode(mapped[offset:offset + value_size])
+
+    # Copias al estilo de HashTable.
+    @property
+    def pairs(self):
+        return {Pair(key, value) for key, value in self.items()}
+
+    @property
+    def keys(self):
+        return set(self)
+
+    @property
+    def values(self):
+        return [value for _, value in self.items()]
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def probing(self):
+        return self._probing
+
+    # HashTable en memoria con los mismos pares.
+    def to_hashtable(self):
+        return HashTable.from_items(self.items(), size_hint=len(self))
+
+    # Vuelca los cambios al disco y limpia la marca de escritura.
+    def flush(self):
+        self._check_writable()
+        self._map.flush()
+        self._map[_DIRTY] = 0
+        self._map.flush()
+
+    def close(self):
+        if self._writable and not self._map.closed and self._map[_DIRTY]:
+            self.flush()
+        self._map.close()
+        self._file.close()
+
+    def _check_writable(self):
+        if not self._writable:
+            raise TypeError("Hash table file is open read-only")
+
+    def _field(self, position):
+        return _FIELD.unpack_from(self._map, position)[0]
+
+    def _set_field(self, position, value):
+        _FIELD.pack_into(self._map, position, value)
+
+    def _begin_write(self):
+        self._map[_DIRTY] = 1
+        self._set_field(_SEQUENCE, self._field(_SEQUENCE) + 1)
+
+    def _end_write(self):
+        self._set_field(_SEQUENCE, self._field(_SEQUENCE) + 1)
+
+    def _bucket_position(self, bucket):
+        return HEADER.size + bucket * BUCKET.size
+
+    # Sigue la secuencia de sondeo de HashTable. Devuelve
+    # (bucket, (posición, tamaño_clave, tamaño_valor)) si encuentra la clave
+    # codificada; si no, (bucket libre o None, None), reutilizando el
+    # primer bucket borrado de la cadena.
+    def _find(self, data, hash_value):
+        mapped = self._map
+        size = len(data)
+        free = None
+        for bucket in _probe_sequence(hash_value, self._capacity, self._probing):
+            stored_hash, offset, key_size, value_size = BUCKET.unpack_from(
+                mapped, HEADER.size + bucket * BUCKET.size
+            )
+            if offset == EMPTY_OFFSET:
+                return (bucket if free is None else free), None
+            if offset == DELETED_OFFSET:
+                if free is None:
+                    free = bucket
+            elif (
+                stored_hash == hash_value
+                and key_size == size
+                and mapped[offset:offset + size] == data
+            ):
+                return bucket, (offset, key_size, value_size)
+        return free, None
+
+    # Inserción con clave y valor ya codificados. Lanza OverflowError si no
+    # caben. El registro y el espacio usado se escriben antes de apuntar el
+    # bucket, así que una caída a mitad solo pierde espacio.
+    def _set_encoded(self, data, value):
+        hash_value = stable_hash(data)
+        bucket, found = self._find(data, hash_value)
+        size = len(data) + len(value)
+        data_used = self._field(_DATA_USED)
+        data_end = HEADER.size + self._capacity * BUCKET.size
+        if data_used + size > data_end + self._field(_DATA_SIZE):
+            raise OverflowError("Hash table file is full")
+        reused = False
+        if found is None:
+            if bucket is None:
+                raise OverflowError("Hash table file is full")
+            position = self._bucket_position(bucket)
+            reused = BUCKET.unpack_from(self._map, position)[1] == DELETED_OFFSET
+            filled = self._field(_FILLED) + (0 if reused else 1)
+            if filled > self._capacity * DEFAULT_MAX_LOAD_FACTOR:
+                raise OverflowError("Hash table file is full")
+        self._begin_write()
+        try:
+            mapped = self._map
+            mapped[data_used:data_used + len(data)] = data
+            mapped[data_used + len(data):data_used + size] = value
+            self._set_field(_DATA_USED, data_used + size)
+            BUCKET.pack_into(
+                mapped,
+                self._bucket_position(bucket),
+                hash_value,
+                data_used,
+                len(data),
+                len(value),
+            )
+            if found is None:
+                self._set_field(_LENGTH, self._field(_LENGTH) + 1)
+                if not reused:
+                    self._set_field(_FILLED, self._field(_FILLED) + 1)
+        finally:
+            self._end_write()
+
+    # Sustituye el fichero por otro con el doble de espacio (o más, para
+    # que quepa un registro de extra bytes), sin registros obsoletos ni
+    # buckets borrados, y lo reabre.
+    def _grow(self, extra):
+        encoded = []
+        live_size = 0
+        mapped = self._map
+        for bucket in range(self._capacity):
+            _, offset, key_size, value_size = BUCKET.unpack_from(
+                mapped, self._bucket_position(bucket)
+            )
+            if offset > DELETED_OFFSET:
+                start = offset + key_size
+                encoded.append(
+                    (mapped[offset:start], mapped[start:start + value_size])
+                )
+                live_size += key_size + value_size
+        capacity = max(
+            self._capacity,
+            _capacity_for(2 * (len(encoded) + 1), DEFAULT_MAX_LOAD_FACTOR),
+        )
+        data_size = 2 * (live_size + extra) + 1024
+        # En Windows no se puede reemplazar un fichero abierto.
+        self.close()
+        try:
+            self._build(
+                self._path, encoded, capacity, data_size, self._probing, 0
+            )
+        finally:
+            self._file = open(self._path, "r+b")
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_WRITE
+            )
+            self._capacity = self._field(_CAPACITY)
+
+    # Recalcula los contadores a partir de los buckets tras una caída.
+    def _recount(self):
+        length = filled = 0
+        for bucket in range(self._capacity):
+            offset = BUCKET.unpack_from(self._map, self._bucket_position(bucket))[1]
+            if offset != EMPTY_OFFSET:
+                filled += 1
+                if offset != DELETED_OFFSET:
+                    length += 1
+        self._set_field(_LENGTH, length)
+        self._set_field(_FILLED, filled)
+        if self._field(_SEQUENCE) & 1:
+            self._set_field(_SEQUENCE, self._field(_SEQUENCE) + 1)
+        self.flush()
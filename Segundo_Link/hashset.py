@@ -0,0 +1,373 @@
+from operator import length_hint
+
+from hashtable import _base_type, _OpenAddressingTable
+
+# Slots con el almacenamiento de una tabla (no su configuración ni sus
+# métricas), que una operación en el sitio puede tomar de otra tabla.
+_STORAGE_SLOTS = (
+    "_indices",
+    "_hashes",
+    "_keys",
+    "_len",
+    "_deleted",
+    "_old",
+    "_rehash_position",
+    "_migrated",
+    "_seeds",
+    "_stash",
+    "_stash_limit",
+)
+
+
+# Reconstruye un HashSet serializado con __reduce__.
+def _load_hashset(cls, keys, capacity, options):
+    return cls.from_iterable(keys, capacity=capacity, **options)
+
+
+class HashSet(_OpenAddressingTable):
+    # Conjunto sobre el mismo motor que HashTable, pero con solo claves:
+    # no reserva ninguna columna de valores. Admite las mismas opciones
+    # (capacidad, factores de carga, sondeo, redimensionado incremental y
+    # métricas).
+    #
+    # Las operaciones de conjuntos recorren el operando más pequeño y
+    # buscan en el mayor, y con otro HashSet (o una HashTable, por sus
+    # claves) reutilizan los hashes almacenados en lugar de llamar a
+    # hash(). Los métodos con nombre aceptan cualquier iterable, como los
+    # de set; los operadores, solo otro HashSet.
+    __slots__ = ()
+
+    # Construye un HashSet a partir de un iterable de claves. size_hint
+    # (por defecto, la longitud estimada del iterable) dimensiona el
+    # conjunto de antemano para no redimensionar durante la carga; capacity
+    # es la capacidad mínima. Las claves de otro HashSet o de una
+    # HashTable se copian con sus hashes almacenados y sin buscarlas, ya
+    # que son distintas. El resto de argumentos se pasan al constructor.
+    @classmethod
+    def from_iterable(cls, iterable, size_hint=None, capacity=None, **options):
+        if isinstance(iterable, _OpenAddressingTable):
+            hash_set = cls._presized(len(iterable), capacity, options)
+            for hash_value, key in iterable._hashed_keys():
+                hash_set._append(key, hash_value)
+            return hash_set
+        if size_hint is None:
+            size_hint = length_hint(iterable)
+        hash_set = cls._presized(size_hint, capacity, options)
+        for key in iterable:
+            hash_set._add(key, hash(key))
+        return hash_set
+
+    def __contains__(self, key):
+        return self._contains(key, hash(key))
+
+    # Igualdad de conjuntos: mismo tamaño y uno contenido en el otro, sin
+    # construir conjuntos intermedios.
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if _base_type(self) is not _base_type(other):
+            return False
+        return len(self) == len(other) and self._is_subset(other)
+
+    # Representación en string similar a un literal set, en orden de
+    # inserción.
+    def __str__(self):
+        return "{" + ", ".join(repr(key) for key in self) + "}"
+
+    def __repr__(self):
+        keys = ", ".join(repr(key) for key in self)
+        return f"{self.__class__.__name__}.from_iterable([{keys}])"
+
+    # pickle reconstruye el conjunto con la misma configuración.
+    def __reduce__(self):
+        return _load_hashset, (
+            _base_type(self),
+            list(self),
+            self._min_capacity,
+            self._options(),
+        )
+
+    # Añade una clave (no hace nada si ya está).
+    def add(self, key):
+        self._add(key, hash(key))
+
+    # Elimina una clave; lanza KeyError si no está.
+    def remove(self, key):
+        self._delete(key, hash(key))
+
+    # Elimina una clave si está.
+    def discard(self, key):
+        self._discard(key, hash(key))
+
+    # Vacía el conjunto conservando la configuración.
+    def clear(self):
+        self._take_storage(self._new(0))
+
+    # Operaciones de conjuntos que devuelven un HashSet nuevo.
+    def union(self, *others):
+        result = self.copy()
+        result.update(*others)
+        return result
+
+    def intersection(self, *others):
+        result = self
+        for other in others:
+            result = result._intersection(self._as_hashset(other))
+        return result.copy() if result is self else result
+
+    def difference(self, *others):
+        result = self
+        for other in others:
+            result = result._difference(self._as_hashset(other))
+        return result.copy() if result is self else result
+
+    def symmetric_difference(self, other):
+        return self._symmetric_difference(self._as_hashset(other))
+
+    # Versiones en el sitio.
+    def update(self, *others):
+        for other in others:
+            if other is self:
+                continue
+            if isinstance(other, _OpenAddressingTable):
+                self._reserve(len(other))
+                for hash_value, key in other._hashed_keys():
+                    self._add(key, hash_value)
+            else:
+                for key in other:
+                    self._add(key, hash(key))
+
+    # Si el otro operando es más pequeño se construye la intersección
+    # recorriéndolo y se adopta su almacenamiento; si no, se borran las
+    # claves propias que no están en él.
+    def intersection_update(self, *others):
+        for other in others:
+            other = self._as_hashset(other)
+            if len(other) < len(self):
+                self._take_storage(self._intersection(other))
+            else:
+                self._remove_keys([
+                    (hash_value, key)
+                    for hash_value, key in self._hashed_keys()
+                    if not other._contains(key, hash_value)
+                ])
+
+    def difference_update(self, *others):
+        for other in others:
+            if other is self:
+                self.clear()
+            elif (
+                isinstance(other, _OpenAddressingTable)
+                and len(other) > len(self)
+            ):
+                self._remove_keys([
+                    (hash_value, key)
+                    for hash_value, key in self._hashed_keys()
+                    if other._contains(key, hash_value)
+                ])
+            else:
+                self._remove_keys(_hashed(other))
+
+    def symmetric_difference_update(self, other):
+        if other is self:
+            self.clear()
+            return
+        other = self._as_hashset(other)
+        self._reserve(len(other))
+        for hash_value, key in other._hashed_keys():
+            if not self._discard(key, hash_value):
+                self._add(key, hash_value)
+
+    # Comparaciones de conjuntos; terminan en cuanto el resultado se
+    # conoce.
+    def issubset(self, other):
+        return self._is_subset(self._as_hashset(other))
+
+    def issuperset(self, other):
+        if isinstance(other, _OpenAddressingTable) and len(other) > len(self):
+            return False
+        return all(
+            self._contains(key, hash_value) for hash_value, key in _hashed(other)
+        )
+
+    def isdisjoint(self, other):
+        if isinstance(other, _OpenAddressingTable):
+            smaller, larger = sorted((self, other), key=len)
+            return not any(
+                larger._contains(key, hash_value)
+                for hash_value, key in smaller._hashed_keys()
+            )
+        return not any(
+            self._contains(key, hash_value) for hash_value, key in _hashed(other)
+        )
+
+    # Operadores, solo entre HashSet como los de set.
+    def __or__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        smaller, larger = sorted((self, other), key=len)
+        result = self._copy_of(larger, len(smaller))
+        for hash_value, key in smaller._hashed_keys():
+            result._add(key, hash_value)
+        return result
+
+    def __and__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        return self._intersection(other)
+
+    def __sub__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        return self._difference(other)
+
+    def __xor__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        return self._symmetric_difference(other)
+
+    def __ior__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        self.symmetric_difference_update(other)
+        return self
+
+    def __le__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        return self._is_subset(other)
+
+    def __lt__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        return len(self) < len(other) and self._is_subset(other)
+
+    def __ge__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        return other._is_subset(self)
+
+    def __gt__(self, other):
+        if not isinstance(other, HashSet):
+            return NotImplemented
+        return len(self) > len(other) and other._is_subset(self)
+
+    # Añade una clave con el hash ya calculado, si no está.
+    def _add(self, key, hash_value):
+        _, index, entry = self._locate(key, hash_value)
+        if entry < 0:
+            self._append(key, hash_value, index)
+
+    # True si todas las claves están en other (un HashSet o una
+    # HashTable). Sale en cuanto falta una.
+    def _is_subset(self, other):
+        if len(self) > len(other):
+            return False
+        return all(
+            other._contains(key, hash_value)
+            for hash_value, key in self._hashed_keys()
+        )
+
+    # Intersección recorriendo el operando más pequeño. Sus claves ya son
+    # distintas, así que se añaden al resultado sin buscarlas.
+    def _intersection(self, other):
+        smaller, larger = sorted((self, other), key=len)
+        result = self._new(len(smaller))
+        for hash_value, key in smaller._hashed_keys():
+            if larger._contains(key, hash_value):
+                result._append(key, hash_value)
+        return result
+
+    # Diferencia: si self es el más pequeño se filtran sus claves; si no,
+    # se copia y se borran las del otro.
+    def _difference(self, other):
+        if len(self) <= len(other):
+            result = self._new(len(self))
+            for hash_value, key in self._hashed_keys():
+                if not other._contains(key, hash_value):
+                    result._append(key, hash_value)
+            return result
+        result = self.copy()
+        result._remove_keys(other._hashed_keys())
+        return result
+
+    # Diferencia simétrica: copia del mayor en la que cada clave del menor
+    # se borra si está o se añade si no.
+    def _symmetric_difference(self, other):
+        smaller, larger = sorted((self, other), key=len)
+        result = self._copy_of(larger, len(smaller))
+        for hash_value, key in smaller._hashed_keys():
+            if not result._discard(key, hash_value):
+                result._add(key, hash_value)
+        return result
+
+    # Borra las claves de un iterable de pares (hash, clave) que estén.
+    def _remove_keys(self, hashed_keys):
+        for hash_value, key in hashed_keys:
+            self._discard(key, hash_value)
+
+    # Convierte un iterable en HashSet (los HashSet y las HashTable se
+    # usan tal cual), para poder buscar en él.
+    def _as_hashset(self, other):
+        if isinstance(other, _OpenAddressingTable):
+            return other
+        return _base_type(self).from_iterable(other, **self._options())
+
+    # HashSet vacío con la configuración de este y sitio para size claves.
+    def _new(self, size):
+        return _base_type(self)._presized(
+            size, self._min_capacity, self._options()
+        )
+
+    # Copia de las claves de table (este conjunto u otra tabla) con la
+    # configuración de este y sitio para extra claves más.
+    def _copy_of(self, table, extra):
+        if table is self:
+            result = self.copy()
+            result._reserve(extra)
+            return result
+        result = self._new(len(table) + extra)
+        for hash_value, key in table._hashed_keys():
+            result._append(key, hash_value)
+        return result
+
+    # Opciones del constructor de este conjunto.
+    def _options(self):
+        return {
+            "max_load_factor": self._max_load_factor,
+            "min_load_factor": self._min_load_factor,
+            "probing": self._probing,
+            "incremental_resize": self._incremental,
+        }
+
+    # Sustituye el almacenamiento por el de otro HashSet, que no debe
+    # volver a usarse. La configuración y las métricas se conservan.
+    def _take_storage(self, other):
+        for name in _STORAGE_SLOTS:
+            setattr(self, name, getattr(other, name))
+        self._version += 1
+
+
+# Pares (hash, clave) de un iterable cualquiera.
+def _hashed(iterable):
+    if isinstance(iterable, _OpenAddressingTable):
+        return iterable._hashed_keys()
+    return ((hash(key), key) for key in iterable)
@@ -1,113 +1,1241 @@
+import io
+import pickle
+import struct
+import time
+import weakref
+from array import array
+from collections import Counter
+from collections.abc import ItemsView, KeysView, ValuesView
+from copy import deepcopy
+from itertools import compress
+from operator import length_hint
 from typing import Any, NamedTuple
 
 # Objeto marcador usado internamente para señalar una ranura eliminada.
 # Usamos un objeto único para evitar colisiones con claves/valores del usuario.
 DELETED = object()
 
+# Marcador de "sin valor" para distinguir una clave ausente de un valor
+# None sin recurrir a excepciones.
+MISSING = object()
 
-# Par inmutable simple para almacenar tuplas (clave, valor) en los slots.
+# Fracción de la capacidad ocupada por entradas eliminadas a partir de la
+# cual, al necesitar sitio, se compacta la tabla (rehash a la misma
+# capacidad) en lugar de duplicarla.
+COMPACT_THRESHOLD = 1 / 4
+
+# Factor de carga máximo por defecto.
+DEFAULT_MAX_LOAD_FACTOR = 2 / 3
+
+# Entradas que migra cada lectura, escritura o borrado mientras dura un
+# redimensionado incremental.
+INCREMENTAL_REHASH_STEP = 16
+
+# Valores especiales del array de índices: ranura vacía y ranura eliminada
+# (el equivalente a DELETED). Cualquier otro valor es la posición de la
+# entrada en el almacenamiento denso.
+EMPTY_INDEX = -1
+DELETED_INDEX = -2
+
+# Estrategias de sondeo seleccionables en el constructor:
+# - "linear": índice + 1 (la original, por defecto).
+# - "perturbed": como dict en CPython, mezcla los bits altos del hash en la
+#   secuencia para romper los agrupamientos primarios.
+# - "robinhood": sondeo lineal donde las claves más alejadas de su ranura
+#   de origen desplazan a las más cercanas; el borrado desplaza la cadena
+#   hacia atrás y no deja ranuras DELETED_INDEX.
+# - "cuckoo": cada clave solo puede estar en CUCKOO_HASHES cubos de
+#   CUCKOO_BUCKET_SIZE ranuras, así que una búsqueda mira como mucho
+#   CUCKOO_HASHES * CUCKOO_BUCKET_SIZE ranuras (más el stash, ver abajo).
+#   Al insertar en cubos llenos se desaloja a un residente hacia su otro
+#   cubo; el borrado tampoco deja ranuras DELETED_INDEX.
+LINEAR = "linear"
+PERTURBED = "perturbed"
+ROBIN_HOOD = "robinhood"
+CUCKOO = "cuckoo"
+PROBING_STRATEGIES = (LINEAR, PERTURBED, ROBIN_HOOD, CUCKOO)
+
+# Desplazamiento de bits del sondeo perturbado (PERTURB_SHIFT en CPython) y
+# máscara para tratar el hash como un entero sin signo de 64 bits.
+PERTURB_SHIFT = 5
+_HASH_MASK = (1 << 64) - 1
+
+# Parámetros del hashing cuckoo: funciones de hash (una semilla por cubo
+# candidato), ranuras por cubo y desalojos encadenados antes de rendirse.
+# Una entrada que no encuentra sitio va al stash, una lista pequeña que
+# también se consulta al buscar; si supera CUCKOO_STASH_SIZE entradas la
+# tabla se reconstruye con otras semillas (hasta CUCKOO_MAX_RESEEDS
+# veces). Solo las claves con hash idéntico, que ninguna semilla separa,
+# pueden dejar el stash más lleno: entonces se tolera hasta que duplique
+# su tamaño, para que reconstruir siga siendo O(1) amortizado.
+CUCKOO_HASHES = 2
+CUCKOO_BUCKET_SIZE = 4
+CUCKOO_MAX_KICKS = 64
+CUCKOO_STASH_SIZE = 4
+CUCKOO_MAX_RESEEDS = 8
+CUCKOO_SEEDS = (0x1E3779B97F4A7C15, 0x3C6EF372FE94F82A)
+
+# Constantes del finalizador de splitmix64, que mezcla el hash con cada
+# semilla para obtener funciones de hash independientes (y con el hash del
+# valor para la huella de contenido).
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+
+# Formato binario de dump()/load(): cabecera con la configuración (incluido
+# si la huella de contenido está activa) y los contadores, seguida del
+# array de índices, los hashes densos, las posiciones de los huecos y las
+# columnas de claves y valores vivos. Los arrays se escriben en el orden de
+# bytes de la máquina.
+SNAPSHOT_MAGIC = b"HTS1"
+SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct("<4sBB??dd7q")
+
+# Los hashes de str y bytes cambian entre procesos (PYTHONHASHSEED). El
+# hash de esta cadena, guardado en la cabecera, indica al cargar si los
+# hashes almacenados siguen valiendo.
+_SNAPSHOT_HASH_PROBE = "HashTable snapshot"
+
+# Tipos de clave cuyo hash solo depende del valor (y, en str y bytes, de
+# la semilla que comprueba _SNAPSHOT_HASH_PROBE). El de otras claves (None
+# antes de Python 3.12, clases, funciones, object()...) puede depender de
+# la identidad del objeto y cambiar en otro proceso.
+_STABLE_HASH_TYPES = (str, bytes, int)
+
+
+# Las instantáneas de HashTable.snapshot() comparten las columnas de la
+# tabla por bloques de SNAPSHOT_BLOCK_SIZE posiciones: la primera escritura
+# de la tabla en un bloque le copia a cada instantánea ese bloque.
+SNAPSHOT_BLOCK_BITS = 10
+SNAPSHOT_BLOCK_SIZE = 1 << SNAPSHOT_BLOCK_BITS
+
+
+# Par inmutable simple para devolver tuplas (clave, valor).
 class Pair(NamedTuple):
     key: Any
     value: Any
 
 
-class HashTable:
-    # Construye una HashTable a partir de un diccionario plano. capacity
-    # es opcional y sobreescribe el tamaño por defecto (longitud del dict).
+# Foto de las métricas de una tabla devuelta por stats(). Los histogramas
+# de sondeo ({ranuras visitadas: búsquedas}) y los redimensionados solo se
+# registran con enable_stats(); el resto se calcula al pedir la foto.
+class HashTableStats(NamedTuple):
+    size: int
+    capacity: int
+    load_factor: float
+    tombstones: int
+    longest_cluster: int
+    hit_probe_lengths: dict
+    miss_probe_lengths: dict
+    resizes: int
+    resize_seconds: float
+
+
+# Evento que recibe el callback on_resize de enable_stats().
+class ResizeEvent(NamedTuple):
+    old_capacity: int
+    new_capacity: int
+    size: int
+    seconds: float
+
+
+# Vistas vivas al estilo de dict: no copian nada y reflejan los cambios de
+# la tabla. Las de valores y pares recorren el almacenamiento denso en vez
+# de buscar cada clave.
+class HashTableValuesView(ValuesView):
+    __slots__ = ()
+
+    def __iter__(self):
+        for _, value in self._mapping._iter_entries():
+            yield value
+
+
+class HashTableItemsView(ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return self._mapping._iter_entries()
+
+
+# Typecode más pequeño del módulo array capaz de guardar posiciones de
+# entradas en una tabla de la capacidad dada, como hace dict en CPython.
+def _index_typecode(capacity):
+    if capacity <= 0x7F:
+        return "b"
+    if capacity <= 0x7FFF:
+        return "h"
+    if capacity <= 0x7FFFFFFF:
+        return "i"
+    return "q"
+
+
+# Capacidad mínima para guardar size entradas sin superar el factor de
+# carga máximo, es decir, sin tener que redimensionar.
+def _capacity_for(size, max_load_factor):
+    capacity = max(1, int(size / max_load_factor))
+    while size > capacity * max_load_factor:
+        capacity += 1
+    return capacity
+
+
+# Generador de sondeo: produce los índices de ranura empezando en hash
+# módulo capacidad. El sondeo lineal (también el de Robin Hood) avanza de
+# uno en uno envolviendo al final de la tabla. El perturbado sigue la
+# recurrencia de CPython mientras quedan bits del hash y después recorre la
+# tabla linealmente, de modo que visita todas las ranuras sea cual sea la
+# capacidad. Es una función de módulo para que las tablas en disco sigan
+# exactamente la misma secuencia.
+def _probe_sequence(hash_value, capacity, probing):
+    index = hash_value % capacity
+    if probing == PERTURBED:
+        perturb = hash_value & _HASH_MASK
+        while perturb:
+            yield index
+            perturb >>= PERTURB_SHIFT
+            index = (5 * index + 1 + perturb) % capacity
+    for _ in range(capacity):
+        yield index
+        index += 1
+        if index == capacity:
+            index = 0
+
+
+# Hash de 64 bits sin signo de hash_value mezclado con una semilla.
+def _mix64(hash_value, seed):
+    x = (hash_value ^ seed) & _HASH_MASK
+    x = ((x ^ (x >> 30)) * _MIX_1) & _HASH_MASK
+    x = ((x ^ (x >> 27)) * _MIX_2) & _HASH_MASK
+    return x ^ (x >> 31)
+
+
+# Aportación de un par a la huella de contenido de una HashTable: mezcla
+# el hash de la clave con el del valor. Los valores no hashables aportan
+# lo mismo sea cual sea su contenido, así que la huella solo puede
+# descartar igualdades, nunca confirmarlas.
+def _entry_fingerprint(hash_value, value):
+    try:
+        value_hash = hash(value)
+    except TypeError:
+        value_hash = 0
+    return _mix64(hash_value, _mix64(value_hash, 0))
+
+
+# Semillas siguientes tras un ciclo de desalojos, deterministas para que
+# la tabla sea reproducible. Caben en un entero de 63 bits (ver dump).
+def _next_cuckoo_seeds(seeds):
+    return tuple(_mix64(seed, CUCKOO_SEEDS[0]) >> 1 for seed in seeds)
+
+
+# Ranuras candidatas de un hash en una tabla cuckoo: las de los cubos
+# elegidos por cada semilla, siempre distintos (si hay bastantes cubos).
+# El último cubo puede ser más corto si la capacidad no es múltiplo de
+# CUCKOO_BUCKET_SIZE.
+def _cuckoo_slots(hash_value, capacity, seeds):
+    buckets = -(-capacity // CUCKOO_BUCKET_SIZE)
+    chosen = []
+    for seed in seeds[:buckets]:
+        bucket = _mix64(hash_value, seed) % buckets
+        while bucket in chosen:
+            bucket = bucket + 1 if bucket + 1 < buckets else 0
+        chosen.append(bucket)
+    slots = []
+    for bucket in chosen:
+        start = bucket * CUCKOO_BUCKET_SIZE
+        slots.extend(range(start, min(start + CUCKOO_BUCKET_SIZE, capacity)))
+    return slots
+
+
+# Array de índices con todas las ranuras vacías.
+def _empty_indices(capacity):
+    return array(_index_typecode(capacity), [EMPTY_INDEX]) * capacity
+
+
+# Escribe una columna de claves o valores en bloque: si todos son str,
+# bytes o int de 64 bits se guardan en binario (longitudes y datos
+# concatenados, o un array de enteros); si no, la lista entera con pickle.
+def _dump_column(file, items):
+    if all(type(item) is str for item in items):
+        encoded = [item.encode("utf-8", "surrogatepass") for item in items]
+        file.write(b"s")
+        array("q", map(len, encoded)).tofile(file)
+        file.write(b"".join(encoded))
+        return
+    if all(type(item) is bytes for item in items):
+        file.write(b"b")
+        array("q", map(len, items)).tofile(file)
+        file.write(b"".join(items))
+        return
+    if all(type(item) is int for item in items):
+        try:
+            integers = array("q", items)
+        except OverflowError:
+            pass
+        else:
+            file.write(b"q")
+            integers.tofile(file)
+            return
+    data = pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)
+    file.write(b"p")
+    file.write(struct.pack("<q", len(data)))
+    file.write(data)
+
+
+# Lee una columna de count elementos escrita por _dump_column.
+def _load_column(file, count):
+    tag = file.read(1)
+    if tag == b"q":
+        integers = array("q")
+        integers.fromfile(file, count)
+        return integers.tolist()
+    if tag == b"p":
+        (size,) = struct.unpack("<q", file.read(8))
+        return pickle.loads(file.read(size))
+    if tag not in (b"s", b"b"):
+        raise ValueError(f"Unknown snapshot column type: {tag!r}")
+    lengths = array("q")
+    lengths.fromfile(file, count)
+    blob = file.read(sum(lengths))
+    if tag == b"s":
+        # Con texto ASCII se decodifica una sola vez y se trocea el str.
+        blob = blob.decode("ascii") if blob.isascii() else memoryview(blob)
+    items = []
+    start = 0
+    for length in lengths:
+        end = start + length
+        items.append(blob[start:end])
+        start = end
+    if tag == b"s" and isinstance(blob, memoryview):
+        items = [str(item, "utf-8", "surrogatepass") for item in items]
+    return items
+
+
+# True si los hashes guardados de las claves vivas (por dump() o antes de
+# copiarlas con deepcopy) valen para estas claves en este proceso, con la
+# semilla de str ya comprobada: las claves de _STABLE_HASH_TYPES se dan
+# por buenas y las demás se vuelven a hashear.
+def _stored_hashes_match(hashes, keys):
+    for hash_value, key in zip(hashes, keys):
+        if key is DELETED or type(key) in _STABLE_HASH_TYPES:
+            continue
+        if hash(key) != hash_value:
+            return False
+    return True
+
+
+# Reconstruye una HashTable serializada con __reduce__.
+def _load_snapshot(data):
+    return HashTable.load(io.BytesIO(data))
+
+
+class _SnapshotColumn:
+    # Columna de una instantánea (ver HashTable.snapshot): se lee como la
+    # columna de la tabla (list o array) tal como estaba al crearla. Las
+    # posiciones se leen de la columna compartida salvo en los bloques que
+    # la tabla ha modificado desde entonces, de los que guarda una copia
+    # anterior a la escritura.
+    __slots__ = ("_column", "_length", "_blocks", "__weakref__")
+
+    def __init__(self, column):
+        self._column = column
+        self._length = len(column)
+        # Copias de los bloques modificados, por número de bloque.
+        self._blocks = {}
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("snapshot column index out of range")
+        block = self._blocks.get(position >> SNAPSHOT_BLOCK_BITS)
+        if block is None:
+            return self._column[position]
+        return block[position & (SNAPSHOT_BLOCK_SIZE - 1)]
+
+    # Recorre la columna bloque a bloque: cada bloque sin copia se lee de
+    # la columna compartida con un slice.
+    def __iter__(self):
+        blocks = self._blocks
+        for start in range(0, self._length, SNAPSHOT_BLOCK_SIZE):
+            block = blocks.get(start >> SNAPSHOT_BLOCK_BITS)
+            if block is None:
+                stop = min(start + SNAPSHOT_BLOCK_SIZE, self._length)
+                block = self._column[start:stop]
+            yield from block
+
+    # Llamado por la tabla antes de escribir en position: copia su bloque
+    # la primera vez.
+    def _preserve(self, position):
+        number = position >> SNAPSHOT_BLOCK_BITS
+        if position < self._length and number not in self._blocks:
+            start = number << SNAPSHOT_BLOCK_BITS
+            stop = min(start + SNAPSHOT_BLOCK_SIZE, self._length)
+            self._blocks[number] = self._column[start:stop]
+
+    # Columna independiente (del mismo tipo que la compartida) con el
+    # contenido de la instantánea.
+    def materialize(self):
+        column = self._column[:self._length]
+        missing = self._length - len(column)
+        if missing:
+            # La tabla ha acortado la columna (popitem): se rellena hasta la
+            # longitud de la instantánea antes de escribir cada bloque
+            # guardado en su sitio, que cubren todo lo que falta.
+            if isinstance(column, array):
+                column.frombytes(bytes(missing * column.itemsize))
+            else:
+                column.extend([None] * missing)
+        for number, block in self._blocks.items():
+            start = number << SNAPSHOT_BLOCK_BITS
+            column[start:start + len(block)] = block
+        return column
+
+
+class _OpenAddressingTable:
+    # Motor de direccionamiento abierto compartido por HashTable y HashSet:
+    # un array de índices del tamaño de la capacidad apunta a listas densas
+    # y paralelas de hashes y claves, en orden de inserción, con las
+    # estrategias de sondeo, el redimensionado (también incremental) y las
+    # métricas. Las subclases añaden sus columnas densas (los valores de
+    # HashTable) extendiendo _remove, _compact, _start_rehash y
+    # _migrate_entry.
+    __slots__ = (
+        "_indices",
+        "_hashes",
+        "_keys",
+        "_len",
+        "_deleted",
+        "_max_load_factor",
+        "_min_load_factor",
+        "_min_capacity",
+        "_probing",
+        "_version",
+        "_incremental",
+        "_old",
+        "_rehash_position",
+        "_migrated",
+        "_seeds",
+        "_stash",
+        "_stash_limit",
+        "_stats",
+        "_snapshots",
+    )
+
+    # Tabla vacía con capacidad para size entradas (o capacity, si es
+    # mayor) sin redimensionar.
     @classmethod
-    def from_dict(cls, dictionary, capacity=None):
-        hash_table = cls(capacity or len(dictionary))
-        for key, value in dictionary.items():
-            hash_table[key] = value
-        return hash_table
+    def _presized(cls, size, capacity, options):
+        max_load_factor = options.get(
+            "max_load_factor", DEFAULT_MAX_LOAD_FACTOR
+        )
+        needed = _capacity_for(size, max_load_factor)
+        return cls(max(capacity or needed, needed), **options)
 
     # Crea una tabla hash con una capacidad inicial (8 por defecto).
-    # La capacidad debe ser un número positivo.
-    def __init__(self, capacity=8):
+    # La capacidad debe ser un número positivo. max_load_factor es la
+    # fracción de ranuras ocupadas (pares + entradas eliminadas) a partir de
+    # la cual la tabla crece, para que las cadenas de sondeo sean cortas.
+    # min_load_factor (0 = desactivado) permite encoger la tabla a la mitad
+    # cuando los borrados dejan pocos pares, sin bajar de la capacidad
+    # inicial. probing elige la estrategia de sondeo (ver
+    # PROBING_STRATEGIES). Con incremental_resize=True los redimensionados
+    # no reconstruyen la tabla de golpe: la tabla antigua y la nueva
+    # conviven y cada operación migra INCREMENTAL_REHASH_STEP entradas,
+    # acotando la latencia de la inserción que dispara el crecimiento.
+    def __init__(
+        self,
+        capacity=8,
+        max_load_factor=DEFAULT_MAX_LOAD_FACTOR,
+        min_load_factor=0,
+        probing=LINEAR,
+        incremental_resize=False,
+    ):
         if capacity < 1:
             raise ValueError("Capacity must be a positive number")
-        # Array interno de slots; cada slot puede ser None, DELETED o Pair.
-        self._slots = capacity * [None]
+        if not 0 < max_load_factor <= 1:
+            raise ValueError("Load factor must be a number in (0, 1]")
+        if not 0 <= min_load_factor < max_load_factor / 2:
+            raise ValueError(
+                "Minimum load factor must be less than half the maximum"
+            )
+        if probing not in PROBING_STRATEGIES:
+            raise ValueError(f"Unknown probing strategy: {probing!r}")
+        # Array de índices; cada ranura es EMPTY_INDEX, DELETED_INDEX o la
+        # posición de una entrada en _hashes/_keys (y columnas de la
+        # subclase).
+        self._indices = _empty_indices(capacity)
+        # Entradas densas. Una entrada borrada deja DELETED como clave hasta
+        # la siguiente reconstrucción.
+        self._hashes = array("q")
+        self._keys = []
+        self._max_load_factor = max_load_factor
+        self._min_load_factor = min_load_factor
+        self._min_capacity = capacity
+        self._probing = probing
+        # Contadores de pares vivos y de ranuras DELETED_INDEX, mantenidos
+        # en cada inserción y borrado para que len() sea O(1).
+        self._len = 0
+        self._deleted = 0
+        # Se incrementa en cada cambio estructural (alta, baja o
+        # reconstrucción) para detectar cambios durante la iteración.
+        self._version = 0
+        # Estado del redimensionado incremental: tabla antigua pendiente de
+        # migrar (None si no hay ninguno en curso), siguiente entrada densa
+        # suya por migrar y entradas ya migradas a esta.
+        self._incremental = incremental_resize
+        self._old = None
+        self._rehash_position = 0
+        self._migrated = 0
+        # Estado del hashing cuckoo: semillas actuales, entradas densas sin
+        # ranura y tamaño del stash que obliga a cambiar de semillas.
+        self._seeds = CUCKOO_SEEDS
+        self._stash = []
+        self._stash_limit = CUCKOO_STASH_SIZE
+        # Métricas de enable_stats() (None si están desactivadas).
+        self._stats = None
+        # Instantáneas que comparten columnas con esta tabla (ver
+        # HashTable.snapshot), o None si no se ha tomado ninguna.
+        self._snapshots = None
 
-    # Número de pares almacenados (excluye marcadores DELETED).
+    # Número de pares almacenados (excluye entradas eliminadas).
     def __len__(self):
-        return len(self.pairs)
+        return self._len
 
-    # Itera sobre las claves; permite `for k in hashtable:`.
+    # Itera sobre las claves en orden de inserción; permite
+    # `for k in hashtable:`. Lanza RuntimeError si la tabla cambia de
+    # tamaño durante la iteración.
     def __iter__(self):
-        yield from self.keys
+        self._finish_rehash()
+        version = self._version
+        for key in self._keys:
+            if key is not DELETED:
+                yield key
+                if self._version != version:
+                    raise RuntimeError(
+                        "HashTable changed size during iteration"
+                    )
 
-    # Elimina una clave de la tabla usando sondeo lineal (open addressing).
-    # Marca la ranura como DELETED para preservar las cadenas de sondeo.
-    def __delitem__(self, key):
-        for index, pair in self._probe(key):
-            if pair is None:
-                # Se alcanzó una ranura vacía: la clave no está presente.
-                raise KeyError(key)
-            if pair is DELETED:
-                # Omitir marcadores eliminados durante la búsqueda.
-                continue
-            if pair.key == key:
-                # Marcar la ranura como eliminada y salir.
-                self._slots[index] = DELETED
-                break
-        else:
-            # Se terminó el sondeo sin encontrar la clave.
+    # Elimina una clave con el hash ya calculado (también de la tabla
+    # antigua, si aún no se ha migrado); lanza KeyError si falta.
+    def _delete(self, key, hash_value):
+        if not self._discard(key, hash_value):
             raise KeyError(key)
 
-    # Inserta o actualiza un par clave/valor. Si no se encuentra ranura
-    # disponible (tabla al límite), redimensiona y rehace el rehash.
-    def __setitem__(self, key, value):
-        for index, pair in self._probe(key):
-            if pair is DELETED:
-                # No sobrescribimos inmediatamente un marcador DELETED; se
-                # sigue sondeando para preservar la búsqueda de otras claves.
-                continue
-            if pair is None or pair.key == key:
-                # Ranura vacía o actualización de la misma clave.
-                self._slots[index] = Pair(key, value)
+    # Como _delete, pero devuelve si la clave estaba en lugar de lanzar
+    # KeyError.
+    def _discard(self, key, hash_value):
+        table, index, entry = self._locate(key, hash_value)
+        if entry < 0:
+            return False
+        self._remove_located(table, index, entry)
+        return True
+
+    # Busca una clave con un solo sondeo de esta tabla y, durante un
+    # redimensionado incremental, de la antigua si no está en esta.
+    # Devuelve (tabla, ranura, entrada) con la tabla que la contiene; si
+    # falta, (self, ranura libre, -1) como _lookup, para insertarla sin
+    # volver a buscar.
+    def _locate(self, key, hash_value):
+        if self._old is not None:
+            self._rehash_step()
+        index, entry = self._lookup(key, hash_value)
+        old = self._old
+        if entry >= 0 or old is None:
+            return self, index, entry
+        old_index, old_entry = old._lookup(key, hash_value)
+        if old_entry >= 0:
+            return old, old_index, old_entry
+        return self, index, -1
+
+    # Elimina la entrada hallada por _locate en table (esta tabla o la
+    # antigua) y encoge la tabla si quedan pocos pares vivos.
+    def _remove_located(self, table, index, entry):
+        table._remove(index, entry)
+        self._len -= 1
+        self._version += 1
+        if self._is_under_load_factor():
+            self._rebuild(max(self.capacity // 2, self._min_capacity))
+
+    # True si la clave está en la tabla o, durante un redimensionado
+    # incremental, en la antigua.
+    def _contains(self, key, hash_value):
+        if self._old is not None:
+            self._rehash_step()
+        if self._lookup(key, hash_value)[1] >= 0:
+            return True
+        old = self._old
+        return old is not None and old._lookup(key, hash_value)[1] >= 0
+
+    # Añade como entrada densa nueva una clave que se sabe ausente (en
+    # esta tabla y en la antigua). index es la ranura libre hallada por
+    # _lookup, si se buscó. Si la entrada superaría el factor de carga
+    # máximo se hace sitio antes; como las ranuras ocupadas nunca superan
+    # a las entradas que cuentan para él (ver _used), así siempre queda
+    # alguna libre (con cuckoo, _place desaloja otras entradas si los
+    # cubos de la clave están llenos). Las columnas de la subclase se
+    # añaden después.
+    def _append(self, key, hash_value, index=None):
+        if self._is_over_load_factor():
+            self._make_room()
+            index = None
+        entry = len(self._keys)
+        self._hashes.append(hash_value)
+        self._keys.append(key)
+        self._len += 1
+        self._version += 1
+        self._place(entry, hash_value, index)
+
+    # copy.copy() es superficial, como copy(); copy.deepcopy() copia
+    # también las claves, conservando el marcador DELETED. El hash de una
+    # clave copiada puede no ser el del original (si depende de la
+    # identidad del objeto): si alguno cambia, la copia se reconstruye con
+    # los hashes nuevos.
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        memo[id(DELETED)] = DELETED
+        clone = self.copy()
+        clone._deepcopy_columns(memo)
+        if not _stored_hashes_match(clone._hashes, clone._keys):
+            clone._hashes = array(
+                "q", (0 if key is DELETED else hash(key) for key in clone._keys)
+            )
+            clone._resize_and_rehash(clone.capacity)
+        return clone
+
+    # Sustituye las columnas densas de una copia por copias en profundidad
+    # (las subclases añaden las suyas).
+    def _deepcopy_columns(self, memo):
+        self._keys = deepcopy(self._keys, memo)
+
+    # Devuelve una copia superficial preservando capacidad y configuración.
+    # Clona directamente el almacenamiento, sin volver a insertar pares.
+    def copy(self):
+        self._finish_rehash()
+        copy = object.__new__(type(self))
+        for name in _slot_names(type(self)):
+            setattr(copy, name, getattr(self, name))
+        copy._indices = self._indices[:]
+        copy._hashes = self._hashes[:]
+        copy._keys = self._keys[:]
+        copy._stash = self._stash[:]
+        copy._snapshots = None
+        return copy
+
+    # Recorre las entradas densas vivas como pares (hash, clave), para
+    # operar con otra tabla reutilizando sus hashes almacenados.
+    def _hashed_keys(self):
+        self._finish_rehash()
+        for hash_value, key in zip(self._hashes, self._keys):
+            if key is not DELETED:
+                yield hash_value, key
+
+    # Capacidad actual (número de ranuras del array de índices).
+    @property
+    def capacity(self):
+        return len(self._indices)
+
+    # Factor de carga máximo configurado en el constructor.
+    @property
+    def max_load_factor(self):
+        return self._max_load_factor
+
+    # Fracción de ranuras ocupadas por pares o por DELETED_INDEX.
+    @property
+    def load_factor(self):
+        return (self._len + self._deleted) / self.capacity
+
+    # Activa el registro de métricas de sondeo y redimensionado. La tabla
+    # pasa a una subclase instrumentada, así que sin activarlo no hay
+    # ningún coste en las operaciones. on_resize(ResizeEvent), si se da,
+    # se llama tras cada redimensionado.
+    def enable_stats(self, on_resize=None):
+        if self._stats is None:
+            self._stats = _Stats()
+            self.__class__ = _instrumented(type(self))
+        self._stats.on_resize = on_resize
+
+    # Desactiva el registro y descarta las métricas acumuladas.
+    def disable_stats(self):
+        if self._stats is not None:
+            self.__class__ = _base_type(self)
+            self._stats = None
+
+    # Foto de las métricas actuales (ver HashTableStats).
+    def stats(self):
+        stats = self._stats
+        return HashTableStats(
+            size=len(self),
+            capacity=self.capacity,
+            load_factor=self.load_factor,
+            tombstones=self._deleted,
+            longest_cluster=self._longest_cluster(),
+            hit_probe_lengths=dict(sorted(stats.hits.items())) if stats else {},
+            miss_probe_lengths=(
+                dict(sorted(stats.misses.items())) if stats else {}
+            ),
+            resizes=stats.resizes if stats else 0,
+            resize_seconds=stats.resize_seconds if stats else 0.0,
+        )
+
+    # Racha más larga de ranuras no vacías (vivas o DELETED_INDEX), que
+    # acota el sondeo de un fallo. Tiene en cuenta la vuelta al principio.
+    def _longest_cluster(self):
+        longest = run = leading = 0
+        for entry in self._indices:
+            if entry == EMPTY_INDEX:
+                longest = max(longest, run)
+                run = 0
+            else:
+                run += 1
+        capacity = self.capacity
+        if run == capacity:
+            return capacity
+        for entry in self._indices:
+            if entry == EMPTY_INDEX:
                 break
+            leading += 1
+        return max(longest, run + leading)
+
+    # Estrategia de sondeo configurada en el constructor.
+    @property
+    def probing(self):
+        return self._probing
+
+    # Máscara de entradas densas vivas, para filtrar con compress().
+    def _live_mask(self):
+        return [key is not DELETED for key in self._keys]
+
+    # Entradas que cuentan para el factor de carga: las densas, incluidos
+    # los huecos de las eliminadas hasta la siguiente reconstrucción. Como
+    # popitem recorta los huecos del final pero sus ranuras siguen como
+    # DELETED_INDEX, cuentan también los pares vivos más esas ranuras, si
+    # son más: así las ranuras ocupadas nunca superan a las que cuentan.
+    def _used(self):
+        return max(len(self._keys), self._len + self._deleted)
+
+    # True si añadir una entrada densa más superaría el factor de carga.
+    def _is_over_load_factor(self):
+        return self._used() + 1 > self.capacity * self._max_load_factor
+
+    # True si la tabla puede encoger porque quedan pocos pares vivos.
+    def _is_under_load_factor(self):
+        return (
+            self._len < self.capacity * self._min_load_factor
+            and self.capacity > self._min_capacity
+        )
+
+    # Garantiza sitio para size entradas nuevas con una sola
+    # reconstrucción como mucho.
+    def _reserve(self, size):
+        if self._used() + size > self.capacity * self._max_load_factor:
+            needed = _capacity_for(self._len + size, self._max_load_factor)
+            self._resize_and_rehash(max(self.capacity, needed))
+
+    # Hace sitio para una clave nueva. Si las entradas eliminadas ocupan al
+    # menos COMPACT_THRESHOLD de la tabla basta con compactarla; si no, se
+    # duplica la capacidad.
+    def _make_room(self):
+        self._finish_rehash()
+        if self._used() - self._len >= self.capacity * COMPACT_THRESHOLD:
+            self._rebuild(self.capacity)
         else:
-            # No se encontró ranura -> duplicar capacidad y reintentar.
-            self._resize_and_rehash()
-            self[key] = value
+            self._rebuild(self.capacity * 2)
+
+    # Reconstruye la tabla con la capacidad dada, de golpe o de forma
+    # incremental según la configuración.
+    def _rebuild(self, capacity):
+        if self._incremental:
+            self._start_rehash(capacity)
+        else:
+            self._resize_and_rehash(capacity)
+
+    # Generador de sondeo de la tabla (ver _probe_sequence); con cuckoo,
+    # las ranuras candidatas (ver _cuckoo_slots).
+    def _probe(self, hash_value):
+        if self._probing == CUCKOO:
+            return _cuckoo_slots(hash_value, len(self._indices), self._seeds)
+        return _probe_sequence(hash_value, len(self._indices), self._probing)
+
+    # Busca una clave siguiendo su cadena de sondeo. Devuelve
+    # (ranura, entrada) si la encuentra. Si no, devuelve la ranura donde
+    # insertarla (la primera DELETED_INDEX o la vacía que cierra la cadena,
+    # None si el sondeo se agotó) y -1. Solo se llama a __eq__ cuando el
+    # hash almacenado coincide y la clave no es el mismo objeto.
+    def _lookup(self, key, hash_value):
+        if self._probing == ROBIN_HOOD:
+            return self._robin_hood_lookup(key, hash_value)
+        if self._probing == CUCKOO:
+            return self._cuckoo_lookup(key, hash_value)
+        indices = self._indices
+        hashes = self._hashes
+        keys = self._keys
+        free = None
+        for index in self._probe(hash_value):
+            entry = indices[index]
+            if entry == EMPTY_INDEX:
+                return (index if free is None else free), -1
+            if entry == DELETED_INDEX:
+                if free is None:
+                    free = index
+            elif hashes[entry] == hash_value:
+                candidate = keys[entry]
+                if candidate is key or candidate == key:
+                    return index, entry
+        return free, -1
+
+    # Búsqueda Robin Hood: como las claves de una cadena están ordenadas
+    # por distancia a su ranura de origen, se puede parar en cuanto la
+    # clave residente esté más cerca de su origen que lo recorrido. Si no
+    # la encuentra devuelve la ranura donde se detuvo (None si se agotó el
+    # sondeo) y -1.
+    def _robin_hood_lookup(self, key, hash_value):
+        indices = self._indices
+        hashes = self._hashes
+        keys = self._keys
+        capacity = len(indices)
+        for distance, index in enumerate(self._probe(hash_value)):
+            entry = indices[index]
+            if entry == EMPTY_INDEX:
+                return index, -1
+            stored_hash = hashes[entry]
+            if (index - stored_hash) % capacity < distance:
+                return index, -1
+            if stored_hash == hash_value:
+                candidate = keys[entry]
+                if candidate is key or candidate == key:
+                    return index, entry
+        return None, -1
+
+    # Búsqueda cuckoo: la clave solo puede estar en sus ranuras candidatas
+    # o en el stash, así que una ranura vacía no corta la búsqueda. Si la
+    # encuentra en el stash devuelve (None, entrada); si no la encuentra,
+    # la primera ranura candidata vacía (None si no hay) y -1.
+    def _cuckoo_lookup(self, key, hash_value):
+        indices = self._indices
+        hashes = self._hashes
+        keys = self._keys
+        free = None
+        for index in self._probe(hash_value):
+            entry = indices[index]
+            if entry < 0:
+                if free is None:
+                    free = index
+            elif hashes[entry] == hash_value:
+                candidate = keys[entry]
+                if candidate is key or candidate == key:
+                    return index, entry
+        for entry in self._stash:
+            if hashes[entry] == hash_value:
+                candidate = keys[entry]
+                if candidate is key or candidate == key:
+                    return None, entry
+        return free, -1
+
+    # Elimina del array de índices y del almacenamiento denso la entrada
+    # hallada por _lookup. La ranura queda como DELETED_INDEX para
+    # preservar las cadenas de sondeo (con Robin Hood, en cambio, la cadena
+    # se desplaza hacia atrás, y con cuckoo la ranura queda vacía) y la
+    # entrada densa como hueco hasta la siguiente reconstrucción.
+    def _remove(self, index, entry):
+        if self._probing == ROBIN_HOOD:
+            self._backward_shift(index)
+        elif self._probing == CUCKOO:
+            if index is None:
+                self._stash.remove(entry)
+            else:
+                if self._snapshots is not None:
+                    self._before_write(self._indices, index)
+                self._indices[index] = EMPTY_INDEX
+        else:
+            if self._snapshots is not None:
+                self._before_write(self._indices, index)
+            self._indices[index] = DELETED_INDEX
+            self._deleted += 1
+        if self._snapshots is not None:
+            self._before_write(self._keys, entry)
+        self._keys[entry] = DELETED
+
+    # Antes de modificar en el sitio la posición position de column (el
+    # array de índices o una columna densa), guarda una copia de su bloque
+    # en las instantáneas que aún comparten esa columna. Solo se llama si
+    # hay instantáneas registradas.
+    def _before_write(self, column, position):
+        for reference in self._snapshots.get(id(column), ()):
+            view = reference()
+            if view is not None:
+                view._preserve(position)
+
+    # Coloca en el array de índices una entrada densa cuya clave se sabe
+    # ausente. index es la ranura libre hallada por _lookup, si sigue
+    # siendo válida (no hubo reconstrucción entre medias).
+    def _place(self, entry, hash_value, index=None):
+        if self._probing == ROBIN_HOOD:
+            self._robin_hood_place(entry, hash_value)
+            return
+        if self._probing == CUCKOO and index is None:
+            self._cuckoo_place(entry, hash_value)
+            return
+        if index is None:
+            index = self._find_free(hash_value)
+        if self._indices[index] == DELETED_INDEX:
+            self._deleted -= 1
+        if self._snapshots is not None:
+            self._before_write(self._indices, index)
+        self._indices[index] = entry
+
+    # Primera ranura libre (vacía o DELETED_INDEX) de la cadena de un hash,
+    # para insertar una clave que se sabe ausente.
+    def _find_free(self, hash_value):
+        indices = self._indices
+        for index in self._probe(hash_value):
+            if indices[index] < 0:
+                return index
+
+    # Inserción Robin Hood: al encontrar una entrada más cercana a su
+    # origen que la que se inserta, se le quita la ranura y se sigue
+    # sondeando para recolocarla a ella.
+    def _robin_hood_place(self, entry, hash_value):
+        indices = self._indices
+        hashes = self._hashes
+        capacity = len(indices)
+        snapshots = self._snapshots
+        distance = 0
+        for index in self._probe(hash_value):
+            resident = indices[index]
+            if resident == EMPTY_INDEX:
+                if snapshots is not None:
+                    self._before_write(indices, index)
+                indices[index] = entry
+                return
+            resident_distance = (index - hashes[resident]) % capacity
+            if resident_distance < distance:
+                if snapshots is not None:
+                    self._before_write(indices, index)
+                indices[index] = entry
+                entry, distance = resident, resident_distance
+            distance += 1
+
+    # Inserción cuckoo que reconstruye la tabla con otras semillas si el
+    # stash se llena.
+    def _cuckoo_place(self, entry, hash_value):
+        self._cuckoo_insert(entry, hash_value)
+        if len(self._stash) > self._stash_limit:
+            self._seeds = _next_cuckoo_seeds(self._seeds)
+            self._cuckoo_rebuild()
+
+    # Coloca una entrada en una ranura libre de sus cubos. Si están llenos
+    # desaloja a un residente (nunca el que acaba de colocar) y repite con
+    # él; tras CUCKOO_MAX_KICKS desalojos la entrada que queda sin sitio va
+    # al stash.
+    def _cuckoo_insert(self, entry, hash_value):
+        indices = self._indices
+        hashes = self._hashes
+        capacity = len(indices)
+        seeds = self._seeds
+        snapshots = self._snapshots
+        previous = None
+        for kick in range(CUCKOO_MAX_KICKS):
+            slots = _cuckoo_slots(hash_value, capacity, seeds)
+            for index in slots:
+                if indices[index] < 0:
+                    if snapshots is not None:
+                        self._before_write(indices, index)
+                    indices[index] = entry
+                    return
+            index = slots[_mix64(kick, hash_value) % len(slots)]
+            if index == previous:
+                index = slots[(slots.index(index) + 1) % len(slots)]
+            if snapshots is not None:
+                self._before_write(indices, index)
+            entry, indices[index] = indices[index], entry
+            hash_value = hashes[entry]
+            previous = index
+        self._stash.append(entry)
+
+    # Rehace el array de índices cuckoo con las entradas densas vivas. Si
+    # el stash queda con más de CUCKOO_STASH_SIZE entradas prueba otras
+    # semillas; si ninguna lo consigue (hashes idénticos) se queda con la
+    # última y no vuelve a intentarlo hasta que el stash duplique su tamaño.
+    def _cuckoo_rebuild(self):
+        capacity = len(self._indices)
+        keys = self._keys
+        for attempt in range(CUCKOO_MAX_RESEEDS):
+            if attempt:
+                self._seeds = _next_cuckoo_seeds(self._seeds)
+            self._indices = _empty_indices(capacity)
+            self._stash = []
+            for entry, hash_value in enumerate(self._hashes):
+                if keys[entry] is not DELETED:
+                    self._cuckoo_insert(entry, hash_value)
+            if len(self._stash) <= CUCKOO_STASH_SIZE:
+                self._stash_limit = CUCKOO_STASH_SIZE
+                return
+        self._stash_limit = 2 * len(self._stash)
+
+    # Borrado Robin Hood: desplaza una posición hacia atrás las entradas
+    # que siguen a la ranura borrada, hasta una vacía o una que ya está en
+    # su origen, sin dejar marcadores.
+    def _backward_shift(self, index):
+        indices = self._indices
+        hashes = self._hashes
+        capacity = len(indices)
+        snapshots = self._snapshots
+        for _ in range(capacity - 1):
+            next_index = index + 1
+            if next_index == capacity:
+                next_index = 0
+            entry = indices[next_index]
+            if entry == EMPTY_INDEX:
+                break
+            if (next_index - hashes[entry]) % capacity == 0:
+                break
+            if snapshots is not None:
+                self._before_write(indices, index)
+            indices[index] = entry
+            index = next_index
+        if snapshots is not None:
+            self._before_write(indices, index)
+        indices[index] = EMPTY_INDEX
+
+    # Reconstruir la tabla con la capacidad indicada (por defecto el doble).
+    # Las entradas densas se compactan eliminando los huecos y el array de
+    # índices se rehace con los hashes almacenados, sin volver a llamar a
+    # hash() ni comparar claves.
+    def _resize_and_rehash(self, capacity=None):
+        self._finish_rehash()
+        if self._len < len(self._keys):
+            self._compact(self._live_mask())
+        self._indices = _empty_indices(capacity or self.capacity * 2)
+        self._deleted = 0
+        self._version += 1
+        if self._probing == CUCKOO:
+            self._cuckoo_rebuild()
+            return
+        for entry, hash_value in enumerate(self._hashes):
+            self._place(entry, hash_value)
+
+    # Elimina de las columnas densas los huecos según la máscara live.
+    def _compact(self, live):
+        self._hashes = array("q", compress(self._hashes, live))
+        self._keys = list(compress(self._keys, live))
+
+    # Empieza un redimensionado incremental: el almacenamiento actual pasa
+    # a una tabla antigua y esta empieza vacía con la capacidad dada. Las
+    # primeras entradas densas se reservan para las migradas, de modo que
+    # conservan el orden de inserción por delante de las nuevas. Si ya
+    # había uno en curso (un borrado que encoge la tabla mientras aún
+    # crece, por ejemplo) se termina antes, porque solo puede haber una
+    # tabla antigua.
+    def _start_rehash(self, capacity):
+        self._finish_rehash()
+        old = object.__new__(_base_type(self))
+        for name in _slot_names(type(self)):
+            setattr(old, name, getattr(self, name))
+        size = self._len
+        self._old = old
+        self._rehash_position = 0
+        self._migrated = 0
+        self._indices = _empty_indices(capacity)
+        self._hashes = array("q", bytes(8 * size))
+        self._keys = [DELETED] * size
+        self._stash = []
+        self._deleted = 0
+        self._version += 1
+
+    # Migra hasta count entradas densas de la tabla antigua a esta. Cada
+    # entrada migrada queda como hueco en la tabla antigua, cuyo array de
+    # índices no se toca: sus búsquedas la saltan porque la clave ya no
+    # coincide. Al migrar la última se descarta la tabla antigua.
+    def _rehash_step(self, count=INCREMENTAL_REHASH_STEP):
+        old = self._old
+        old_keys = old._keys
+        start = self._rehash_position
+        stop = min(start + count, len(old_keys))
+        for position in range(start, stop):
+            key = old_keys[position]
+            if key is DELETED:
+                continue
+            entry = self._migrated
+            self._migrated += 1
+            hash_value = old._hashes[position]
+            self._hashes[entry] = hash_value
+            self._keys[entry] = key
+            self._migrate_entry(old, position, entry)
+            self._place(entry, hash_value)
+            if self._snapshots is not None:
+                self._before_write(old_keys, position)
+            old_keys[position] = DELETED
+        self._rehash_position = stop
+        if stop == len(old_keys):
+            self._old = None
+
+    # Copia las columnas de la subclase de la entrada position de la tabla
+    # antigua a la entrada entry de esta y las libera en la antigua.
+    def _migrate_entry(self, old, position, entry):
+        pass
+
+    # Termina de golpe el redimensionado incremental en curso, si lo hay.
+    # Lo usan las operaciones que recorren toda la tabla, que ya son O(n).
+    def _finish_rehash(self):
+        if self._old is not None:
+            self._rehash_step(len(self._old._keys))
+
+
+class HashTable(_OpenAddressingTable):
+    # Tabla hash sobre el motor de _OpenAddressingTable: añade a las
+    # entradas densas una lista paralela de valores y, opcionalmente, una
+    # huella de contenido (ver enable_fingerprint).
+    __slots__ = ("_values", "_fingerprint")
+
+    # Construye una HashTable a partir de un diccionario plano. capacity
+    # es opcional y sobreescribe el tamaño por defecto (el mínimo que cabe
+    # sin redimensionar). Como las claves de un dict son únicas, las
+    # entradas se copian en bloque y el array de índices se construye en
+    # una sola pasada, sin buscar cada clave. El resto de argumentos se
+    # pasan al constructor.
+    @classmethod
+    def from_dict(cls, dictionary, capacity=None, **options):
+        hash_table = cls._presized(len(dictionary), capacity, options)
+        hash_table._hashes = array("q", map(hash, dictionary))
+        hash_table._keys = list(dictionary)
+        hash_table._values = list(dictionary.values())
+        hash_table._len = len(dictionary)
+        hash_table._resize_and_rehash(hash_table.capacity)
+        return hash_table
+
+    # Construye una HashTable a partir de un iterable de pares (clave,
+    # valor); si una clave se repite gana el último valor. size_hint
+    # (por defecto, la longitud estimada del iterable) dimensiona la tabla
+    # de antemano para no redimensionar durante la carga.
+    @classmethod
+    def from_items(cls, iterable, size_hint=None, **options):
+        if size_hint is None:
+            size_hint = length_hint(iterable)
+        hash_table = cls._presized(size_hint, None, options)
+        for key, value in iterable:
+            hash_table[key] = value
+        return hash_table
+
+    # Ver _OpenAddressingTable.__init__ para los argumentos.
+    def __init__(self, *args, **options):
+        super().__init__(*args, **options)
+        self._values = []
+        # Suma módulo 2**64 de _entry_fingerprint de cada par, o None si
+        # la huella está desactivada.
+        self._fingerprint = None
+
+    # Elimina una clave de la tabla (o de la tabla antigua, si aún no se
+    # ha migrado).
+    def __delitem__(self, key):
+        self._delete(key, hash(key))
+
+    # Inserta o actualiza un par clave/valor. Una clave nueva reutiliza la
+    # primera ranura DELETED_INDEX de su cadena de sondeo; si añadir otra
+    # entrada superaría el factor de carga máximo (o no queda ranura), se
+    # compacta o se redimensiona la tabla antes de insertar (ver _append).
+    def __setitem__(self, key, value):
+        self._set(key, hash(key), value)
+
+    # Implementación de __setitem__ con el hash ya calculado, para poder
+    # reutilizar hashes almacenados.
+    def _set(self, key, hash_value, value):
+        table, index, entry = self._locate(key, hash_value)
+        if entry < 0:
+            self._insert(key, hash_value, index, value)
+            return
+        # Actualización de la clave (en la tabla antigua si aún no se ha
+        # migrado).
+        if self._fingerprint is not None:
+            self._update_fingerprint(
+                hash_value, table._values[entry], value
+            )
+        if self._snapshots is not None:
+            self._before_write(table._values, entry)
+        table._values[entry] = value
+
+    # Añade un par cuya clave se sabe ausente. index es la ranura libre
+    # hallada por _locate (ver _append).
+    def _insert(self, key, hash_value, index, value):
+        self._append(key, hash_value, index)
+        self._values.append(value)
+        if self._fingerprint is not None:
+            self._update_fingerprint(hash_value, MISSING, value)
 
     # Recupera un valor por clave usando sondeo; lanza KeyError si falta.
     def __getitem__(self, key):
-        for _, pair in self._probe(key):
-            if pair is None:
-                # Ranura vacía -> clave no presente.
-                raise KeyError(key)
-            if pair is DELETED:
-                # Omitir marcadores eliminados y continuar buscando.
-                continue
-            if pair.key == key:
-                return pair.value
-        raise KeyError(key)
+        value = self._get(key, hash(key), MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    # Valor de una clave con el hash ya calculado, o default si falta.
+    # Durante un redimensionado incremental busca también en la tabla
+    # antigua.
+    def _get(self, key, hash_value, default):
+        if self._old is not None:
+            self._rehash_step()
+        _, entry = self._lookup(key, hash_value)
+        if entry >= 0:
+            return self._values[entry]
+        if self._old is not None:
+            _, entry = self._old._lookup(key, hash_value)
+            if entry >= 0:
+                return self._old._values[entry]
+        return default
 
-    # Operador de membresía (in). Mapea KeyError a False.
+    # Operador de membresía (in), sin pasar por KeyError.
     def __contains__(self, key):
-        try:
-            self[key]
-        except KeyError:
-            return False
-        else:
-            return True
+        return self._get(key, hash(key), MISSING) is not MISSING
 
-    # Igualdad basada en el conjunto de pares (la capacidad y el orden no
-    # afectan la igualdad, según las pruebas).
+    # Igualdad por contenido (la capacidad y el orden no afectan la
+    # igualdad, según las pruebas), sin construir conjuntos ni exigir
+    # valores hashables: compara las longitudes y, si ambas tablas tienen
+    # huella, las huellas. Si las dos tienen las mismas entradas densas en
+    # el mismo orden (una copia, por ejemplo) basta comparar las listas;
+    # si no, busca en other cada par de esta tabla con su hash almacenado
+    # y termina en la primera diferencia.
     def __eq__(self, other):
         if self is other:
             return True
-        if type(self) is not type(other):
+        if _base_type(self) is not _base_type(other):
+            return False
+        if len(self) != len(other):
+            return False
+        if (
+            self._fingerprint is not None
+            and other._fingerprint is not None
+            and self._fingerprint != other._fingerprint
+        ):
             return False
-        return set(self.pairs) == set(other.pairs)
+        self._finish_rehash()
+        other._finish_rehash()
+        if self._hashes == other._hashes and self._keys == other._keys:
+            return self._values == other._values
+        lookup = other._lookup
+        other_values = other._values
+        entries = zip(self._hashes, self._keys, self._values)
+        for hash_value, key, value in entries:
+            if key is DELETED:
+                continue
+            entry = lookup(key, hash_value)[1]
+            if entry < 0:
+                return False
+            other_value = other_values[entry]
+            if other_value is not value and not other_value == value:
+                return False
+        return True
 
-    # Representación en string similar a un literal dict (el orden no está garantizado).
+    # Representación en string similar a un literal dict, en orden de
+    # inserción.
     def __str__(self):
+        self._finish_rehash()
         pairs = []
-        for key, value in self.pairs:
-            pairs.append(f"{key!r}: {value!r}")
+        for key, value in zip(self._keys, self._values):
+            if key is not DELETED:
+                pairs.append(f"{key!r}: {value!r}")
         return "{" + ", ".join(pairs) + "}"
 
     # Repr canónico que utiliza el factory `from_dict` para las pruebas.
@@ -115,54 +1243,591 @@ class HashTable:
         cls = self.__class__.__name__
         return f"{cls}.from_dict({str(self)})"
 
-    # Devuelve una copia superficial preservando la capacidad.
+    # Devuelve una copia superficial preservando capacidad y configuración.
+    # Clona directamente el almacenamiento, sin volver a insertar pares.
     def copy(self):
-        return HashTable.from_dict(dict(self.pairs), self.capacity)
+        copy = super().copy()
+        copy._values = self._values[:]
+        return copy
+
+    # copy.deepcopy() copia también los valores. La huella se recalcula,
+    # porque el hash de los valores copiados puede ser otro.
+    def __deepcopy__(self, memo):
+        clone = super().__deepcopy__(memo)
+        if clone._fingerprint is not None:
+            clone._fingerprint = None
+            clone.enable_fingerprint()
+        return clone
+
+    def _deepcopy_columns(self, memo):
+        super()._deepcopy_columns(memo)
+        self._values = deepcopy(self._values, memo)
+
+    # pickle usa el formato binario de dump().
+    def __reduce__(self):
+        file = io.BytesIO()
+        self.dump(file)
+        return _load_snapshot, (file.getvalue(),)
+
+    # Escribe una instantánea binaria de la tabla en un fichero abierto en
+    # modo binario: configuración, array de índices y hashes tal cual, y
+    # claves y valores vivos en bloque (ver _dump_column). Las tablas
+    # cuckoo añaden tras los huecos sus semillas y su stash.
+    def dump(self, file):
+        self._finish_rehash()
+        keys = self._keys
+        if self._len < len(keys):
+            live = self._live_mask()
+            holes = array("q", (i for i, alive in enumerate(live) if not alive))
+            keys = list(compress(keys, live))
+            values = list(compress(self._values, live))
+        else:
+            holes = array("q")
+            values = self._values
+        file.write(
+            _SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC,
+                SNAPSHOT_VERSION,
+                PROBING_STRATEGIES.index(self._probing),
+                self._incremental,
+                self._fingerprint is not None,
+                self._max_load_factor,
+                self._min_load_factor,
+                hash(_SNAPSHOT_HASH_PROBE),
+                self._min_capacity,
+                self.capacity,
+                len(self._keys),
+                self._len,
+                self._deleted,
+                len(holes),
+            )
+        )
+        self._indices.tofile(file)
+        self._hashes.tofile(file)
+        holes.tofile(file)
+        if self._probing == CUCKOO:
+            stash = self._stash
+            state = [*self._seeds, self._stash_limit, len(stash), *stash]
+            array("q", state).tofile(file)
+        _dump_column(file, keys)
+        _dump_column(file, values)
+
+    # Lee una instantánea escrita por dump(). Si los hashes siguen siendo
+    # válidos en este proceso (la misma semilla de str y, para las claves
+    # que no son str, bytes ni int, el mismo hash recalculado), el array de
+    # índices se carga tal cual, sin volver a insertar ninguna clave; si
+    # no, se recalculan y la tabla se reconstruye una vez.
+    @classmethod
+    def load(cls, file):
+        header = file.read(_SNAPSHOT_HEADER.size)
+        try:
+            (
+                magic,
+                version,
+                probing,
+                incremental,
+                fingerprint,
+                max_load_factor,
+                min_load_factor,
+                hash_probe,
+                min_capacity,
+                capacity,
+                dense,
+                size,
+                deleted,
+                hole_count,
+            ) = _SNAPSHOT_HEADER.unpack(header)
+        except struct.error:
+            magic = None
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a HashTable snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        hash_table = cls(
+            min_capacity,
+            max_load_factor=max_load_factor,
+            min_load_factor=min_load_factor,
+            probing=PROBING_STRATEGIES[probing],
+            incremental_resize=incremental,
+        )
+        indices = array(_index_typecode(capacity))
+        indices.fromfile(file, capacity)
+        hashes = array("q")
+        hashes.fromfile(file, dense)
+        holes = array("q")
+        holes.fromfile(file, hole_count)
+        if hash_table._probing == CUCKOO:
+            state = array("q")
+            state.fromfile(file, CUCKOO_HASHES + 2)
+            stash = array("q")
+            stash.fromfile(file, state[-1])
+            hash_table._seeds = tuple(state[:CUCKOO_HASHES])
+        keys = _load_column(file, size)
+        values = _load_column(file, size)
+        if holes:
+            live = bytearray(b"\x01") * dense
+            for position in holes:
+                live[position] = 0
+            all_keys = [DELETED] * dense
+            all_values = [None] * dense
+            positions = compress(range(dense), live)
+            for position, key, value in zip(positions, keys, values):
+                all_keys[position] = key
+                all_values[position] = value
+            keys = all_keys
+            values = all_values
+        hash_table._hashes = hashes
+        hash_table._keys = keys
+        hash_table._values = values
+        hash_table._len = size
+        if hash_probe == hash(_SNAPSHOT_HASH_PROBE) and _stored_hashes_match(
+            hashes, keys
+        ):
+            hash_table._indices = indices
+            hash_table._deleted = deleted
+            if hash_table._probing == CUCKOO:
+                hash_table._stash = stash.tolist()
+                hash_table._stash_limit = state[CUCKOO_HASHES]
+        else:
+            hash_table._hashes = array(
+                "q", (0 if key is DELETED else hash(key) for key in keys)
+            )
+            hash_table._resize_and_rehash(capacity)
+        if fingerprint:
+            hash_table.enable_fingerprint()
+        return hash_table
+
+    # Inserta o actualiza los pares de otra HashTable, de un mapping con
+    # items() o de un iterable de pares (clave, valor), como dict.update.
+    # La tabla se redimensiona como mucho una vez, antes de insertar, y los
+    # hashes almacenados en otra HashTable se reutilizan.
+    def update(self, other):
+        if isinstance(other, HashTable):
+            other._finish_rehash()
+            self._reserve(len(other))
+            entries = zip(other._hashes, other._keys, other._values)
+            for hash_value, key, value in entries:
+                if key is not DELETED:
+                    self._set(key, hash_value, value)
+            return
+        if hasattr(other, "items"):
+            other = other.items()
+        self._reserve(length_hint(other))
+        for key, value in other:
+            self[key] = value
 
     # get segura que devuelve default si la clave no existe.
     def get(self, key, default=None):
-        try:
-            return self[key]
-        except KeyError:
-            return default
+        return self._get(key, hash(key), default)
+
+    # Operaciones de lectura y escritura que buscan la clave una sola vez
+    # (ver _locate) y modifican su entrada en el sitio, en lugar de un get
+    # seguido de una asignación o un borrado, que sondean dos veces.
+
+    # Devuelve el valor de la clave; si falta, inserta default y lo
+    # devuelve, como dict.setdefault.
+    def setdefault(self, key, default=None):
+        return self._setdefault(key, hash(key), default)
 
-    # Conjunto de pares (clave, valor) presentes actualmente, omitiendo
-    # ranuras vacías y marcadores DELETED.
+    # Elimina la clave y devuelve su valor; si falta devuelve default o,
+    # sin default, lanza KeyError, como dict.pop.
+    def pop(self, key, default=MISSING):
+        return self._pop(key, hash(key), default)
+
+    # Elimina y devuelve como Pair el último par insertado, como
+    # dict.popitem; lanza KeyError si la tabla está vacía. Termina antes el
+    # redimensionado incremental en curso, si lo hay.
+    def popitem(self):
+        if not self._len:
+            raise KeyError("popitem(): hash table is empty")
+        self._finish_rehash()
+        # Los huecos del final (de popitem anteriores, por ejemplo) se
+        # recortan para que vaciar la tabla así sea O(n) en total.
+        hashes, keys, values = self._hashes, self._keys, self._values
+        while keys[-1] is DELETED:
+            if self._snapshots is not None:
+                for column in (hashes, keys, values):
+                    self._before_write(column, len(column) - 1)
+            hashes.pop()
+            keys.pop()
+            values.pop()
+        key, value = keys[-1], values[-1]
+        index, entry = self._lookup(key, hashes[-1])
+        self._remove_located(self, index, entry)
+        return Pair(key, value)
+
+    # Guarda y devuelve function(valor actual), usando default como valor
+    # actual si la clave falta.
+    def update_with(self, key, function, default=None):
+        return self._update_with(key, hash(key), function, default)
+
+    # Suma delta al valor de la clave (0 si falta) y devuelve el
+    # resultado. Pensado para contadores y acumuladores:
+    # table.increment(key) equivale a table[key] = table.get(key, 0) + 1.
+    def increment(self, key, delta=1):
+        hash_value = hash(key)
+        table, index, entry = self._locate(key, hash_value)
+        if entry < 0:
+            self._insert(key, hash_value, index, delta)
+            return delta
+        values = table._values
+        value = values[entry] + delta
+        if self._fingerprint is not None:
+            self._update_fingerprint(hash_value, values[entry], value)
+        if self._snapshots is not None:
+            self._before_write(values, entry)
+        values[entry] = value
+        return value
+
+    # Devuelve en O(1) una instantánea de solo lectura (HashTableSnapshot)
+    # con el contenido actual de la tabla. En lugar de copiar el
+    # almacenamiento, como copy(), la instantánea lo comparte: antes de
+    # modificar en el sitio un bloque de SNAPSHOT_BLOCK_SIZE posiciones de
+    # una columna compartida, la tabla le copia ese bloque, así que las
+    # escrituras posteriores nunca se ven en la instantánea y cada una
+    # copia como mucho un bloque por columna. Un redimensionado o una
+    # compactación crean columnas nuevas y ya no copian nada. Termina
+    # antes el redimensionado incremental en curso, si lo hay.
+    def snapshot(self):
+        self._finish_rehash()
+        snapshot = object.__new__(HashTableSnapshot)
+        for name in _slot_names(HashTable):
+            setattr(snapshot, name, getattr(self, name))
+        snapshot._stash = self._stash[:]
+        snapshot._stats = None
+        snapshot._snapshots = None
+        # Registro por columna (id de la columna, que la vista mantiene
+        # viva) de referencias débiles a las vistas que la comparten; las
+        # de instantáneas ya descartadas se limpian aquí.
+        registry = {}
+        for key, references in (self._snapshots or {}).items():
+            references = [
+                reference for reference in references
+                if reference() is not None
+            ]
+            if references:
+                registry[key] = references
+        for name in ("_indices", "_hashes", "_keys", "_values"):
+            column = getattr(self, name)
+            view = _SnapshotColumn(column)
+            setattr(snapshot, name, view)
+            registry.setdefault(id(column), []).append(weakref.ref(view))
+        self._snapshots = registry
+        return snapshot
+
+    # Activa la huella de contenido: un entero de 64 bits que no depende
+    # del orden ni de la capacidad y que se mantiene en O(1) en cada
+    # inserción, actualización y borrado (a cambio de llamar a hash() sobre
+    # cada valor guardado). Dos tablas con huella distinta no son iguales,
+    # así que == las descarta sin recorrerlas. Calcularla al activarla es
+    # O(n). Los valores mutables que cambian sin pasar por la tabla no
+    # actualizan la huella: con ellos solo es fiable si no son hashables.
+    def enable_fingerprint(self):
+        if self._fingerprint is not None:
+            return
+        self._finish_rehash()
+        fingerprint = 0
+        entries = zip(self._hashes, self._keys, self._values)
+        for hash_value, key, value in entries:
+            if key is not DELETED:
+                fingerprint += _entry_fingerprint(hash_value, value)
+        self._fingerprint = fingerprint & _HASH_MASK
+
+    def disable_fingerprint(self):
+        self._fingerprint = None
+
+    # Huella de contenido actual, o None si está desactivada.
+    @property
+    def fingerprint(self):
+        return self._fingerprint
+
+    # Vistas vivas de claves, valores y pares, como dict.keys(),
+    # dict.values() y dict.items(): iteran sin copiar, admiten len() e in,
+    # y la de claves (y la de pares, si los valores son hashables) las
+    # operaciones de conjuntos.
+    def keys_view(self):
+        return KeysView(self)
+
+    def values_view(self):
+        return HashTableValuesView(self)
+
+    def items_view(self):
+        return HashTableItemsView(self)
+
+    # Conjunto de pares (clave, valor) presentes actualmente, recorriendo
+    # las entradas densas y omitiendo las eliminadas.
     @property
     def pairs(self):
-        return {pair for pair in self._slots if pair not in (None, DELETED)}
+        self._finish_rehash()
+        return {
+            Pair(key, value)
+            for key, value in zip(self._keys, self._values)
+            if key is not DELETED
+        }
 
-    # Lista de valores presentes en la tabla. Devuelve una nueva lista.
+    # Lista de valores presentes en la tabla, en orden de inserción.
+    # Devuelve una nueva lista.
     @property
     def values(self):
-        return [pair.value for pair in self.pairs]
+        self._finish_rehash()
+        return list(compress(self._values, self._live_mask()))
 
     # Conjunto de claves presentes en la tabla. Devuelve un nuevo set.
     @property
     def keys(self):
-        return {pair.key for pair in self.pairs}
+        return set(self)
 
-    # Capacidad actual (número de ranuras).
+    # Vista de depuración de las ranuras con la forma de la implementación
+    # original: None (vacía), DELETED o Pair(clave, valor). Construye una
+    # lista nueva en cada acceso.
     @property
-    def capacity(self):
-        return len(self._slots)
-
-    # Índice primario: hash módulo capacidad.
-    def _index(self, key):
-        return hash(key) % self.capacity
-
-    # Generador de sondeo lineal: produce (índice, valor_slot) empezando
-    # en el índice hasheado y envolviendo al final de la tabla.
-    def _probe(self, key):
-        index = self._index(key)
-        for _ in range(self.capacity):
-            yield index, self._slots[index]
-            index = (index + 1) % self.capacity
-
-    # Duplicar la capacidad y reinsertar todos los pares presentes. Los
-    # marcadores DELETED no se copian al nuevo arreglo.
-    def _resize_and_rehash(self):
-        copy = HashTable(capacity=self.capacity * 2)
-        for key, value in self.pairs:
-            copy[key] = value
-        self._slots = copy._slots
\ No newline at end of file
+    def _slots(self):
+        self._finish_rehash()
+        return [
+            None if entry == EMPTY_INDEX
+            else DELETED if entry == DELETED_INDEX
+            else Pair(self._keys[entry], self._values[entry])
+            for entry in self._indices
+        ]
+
+    # Recorre las entradas densas vivas como tuplas (clave, valor). Lanza
+    # RuntimeError si la tabla cambia de tamaño durante la iteración.
+    def _iter_entries(self):
+        self._finish_rehash()
+        version = self._version
+        for key, value in zip(self._keys, self._values):
+            if key is not DELETED:
+                yield key, value
+                if self._version != version:
+                    raise RuntimeError(
+                        "HashTable changed size during iteration"
+                    )
+
+    # Implementaciones de setdefault, pop y update_with con el hash ya
+    # calculado.
+    def _setdefault(self, key, hash_value, default):
+        table, index, entry = self._locate(key, hash_value)
+        if entry >= 0:
+            return table._values[entry]
+        self._insert(key, hash_value, index, default)
+        return default
+
+    def _pop(self, key, hash_value, default):
+        table, index, entry = self._locate(key, hash_value)
+        if entry < 0:
+            if default is MISSING:
+                raise KeyError(key)
+            return default
+        value = table._values[entry]
+        self._remove_located(table, index, entry)
+        return value
+
+    # Si function cambia la estructura de la tabla (o migra entradas de un
+    # redimensionado incremental al leerla), la ranura hallada deja de
+    # valer y el resultado se guarda con una búsqueda nueva.
+    def _update_with(self, key, hash_value, function, default):
+        table, index, entry = self._locate(key, hash_value)
+        version = (self._version, self._migrated)
+        if entry < 0:
+            value = function(default)
+            if (self._version, self._migrated) != version:
+                self._set(key, hash_value, value)
+            else:
+                self._insert(key, hash_value, index, value)
+            return value
+        values = table._values
+        value = function(values[entry])
+        if (self._version, self._migrated) != version:
+            self._set(key, hash_value, value)
+            return value
+        if self._fingerprint is not None:
+            self._update_fingerprint(hash_value, values[entry], value)
+        if self._snapshots is not None:
+            self._before_write(values, entry)
+        values[entry] = value
+        return value
+
+    # Con huella, el borrado descuenta el valor de la entrada.
+    def _remove_located(self, table, index, entry):
+        if self._fingerprint is not None:
+            self._update_fingerprint(
+                table._hashes[entry], table._values[entry], MISSING
+            )
+        super()._remove_located(table, index, entry)
+
+    # Cambia en la huella el valor de una clave de old_value a new_value
+    # (MISSING si la clave no estaba o deja de estar).
+    def _update_fingerprint(self, hash_value, old_value, new_value):
+        fingerprint = self._fingerprint
+        if old_value is not MISSING:
+            fingerprint -= _entry_fingerprint(hash_value, old_value)
+        if new_value is not MISSING:
+            fingerprint += _entry_fingerprint(hash_value, new_value)
+        self._fingerprint = fingerprint & _HASH_MASK
+
+    # Además de la entrada, libera su valor.
+    def _remove(self, index, entry):
+        super()._remove(index, entry)
+        if self._snapshots is not None:
+            self._before_write(self._values, entry)
+        self._values[entry] = None
+
+    def _compact(self, live):
+        super()._compact(live)
+        self._values = list(compress(self._values, live))
+
+    def _start_rehash(self, capacity):
+        super()._start_rehash(capacity)
+        self._values = [None] * len(self._keys)
+
+    def _migrate_entry(self, old, position, entry):
+        self._values[entry] = old._values[position]
+        if self._snapshots is not None:
+            self._before_write(old._values, position)
+        old._values[position] = None
+
+
+# Instantánea de solo lectura de una HashTable (ver HashTable.snapshot).
+class HashTableSnapshot(HashTable):
+    # Instantánea de solo lectura creada por HashTable.snapshot(): admite
+    # todas las lecturas de HashTable (búsquedas, iteración, vistas,
+    # igualdad, stats()) sobre las columnas compartidas y lanza TypeError
+    # en las escrituras. Se compara como una HashTable más, y copy(),
+    # dump() y pickle la convierten en una HashTable normal.
+    __slots__ = ()
+
+    _uninstrumented = HashTable
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("HashTable snapshots are read-only")
+
+    __setitem__ = __delitem__ = update = _read_only
+    setdefault = pop = popitem = update_with = increment = _read_only
+    enable_fingerprint = disable_fingerprint = _read_only
+    enable_stats = disable_stats = _read_only
+
+    # Repr que reconstruye una instantánea equivalente.
+    def __repr__(self):
+        return f"HashTable.from_dict({self}).snapshot()"
+
+    # Ya es inmutable.
+    def snapshot(self):
+        return self
+
+    # Copia como HashTable independiente, con las columnas materializadas.
+    def copy(self):
+        copy = object.__new__(HashTable)
+        for name in _slot_names(HashTable):
+            setattr(copy, name, getattr(self, name))
+        for name in ("_indices", "_hashes", "_keys", "_values"):
+            setattr(copy, name, getattr(self, name).materialize())
+        copy._stash = self._stash[:]
+        return copy
+
+    def __deepcopy__(self, memo):
+        return self.copy().__deepcopy__(memo)
+
+    def __reduce__(self):
+        return self.copy().__reduce__()
+
+    def dump(self, file):
+        self.copy().dump(file)
+
+
+# Métricas acumuladas de una tabla con enable_stats().
+class _Stats:
+    __slots__ = (
+        "hits",
+        "misses",
+        "probes",
+        "resizes",
+        "resize_seconds",
+        "on_resize",
+    )
+
+    def __init__(self):
+        self.hits = Counter()
+        self.misses = Counter()
+        self.probes = 0
+        self.resizes = 0
+        self.resize_seconds = 0.0
+        self.on_resize = None
+
+
+# Sobrescrituras de la subclase instrumentada: cuentan las ranuras que
+# visita cada búsqueda (también las de inserción y borrado) y cronometran
+# los redimensionados.
+class _StatsMixin:
+    __slots__ = ()
+
+    def _probe(self, hash_value):
+        stats = self._stats
+        for index in super()._probe(hash_value):
+            stats.probes += 1
+            yield index
+
+    def _lookup(self, key, hash_value):
+        stats = self._stats
+        stats.probes = 0
+        index, entry = super()._lookup(key, hash_value)
+        histogram = stats.hits if entry >= 0 else stats.misses
+        histogram[stats.probes] += 1
+        return index, entry
+
+    def _resize_and_rehash(self, capacity=None):
+        old_capacity = self.capacity
+        start = time.perf_counter()
+        super()._resize_and_rehash(capacity)
+        self._record_resize(old_capacity, time.perf_counter() - start)
+
+    def _start_rehash(self, capacity):
+        old_capacity = self.capacity
+        start = time.perf_counter()
+        super()._start_rehash(capacity)
+        self._record_resize(old_capacity, time.perf_counter() - start)
+
+    def _record_resize(self, old_capacity, seconds):
+        stats = self._stats
+        stats.resizes += 1
+        stats.resize_seconds += seconds
+        if stats.on_resize is not None:
+            stats.on_resize(
+                ResizeEvent(old_capacity, self.capacity, self._len, seconds)
+            )
+
+    # Las copias no heredan la instrumentación.
+    def copy(self):
+        clone = super().copy()
+        clone.__class__ = _base_type(self)
+        clone._stats = None
+        return clone
+
+
+# Subclases instrumentadas ya creadas, por clase base.
+_instrumented_classes = {}
+
+
+# Subclase instrumentada de cls, con el mismo nombre y sin slots nuevos
+# para poder cambiar la clase de una instancia existente.
+def _instrumented(cls):
+    instrumented = _instrumented_classes.get(cls)
+    if instrumented is None:
+        instrumented = type(
+            cls.__name__,
+            (_StatsMixin, cls),
+            {"__slots__": (), "_uninstrumented": cls},
+        )
+        _instrumented_classes[cls] = instrumented
+    return instrumented
+
+
+# Clase de una tabla sin la instrumentación de enable_stats().
+def _base_type(obj):
+    return getattr(type(obj), "_uninstrumented", type(obj))
+
+
+# Nombres de todos los slots de una clase, incluidos los de sus bases.
+def _slot_names(cls):
+    return [
+        name for klass in cls.__mro__ for name in getattr(klass, "__slots__", ())
+    ]
@@ -0,0 +1,325 @@
+import operator
+
+import numpy as np
+
+from hashtable import DEFAULT_MAX_LOAD_FACTOR, Pair, _capacity_for
+
+# Estado de cada ranura del array _states.
+EMPTY = 0
+FULL = 1
+DELETED = 2
+
+# Cuando en una operación por lotes quedan como mucho estas claves
+# sondeando (cadenas de colisión largas), se terminan una a una en Python:
+# un paso vectorizado más cuesta más que recorrerlas.
+SCALAR_FALLBACK_SIZE = 32
+
+# Constantes del finalizador de splitmix64, que mezcla todos los bits de
+# la clave: los identificadores consecutivos o con patrones no se agrupan.
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+_MASK_64 = (1 << 64) - 1
+
+
+# Hash de un array de claves int64, como uint64.
+def _mix_array(keys):
+    x = keys.astype(np.uint64)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(_MIX_1)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(_MIX_2)
+    x ^= x >> np.uint64(31)
+    return x
+
+
+# El mismo hash para una clave suelta, con enteros de Python.
+def _mix(key):
+    x = key & _MASK_64
+    x ^= x >> 30
+    x = (x * _MIX_1) & _MASK_64
+    x ^= x >> 27
+    x = (x * _MIX_2) & _MASK_64
+    return x ^ (x >> 31)
+
+
+# Capacidad potencia de dos para guardar size claves sin superar el factor
+# de carga máximo.
+def _power_of_two_capacity(size):
+    needed = _capacity_for(size, DEFAULT_MAX_LOAD_FACTOR)
+    return 1 << max(3, (needed - 1).bit_length())
+
+
+class IntHashTable:
+    # Tabla hash especializada en claves enteras de 64 bits y valores de
+    # ancho fijo (value_dtype). Claves, valores y estado de cada ranura viven
+    # en arrays de NumPy, con sondeo lineal sobre el hash splitmix64 y
+    # capacidad potencia de dos.
+    #
+    # get_many, put_many y contains_many sondean todas las consultas a la
+    # vez: en cada paso comparan de golpe la ranura actual de todas las
+    # claves pendientes y solo avanzan las que chocan. Las pocas que quedan
+    # en cadenas de colisión largas se terminan una a una (ver
+    # SCALAR_FALLBACK_SIZE). El interfaz de mapping de HashTable funciona
+    # igual para claves sueltas.
+    __slots__ = ("_keys", "_values", "_states", "_len", "_filled", "_mask")
+
+    # Crea una tabla vacía con capacity ranuras (se redondea a potencia de
+    # dos) y valores del tipo value_dtype.
+    def __init__(self, capacity=8, value_dtype=np.int64):
+        if capacity < 1:
+            raise ValueError("Capacity must be a positive number")
+        capacity = 1 << (capacity - 1).bit_length()
+        self._keys = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros(capacity, dtype=value_dtype)
+        self._states = np.zeros(capacity, dtype=np.uint8)
+        # Pares vivos y ranuras ocupadas (vivas + DELETED).
+        self._len = 0
+        self._filled = 0
+        self._mask = capacity - 1
+
+    # Construye la tabla a partir de arrays (o secuencias) de claves y
+    # valores, dimensionada para no redimensionar durante la carga.
+    @classmethod
+    def from_arrays(cls, keys, values, value_dtype=None):
+        values = np.asarray(values)
+        if value_dtype is None:
+            value_dtype = values.dtype
+        hash_table = cls(_power_of_two_capacity(len(keys)), value_dtype)
+        hash_table.put_many(keys, values)
+        return hash_table
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        yield from self._keys[self._states == FULL].tolist()
+
+    def __getitem__(self, key):
+        slot = self._find_one(_check_key(key))
+        if slot < 0:
+            raise KeyError(key)
+        return self._values[slot].item()
+
+    def __setitem__(self, key, value):
+        key = _check_key(key)
+        slot = self._find_one(key)
+        if slot < 0:
+            self._reserve(1)
+            slot = self._free_slot(_mix(key) & self._mask)
+            self._claim(slot, key)
+        self._values[slot] = value
+
+    def __delitem__(self, key):
+        slot = self._find_one(_check_key(key))
+        if slot < 0:
+            raise KeyError(key)
+        self._states[slot] = DELETED
+        self._len -= 1
+
+    def __contains__(self, key):
+        try:
+            key = _check_key(key)
+        except TypeError:
+            return False
+        return self._find_one(key) >= 0
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return False
+        return self.pairs == other.pairs
+
+    def __repr__(self):
+        items = ", ".join(f"{key!r}: {value!r}" for key, value in self._items())
+        return f"{self.__class__.__name__}({{{items}}})"
+
+    # get segura que devuelve default si la clave no existe.
+    def get(self, key, default=None):
+        try:
+            slot = self._find_one(_check_key(key))
+        except TypeError:
+            return default
+        return default if slot < 0 else self._values[slot].item()
+
+    # Valores de un array de claves, con default para las que faltan.
+    # Devuelve un array de value_dtype.
+    def get_many(self, keys, default=0):
+        keys = _as_keys(keys)
+        slots = self._find_many(keys)
+        found = slots >= 0
+        result = np.full(len(keys), default, dtype=self._values.dtype)
+        result[found] = self._values[slots[found]]
+        return result
+
+    # Array de booleanos: si cada clave del array está en la tabla.
+    def contains_many(self, keys):
+        return self._find_many(_as_keys(keys)) >= 0
+
+    # Inserta o actualiza los pares de dos arrays paralelos (values también
+    # puede ser un escalar). Si una clave se repite gana el último valor.
+    # La tabla crece como mucho una vez, antes de insertar.
+    def put_many(self, keys, values):
+        keys = _as_keys(keys)
+        values = np.broadcast_to(
+            np.asarray(values, dtype=self._values.dtype), keys.shape
+        )
+        # Última aparición de cada clave.
+        unique, last = np.unique(keys[::-1], return_index=True)
+        values = values[::-1][last]
+        slots = self._find_many(unique)
+        found = slots >= 0
+        self._values[slots[found]] = values[found]
+        new = ~found
+        if new.any():
+            self._reserve(int(new.sum()))
+            self._insert_new(unique[new], values[new])
+
+    # Pares, claves y valores al estilo de HashTable.
+    @property
+    def pairs(self):
+        return {Pair(key, value) for key, value in self._items()}
+
+    @property
+    def keys(self):
+        return set(self)
+
+    @property
+    def values(self):
+        return self._values[self._states == FULL].tolist()
+
+    @property
+    def capacity(self):
+        return len(self._keys)
+
+    @property
+    def load_factor(self):
+        return self._filled / self.capacity
+
+    @property
+    def value_dtype(self):
+        return self._values.dtype
+
+    def _items(self):
+        live = self._states == FULL
+        return zip(self._keys[live].tolist(), self._values[live].tolist())
+
+    # Ranura de una clave o -1, sondeando en Python.
+    def _find_one(self, key):
+        keys = self._keys
+        states = self._states
+        mask = self._mask
+        slot = _mix(key) & mask
+        while True:
+            state = states[slot]
+            if state == EMPTY:
+                return -1
+            if state == FULL and keys[slot] == key:
+                return slot
+            slot = (slot + 1) & mask
+
+    # Ranuras de un array de claves (-1 para las ausentes). Cada paso
+    # compara a la vez la ranura actual de todas las claves pendientes.
+    def _find_many(self, keys):
+        mask = np.uint64(self._mask)
+        slots = (_mix_array(keys) & mask).astype(np.int64)
+        result = np.full(len(keys), -1, dtype=np.int64)
+        pending = np.arange(len(keys))
+        while len(pending) > SCALAR_FALLBACK_SIZE:
+            current = slots[pending]
+            states = self._states[current]
+            found = (states == FULL) & (self._keys[current] == keys[pending])
+            result[pending[found]] = current[found]
+            keep = ~found & (states != EMPTY)
+            pending = pending[keep]
+            slots[pending] = (current[keep] + 1) & self._mask
+        for position in pending.tolist():
+            result[position] = self._find_one(int(keys[position]))
+        return result
+
+    # Inserta claves que se sabe ausentes y distintas entre sí. En cada
+    # paso cada clave pendiente intenta ocupar su ranura actual si está
+    # libre; si varias quieren la misma, gana una y el resto sigue.
+    def _insert_new(self, keys, values):
+        mask = np.uint64(self._mask)
+        slots = (_mix_array(keys) & mask).astype(np.int64)
+        pending = np.arange(len(keys))
+        while len(pending) > SCALAR_FALLBACK_SIZE:
+            current = slots[pending]
+            free = self._states[current] != FULL
+            candidates = pending[free]
+            _, first = np.unique(current[free], return_index=True)
+            winners = candidates[first]
+            won = slots[winners]
+            self._filled += int((self._states[won] == EMPTY).sum())
+            self._states[won] = FULL
+            self._keys[won] = keys[winners]
+            self._values[won] = values[winners]
+            self._len += len(winners)
+            placed = np.zeros(len(keys), dtype=bool)
+            placed[winners] = True
+            pending = pending[~placed[pending]]
+            # Las que no ganaron siguen en su ranura (ahora ocupada) y
+            # avanzan en el siguiente paso.
+            slots[pending] = np.where(
+                self._states[slots[pending]] == FULL,
+                (slots[pending] + 1) & self._mask,
+                slots[pending],
+            )
+        for position in pending.tolist():
+            slot = self._free_slot(int(slots[position]))
+            self._claim(slot, int(keys[position]))
+            self._values[slot] = values[position]
+
+    # Primera ranura no ocupada desde slot.
+    def _free_slot(self, slot):
+        states = self._states
+        while states[slot] == FULL:
+            slot = (slot + 1) & self._mask
+        return slot
+
+    def _claim(self, slot, key):
+        if self._states[slot] == EMPTY:
+            self._filled += 1
+        self._states[slot] = FULL
+        self._keys[slot] = key
+        self._len += 1
+
+    # Garantiza sitio para size claves nuevas; si hace falta reconstruye la
+    # tabla (sin ranuras DELETED) con capacidad para todas.
+    def _reserve(self, size):
+        if self._filled + size <= self.capacity * DEFAULT_MAX_LOAD_FACTOR:
+            return
+        live = self._states == FULL
+        keys = self._keys[live]
+        values = self._values[live]
+        capacity = max(self.capacity, _power_of_two_capacity(self._len + size))
+        self._keys = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros(capacity, dtype=values.dtype)
+        self._states = np.zeros(capacity, dtype=np.uint8)
+        self._len = 0
+        self._filled = 0
+        self._mask = capacity - 1
+        self._insert_new(keys, values)
+
+
+# Valida una clave suelta: entero (no bool) que cabe en int64.
+def _check_key(key):
+    if isinstance(key, bool) or not isinstance(key, (int, np.integer)):
+        raise TypeError(f"Keys must be integers, not {type(key).__name__}")
+    key = operator.index(key)
+    if not -(1 << 63) <= key < 1 << 63:
+        raise OverflowError("Keys must fit in 64 bits")
+    return key
+
+
+# Convierte un array o secuencia de claves a int64 sin perder valores.
+def _as_keys(keys):
+    keys = np.asarray(keys)
+    if keys.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if keys.dtype.kind not in "iu":
+        raise TypeError("Keys must be integers")
+    if keys.dtype == np.uint64 and keys.size and keys.max() >= 1 << 63:
+        raise OverflowError("Keys must fit in 64 bits")
+    return keys.astype(np.int64, copy=False).ravel()
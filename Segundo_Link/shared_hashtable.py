@@ -0,0 +1,402 @@
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from codec import decode, encode, stable_hash
+from hashtable import (
+    DEFAULT_MAX_LOAD_FACTOR,
+    MISSING,
+    HashTable,
+    Pair,
+    _capacity_for,
+)
+
+# Formato del bloque de memoria compartida:
+#   cabecera | capacity buckets de tamaño fijo | arena de claves y valores
+# Cada bucket guarda el hash estable de la clave, la posición en la arena
+# de la clave codificada (seguida de su valor codificado) y sus tamaños.
+# La arena solo crece: una actualización escribe la clave y el nuevo valor
+# al final y apunta el bucket a ellos.
+MAGIC = b"SHT1"
+HEADER = struct.Struct("<4s6Q")
+BUCKET = struct.Struct("<QQII")
+
+# Campos de la cabecera tras MAGIC, en orden: secuencia del seqlock,
+# capacidad, pares vivos, buckets ocupados (vivos + borrados), tamaño de la
+# arena y bytes usados de la arena.
+_SEQUENCE, _CAPACITY, _LENGTH, _FILLED, _ARENA_SIZE, _ARENA_USED = range(6)
+_FIELD = struct.Struct("<Q")
+
+# Segundos que un lector espera a que el escritor termine una escritura
+# (secuencia impar). Si la misma secuencia sigue impar pasado ese tiempo,
+# el proceso escritor se da por muerto a mitad de la escritura y se lee
+# sin esperar: como los datos se escriben en la arena antes de apuntar el
+# bucket a ellos, se ve el estado anterior o el posterior a la escritura.
+# La comprobación de que la secuencia no cambió durante la lectura se
+# mantiene, así que un escritor vivo pero lento sigue invalidando las
+# lecturas a medias.
+WRITER_TIMEOUT = 1.0
+
+# Valores especiales del offset de un bucket: vacío y borrado.
+EMPTY_OFFSET = (1 << 64) - 1
+DELETED_OFFSET = (1 << 64) - 2
+
+# Nombres de bloques creados por este proceso, para no retirarlos del
+# resource tracker al adjuntarlos desde el mismo proceso.
+_created_names = set()
+
+
+# Pares (clave, valor) de un mapping, una HashTable o un iterable de pares.
+def _items(mapping):
+    if isinstance(mapping, HashTable):
+        return mapping.items_view()
+    if hasattr(mapping, "items"):
+        return mapping.items()
+    return mapping
+
+
+class SharedHashTable:
+    # Tabla hash de solo lectura para varios procesos, alojada en
+    # multiprocessing.shared_memory: cualquier proceso se adjunta por nombre
+    # y busca directamente en el bloque, sin copiar ni deserializar la tabla
+    # (solo se decodifica el valor encontrado). Usa sondeo lineal, como
+    # HashTable, sobre el hash estable de codec.
+    #
+    # Protocolo de escritura: solo el proceso que crea la tabla (el
+    # escritor) puede modificarla. Cada escritura pone impar la secuencia
+    # de la cabecera, escribe los datos nuevos en la arena antes de apuntar
+    # el bucket a ellos y vuelve a ponerla par. Los lectores repiten la
+    # búsqueda si la secuencia era impar o cambió mientras leían. La
+    # capacidad y la arena son fijas: si se llenan, la escritura lanza
+    # OverflowError y el escritor publica una tabla mayor con resized().
+    # Si el escritor muere a mitad de una escritura, los lectores dejan de
+    # esperarla tras WRITER_TIMEOUT segundos.
+    __slots__ = ("_shm", "_writable", "_capacity", "_arena", "_stale_sequence")
+
+    # Crea una tabla nueva (el proceso queda como escritor) con los pares
+    # de mapping. capacity y arena_size se calculan por defecto para los
+    # pares iniciales más un margen de spare (fracción) para escrituras.
+    @classmethod
+    def create(
+        cls, mapping=(), capacity=None, arena_size=None, name=None, spare=0.25
+    ):
+        encoded = [(encode(key), encode(value)) for key, value in _items(mapping)]
+        if capacity is None:
+            expected = int(len(encoded) * (1 + spare)) + 1
+            capacity = _capacity_for(expected, DEFAULT_MAX_LOAD_FACTOR)
+        if arena_size is None:
+            used = sum(len(key) + len(value) for key, value in encoded)
+            arena_size = int(used * (1 + spare)) + 1024
+        size = HEADER.size + capacity * BUCKET.size + arena_size
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created_names.add(shm.name)
+        HEADER.pack_into(shm.buf, 0, MAGIC, 0, capacity, 0, 0, arena_size, 0)
+        empty = BUCKET.pack(0, EMPTY_OFFSET, 0, 0)
+        shm.buf[HEADER.size:HEADER.size + capacity * BUCKET.size] = (
+            empty * capacity
+        )
+        hash_table = cls._wrap(shm, writable=True)
+        for key, value in encoded:
+            hash_table._set_encoded(key, value)
+        return hash_table
+
+    # Se adjunta en modo lectura a una tabla existente por su nombre.
+    @classmethod
+    def attach(cls, name):
+        shm = shared_memory.SharedMemory(name=name)
+        if bytes(shm.buf[:len(MAGIC)]) != MAGIC:
+            shm.close()
+            raise ValueError(f"{name!r} is not a shared hash table")
+        if os.name == "posix" and shm.name not in _created_names:
+            # El bloque es del escritor: que el resource tracker de este
+            # proceso no lo destruya al terminar.
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return cls._wrap(shm, writable=False)
+
+    @classmethod
+    def _wrap(cls, shm, writable):
+        hash_table = object.__new__(cls)
+        hash_table._shm = shm
+        hash_table._writable = writable
+        # La capacidad no cambia durante la vida del bloque.
+        hash_table._capacity = capacity = _FIELD.unpack_from(
+            shm.buf, len(MAGIC) + 8 * _CAPACITY
+        )[0]
+        hash_table._arena = HEADER.size + capacity * BUCKET.size
+        # Secuencia impar de un escritor dado por muerto (ver WRITER_TIMEOUT).
+        hash_table._stale_sequence = None
+        return hash_table
+
+    # Al serializar (por ejemplo, para enviarla a un proceso del pool) solo
+    # viaja el nombre: el receptor se adjunta al mismo bloque.
+    def __reduce__(self):
+        return SharedHashTable.attach, (self.name,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._field(_LENGTH)
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def __getitem__(self, key):
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, MISSING) is not MISSING
+
+    # Solo el escritor: inserta o actualiza un par.
+    def __setitem__(self, key, value):
+        self._check_writable()
+        self._set_encoded(encode(key), encode(value))
+
+    # Solo el escritor: borra un par dejando el bucket como borrado.
+    def __delitem__(self, key):
+        self._check_writable()
+        data = encode(key)
+        bucket, found = self._find(data, stable_hash(data))
+        if found is None:
+            raise KeyError(key)
+        self._begin_write()
+        try:
+            position = self._bucket_position(bucket)
+            BUCKET.pack_into(self._shm.buf, position, 0, DELETED_OFFSET, 0, 0)
+            self._set_field(_LENGTH, self._field(_LENGTH) - 1)
+        finally:
+            self._end_write()
+
+    # get segura que devuelve default si la clave no existe. Busca en el
+    # bloque compartido y decodifica solo el valor encontrado.
+    def get(self, key, default=None):
+        data = encode(key)
+        hash_value = stable_hash(data)
+        deadline = None
+        while True:
+            sequence = self._field(_SEQUENCE)
+            if sequence & 1 and sequence != self._stale_sequence:
+                # El escritor está a mitad de una escritura.
+                if deadline is None:
+                    deadline = time.monotonic() + WRITER_TIMEOUT
+                if time.monotonic() < deadline:
+                    time.sleep(0)
+                    continue
+                # No la ha terminado a tiempo: se da por muerto y ni esta
+                # ni las siguientes búsquedas esperan a esta secuencia.
+                self._stale_sequence = sequence
+            try:
+                _, found = self._find(data, hash_value)
+                if found is None:
+                    value = default
+                else:
+                    offset, key_size, value_size = found
+                    start = self._arena_start() + offset + key_size
+                    value = decode(self._shm.buf[start:start + value_size])
+            except Exception:
+                if self._field(_SEQUENCE) == sequence:
+                    raise
+                continue
+            if self._field(_SEQUENCE) == sequence:
+                return value
+
+    # Pares (clave, valor) en el orden de los buckets. Solo es coherente
+    # si no hay escrituras concurrentes.
+    def items(self):
+        buf = self._shm.buf
+        arena = self._arena_start()
+        for bucket in range(self.capacity):
+            _, offset, key_size, value_size = BUCKET.unpack_from(
+                buf, self._bucket_position(bucket)
+            )
+            if offset >= DELETED_OFFSET:
+                continue
+            start = arena + offset
+            key = decode(buf[start:start + key_size])
+            start += key_size
+            yield key, decode(buf[start:start + value_size])
+
+    # Copias al estilo de HashTable.
+    @property
+    def pairs(self):
+        return {Pair(key, value) for key, value in self.items()}
+
+    @property
+    def keys(self):
+        return set(self)
+
+    @property
+    def values(self):
+        return [value for _, value in self.items()]
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    # Fracción de la arena ya usada.
+    @property
+    def arena_usage(self):
+        return self._field(_ARENA_USED) / self._field(_ARENA_SIZE)
+
+    # HashTable local con los mismos pares.
+    def to_hashtable(self):
+        return HashTable.from_items(self.items(), size_hint=len(self))
+
+    # Solo el escritor: crea y devuelve una tabla nueva (otro bloque, otro
+    # nombre) con los pares actuales y más espacio, para publicarla a los
+    # lectores cuando esta se llena.
+    def resized(self, capacity=None, arena_size=None, spare=1.0):
+        self._check_writable()
+        return SharedHashTable.create(
+            self.items(), capacity=capacity, arena_size=arena_size, spare=spare
+        )
+
+    # Cierra la vista de este proceso sobre el bloque.
+    def close(self):
+        self._shm.close()
+
+    # Solo el escritor: destruye el bloque compartido.
+    def unlink(self):
+        self._check_writable()
+        _created_names.discard(self._shm.name)
+        if os.name == "posix":
+            # Un lector que comparta el resource tracker puede haber
+            # retirado el registro; unlink() espera encontrarlo.
+            resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+    def _check_writable(self):
+        if not self._writable:
+            raise TypeError("Attached shared hash tables are read-only")
+
+    def _field(self, field):
+        return _FIELD.unpack_from(self._shm.buf, len(MAGIC) + 8 * field)[0]
+
+    def _set_field(self, field, value):
+        _FIELD.pack_into(self._shm.buf, len(MAGIC) + 8 * field, value)
+
+    def _begin_write(self):
+        self._set_field(_SEQUENCE, self._field(_SEQUENCE) + 1)
+
+    def _end_write(self):
+        self._set_field(_SEQUENCE, self._field(_SEQUENCE) + 1)
+
+    def _bucket_position(self, bucket):
+        return HEADER.size + bucket * BUCKET.size
+
+    def _arena_start(self):
+        return self._arena
+
+    # Sondeo lineal desde hash módulo capacidad. Devuelve
+    # (bucket, (offset, tamaño_clave, tamaño_valor)) si encuentra la clave
+    # codificada; si no, (bucket libre o None, None), reutilizando el
+    # primer bucket borrado de la cadena.
+    def _find(self, data, hash_value):
+        buf = self._shm.buf
+        capacity = self._capacity
+        arena = self._arena
+        size = len(data)
+        free = None
+        bucket = hash_value % capacity
+        for _ in range(capacity):
+            stored_hash, offset, key_size, value_size = BUCKET.unpack_from(
+                buf, HEADER.size + bucket * BUCKET.size
+            )
+            if offset == EMPTY_OFFSET:
+                return (bucket if free is None else free), None
+            if offset == DELETED_OFFSET:
+                if free is None:
+                    free = bucket
+            elif (
+                stored_hash == hash_value
+                and key_size == size
+                and buf[arena + offset:arena + offset + size] == data
+            ):
+                return bucket, (offset, key_size, value_size)
+            bucket += 1
+            if bucket == capacity:
+                bucket = 0
+        return free, None
+
+    # Inserción del escritor con clave y valor ya codificados.
+    def _set_encoded(self, data, value):
+        hash_value = stable_hash(data)
+        bucket, found = self._find(data, hash_value)
+        size = len(data) + len(value)
+        arena_used = self._field(_ARENA_USED)
+        if arena_used + size > self._field(_ARENA_SIZE):
+            raise OverflowError("Shared hash table arena is full")
+        new_bucket = found is None
+        reused = False
+        if new_bucket:
+            if bucket is None:
+                raise OverflowError("Shared hash table is full")
+            position = self._bucket_position(bucket)
+            reused = (
+                BUCKET.unpack_from(self._shm.buf, position)[1] == DELETED_OFFSET
+            )
+            filled = self._field(_FILLED) + (0 if reused else 1)
+            if filled > self.capacity * DEFAULT_MAX_LOAD_FACTOR:
+                if self._field(_FILLED) == len(self):
+                    raise OverflowError("Shared hash table is full")
+                self._purge_deleted()
+                return self._set_encoded(data, value)
+        self._begin_write()
+        try:
+            buf = self._shm.buf
+            start = self._arena_start() + arena_used
+            buf[start:start + len(data)] = data
+            buf[start + len(data):start + size] = value
+            self._set_field(_ARENA_USED, arena_used + size)
+            BUCKET.pack_into(
+                buf,
+                self._bucket_position(bucket),
+                hash_value,
+                arena_used,
+                len(data),
+                len(value),
+            )
+            if new_bucket:
+                self._set_field(_LENGTH, self._field(_LENGTH) + 1)
+                if not reused:
+                    self._set_field(_FILLED, self._field(_FILLED) + 1)
+        finally:
+            self._end_write()
+
+    # Vacía los buckets borrados recolocando los vivos, sin tocar la arena.
+    def _purge_deleted(self):
+        buf = self._shm.buf
+        capacity = self.capacity
+        live = []
+        for bucket in range(capacity):
+            entry = BUCKET.unpack_from(buf, self._bucket_position(bucket))
+            if entry[1] < DELETED_OFFSET:
+                live.append(entry)
+        self._begin_write()
+        try:
+            empty = BUCKET.pack(0, EMPTY_OFFSET, 0, 0)
+            buf[HEADER.size:HEADER.size + capacity * BUCKET.size] = (
+                empty * capacity
+            )
+            for entry in live:
+                bucket = entry[0] % capacity
+                while BUCKET.unpack_from(
+                    buf, self._bucket_position(bucket)
+                )[1] != EMPTY_OFFSET:
+                    bucket = (bucket + 1) % capacity
+                BUCKET.pack_into(buf, self._bucket_position(bucket), *entry)
+            self._set_field(_FILLED, len(live))
+        finally:
+            self._end_write()
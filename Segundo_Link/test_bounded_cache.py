@@ -0,0 +1,207 @@
+import random
+
+import pytest
+
+from bounded_cache import BoundedCache, CacheInfo, memoize
+
+
+# Reloj manual para controlar la caducidad en los tests.
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+# Los límites y la política deben ser válidos.
+@pytest.mark.parametrize(
+    "options",
+    [{"max_entries": 0}, {"max_bytes": 0}, {"ttl": 0}, {"policy": "fifo"}],
+)
+def test_should_not_create_invalid_cache(options):
+    with pytest.raises(ValueError):
+        BoundedCache(**options)
+
+
+# Operaciones básicas y contadores de aciertos y fallos.
+def test_should_get_put_and_delete():
+    cache = BoundedCache(max_entries=10)
+    cache["hola"] = "hello"
+    cache.put(98.6, 37)
+
+    assert cache["hola"] == "hello"
+    assert cache.get("missing_key", "default") == "default"
+    assert 98.6 in cache
+    del cache[98.6]
+    assert 98.6 not in cache
+    with pytest.raises(KeyError):
+        cache["missing_key"]
+    with pytest.raises(KeyError):
+        del cache["missing_key"]
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+# LRU expulsa la entrada usada hace más tiempo.
+def test_should_evict_least_recently_used():
+    cache = BoundedCache(max_entries=3)
+    for key in "abc":
+        cache[key] = key
+    cache.get("a")
+    cache["d"] = "d"
+
+    assert "b" not in cache
+    assert all(key in cache for key in "acd")
+    assert cache.evictions == 1
+
+
+# LFU expulsa la entrada usada menos veces y, a igualdad, la más antigua.
+def test_should_evict_least_frequently_used():
+    cache = BoundedCache(max_entries=3, policy="lfu")
+    for key in "abc":
+        cache[key] = key
+    cache.get("a")
+    cache.get("a")
+    cache.get("c")
+    cache["d"] = "d"
+    assert "b" not in cache
+    cache["e"] = "e"
+    assert "d" not in cache
+    assert all(key in cache for key in "ace")
+
+
+# LFU sigue funcionando tras borrar la última entrada de la frecuencia
+# mínima.
+def test_should_evict_after_deleting_least_frequent():
+    cache = BoundedCache(max_entries=2, policy="lfu")
+    cache["a"] = "a"
+    cache["b"] = "b"
+    cache.get("b")
+    del cache["a"]
+    cache["c"] = "c"
+    cache.get("c")
+    cache.get("c")
+    cache["d"] = "d"
+
+    assert "b" not in cache
+    assert "c" in cache and "d" in cache
+
+
+# La frecuencia mínima avanza con los usos que vacían su lista, así que
+# expulsar no recorre una a una las frecuencias intermedias.
+def test_should_track_min_frequency_on_touch():
+    cache = BoundedCache(max_entries=2, policy="lfu")
+    cache["a"] = "a"
+    for _ in range(1000):
+        cache.get("a")
+    cache["b"] = "b"
+    for _ in range(500):
+        cache.get("b")
+    policy = cache._policy
+
+    assert policy._min_frequency == min(policy._lists)
+    cache["c"] = "c"
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+
+
+# Actualizar una clave no la expulsa a ella misma.
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+def test_should_update_without_evicting_itself(policy):
+    cache = BoundedCache(max_entries=2, policy=policy)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["a"] = 3
+
+    assert cache["a"] == 3
+    assert len(cache) == 2
+    assert cache.evictions == 0
+
+
+# Con presupuesto de bytes se expulsa hasta que quepa la nueva entrada y
+# no se guardan entradas que no caben nunca.
+def test_should_respect_byte_budget():
+    cache = BoundedCache(max_bytes=10, sizeof=lambda key, value: len(value))
+    cache["a"] = "xxxx"
+    cache["b"] = "xxxx"
+    cache["c"] = "xxxxxx"
+
+    assert "a" not in cache and "b" in cache
+    assert cache.bytes == 10
+    cache["d"] = "x" * 11
+    assert "d" not in cache
+    cache["c"] = "x" * 11
+    assert "c" not in cache
+    assert cache.bytes == 4
+
+
+# Las entradas caducan al acceder a ellas tras su TTL.
+def test_should_expire_entries_lazily(clock):
+    cache = BoundedCache(ttl=10, clock=clock)
+    cache["a"] = "a"
+    cache.put("b", "b", ttl=100)
+    clock.now = 50
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert "b" in cache
+    assert len(cache) == 1
+    assert cache.expirations == 1
+    assert cache.info() == CacheInfo(
+        hits=0, misses=1, evictions=0, expirations=1, size=1, bytes=0
+    )
+
+
+# clear vacía la caché.
+def test_should_clear():
+    cache = BoundedCache(max_entries=2, policy="lfu")
+    cache["a"] = 1
+    cache.clear()
+    cache["b"] = 2
+    cache["c"] = 3
+    cache["d"] = 4
+
+    assert len(cache) == 2
+    assert "b" not in cache
+
+
+# Con cualquier secuencia de operaciones nunca supera el límite y se
+# comporta como un dict para las claves que conserva.
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+def test_should_stay_bounded(policy):
+    rng = random.Random(policy)
+    cache = BoundedCache(max_entries=50, policy=policy)
+    expected = {}
+    for _ in range(5000):
+        key = rng.randrange(200)
+        if rng.random() < 0.5:
+            cache[key] = expected[key] = rng.random()
+        else:
+            value = cache.get(key)
+            assert value is None or value == expected[key]
+        assert len(cache) <= 50
+
+
+# memoize guarda los resultados, también None, según los argumentos.
+def test_should_memoize():
+    calls = []
+
+    @memoize(max_entries=2)
+    def square(x, offset=0):
+        calls.append(x)
+        return None if x is None else x * x + offset
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square(3, offset=1) == 10
+    assert square(None) is None
+    assert square(None) is None
+    assert calls == [3, 3, None]
+    assert square.__name__ == "square"
+    assert square.cache.hits == 2
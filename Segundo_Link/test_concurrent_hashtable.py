@@ -0,0 +1,156 @@
+import threading
+
+import pytest
+
+from concurrent_hashtable import ConcurrentHashTable
+
+
+# Fixture con una tabla concurrente de 3 entradas de ejemplo.
+@pytest.fixture
+def hash_table():
+    sample_data = ConcurrentHashTable()
+    sample_data["hola"] = "hello"
+    sample_data[98.6] = 37
+    sample_data[False] = True
+    return sample_data
+
+
+# Lanza threads hilos que ejecutan function(índice_del_hilo) a la vez.
+def run_in_threads(function, threads=8):
+    barrier = threading.Barrier(threads)
+
+    def worker(index):
+        barrier.wait()
+        function(index)
+
+    workers = [
+        threading.Thread(target=worker, args=(index,))
+        for index in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+
+# El número de segmentos se redondea a potencia de dos.
+def test_should_round_segments_to_power_of_two():
+    assert ConcurrentHashTable(segments=10).segments == 16
+    assert ConcurrentHashTable(segments=1).segments == 1
+
+
+# No se admiten segmentos con redimensionado incremental.
+def test_should_not_create_incremental_segments():
+    with pytest.raises(ValueError):
+        ConcurrentHashTable(incremental_resize=True)
+
+
+# Operaciones básicas de mapping.
+def test_should_insert_get_and_delete(hash_table):
+    assert len(hash_table) == 3
+    assert hash_table["hola"] == "hello"
+    assert hash_table.get("missing_key", "default") == "default"
+    assert 98.6 in hash_table
+
+    del hash_table["hola"]
+
+    assert "hola" not in hash_table
+    with pytest.raises(KeyError):
+        hash_table["hola"]
+    assert hash_table.pairs == {(98.6, 37), (False, True)}
+    assert hash_table.keys == {98.6, False}
+    assert sorted(hash_table.values) == [True, 37]
+    assert set(hash_table) == {98.6, False}
+
+
+# Las claves se reparten entre los segmentos.
+def test_should_spread_keys_across_segments():
+    hash_table = ConcurrentHashTable(segments=8)
+    for i in range(1000):
+        hash_table[i] = i
+    sizes = [len(segment) for segment in hash_table._segments]
+    assert min(sizes) > 50
+
+
+# setdefault y pop devuelven los valores esperados.
+def test_should_setdefault_and_pop(hash_table):
+    assert hash_table.setdefault("hola", "other") == "hello"
+    assert hash_table.setdefault("gracias", "thank you") == "thank you"
+    assert hash_table["gracias"] == "thank you"
+
+    assert hash_table.pop("gracias") == "thank you"
+    assert hash_table.pop("gracias", None) is None
+    with pytest.raises(KeyError):
+        hash_table.pop("gracias")
+
+
+# compute guarda el resultado de aplicar la función al valor actual.
+def test_should_compute(hash_table):
+    assert hash_table.compute("counter", lambda value: value + 1, 0) == 1
+    assert hash_table.compute("counter", lambda value: value + 1, 0) == 2
+    assert hash_table["counter"] == 2
+
+
+# Hilos que escriben claves distintas no pierden escrituras.
+def test_should_not_lose_concurrent_writes():
+    hash_table = ConcurrentHashTable(capacity=8, segments=4)
+
+    def write(thread):
+        for i in range(2000):
+            hash_table[(thread, i)] = i
+
+    run_in_threads(write)
+
+    assert len(hash_table) == 8 * 2000
+    assert all(hash_table[(3, i)] == i for i in range(2000))
+
+
+# compute es atómico: los incrementos concurrentes no se pierden.
+def test_should_compute_atomically():
+    hash_table = ConcurrentHashTable(segments=2)
+
+    def increment(thread):
+        for i in range(1000):
+            hash_table.compute(i % 10, lambda value: value + 1, 0)
+
+    run_in_threads(increment)
+
+    assert hash_table.values == [800] * 10
+
+
+# setdefault es atómico: todos los hilos reciben el mismo objeto.
+def test_should_setdefault_atomically():
+    hash_table = ConcurrentHashTable()
+    results = [None] * 8
+
+    def setdefault(thread):
+        results[thread] = hash_table.setdefault("key", object())
+
+    run_in_threads(setdefault)
+
+    assert all(result is results[0] for result in results)
+
+
+# Las lecturas sin lock durante escrituras y redimensionados devuelven
+# siempre el valor correcto.
+def test_should_read_consistently_during_writes():
+    hash_table = ConcurrentHashTable(capacity=4, segments=2)
+    for i in range(100):
+        hash_table[i] = i
+    errors = []
+
+    def work(thread):
+        if thread == 0:
+            for i in range(100, 20000):
+                hash_table[i] = i
+                if i % 3 == 0:
+                    del hash_table[i]
+        else:
+            for _ in range(50):
+                for i in range(100):
+                    if hash_table.get(i) != i:
+                        errors.append(i)
+
+    run_in_threads(work, threads=4)
+
+    assert errors == []
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+import file_hashtable
+from file_hashtable import _DIRTY, _LENGTH, FileHashTable
+from hashtable import HashTable
+
+
+# Fixture con un fichero de 3 entradas de ejemplo, abierto en escritura.
+@pytest.fixture
+def hash_table(tmp_path):
+    sample_data = FileHashTable.create(
+        tmp_path / "sample.fht", {"hola": "hello", 98.6: 37, False: True}
+    )
+    yield sample_data
+    sample_data.close()
+
+
+# Operaciones de lectura sobre una tabla creada desde un diccionario.
+def test_should_create_from_mapping(hash_table):
+    assert len(hash_table) == 3
+    assert hash_table["hola"] == "hello"
+    assert hash_table[98.6] == 37
+    assert hash_table.get("missing_key", "default") == "default"
+    assert False in hash_table
+    with pytest.raises(KeyError):
+        hash_table["missing_key"]
+    assert hash_table.pairs == {("hola", "hello"), (98.6, 37), (False, True)}
+    assert hash_table.to_hashtable() == HashTable.from_dict(
+        {"hola": "hello", 98.6: 37, False: True}
+    )
+
+
+# Los cambios persisten al cerrar y reabrir el fichero.
+def test_should_persist_writes(hash_table):
+    hash_table["hola"] = "hi"
+    hash_table["gracias"] = "thank you"
+    del hash_table[98.6]
+    hash_table.close()
+
+    with FileHashTable.open(hash_table.path) as reopened:
+        assert reopened.pairs == {
+            ("hola", "hi"),
+            ("gracias", "thank you"),
+            (False, True),
+        }
+
+
+# En solo lectura no se puede escribir, pero se ven las escrituras de
+# quien tiene el fichero abierto en escritura.
+def test_should_open_read_only(hash_table):
+    with FileHashTable.open(hash_table.path) as reader:
+        hash_table["gracias"] = "thank you"
+        assert reader["gracias"] == "thank you"
+        with pytest.raises(TypeError):
+            reader["hola"] = "hi"
+        with pytest.raises(TypeError):
+            del reader["hola"]
+
+
+# Al llenarse, el fichero se sustituye por otro mayor con los mismos pares.
+@pytest.mark.parametrize("probing", ["linear", "perturbed"])
+def test_should_grow_into_new_file(tmp_path, probing):
+    hash_table = FileHashTable.create(
+        tmp_path / "grow.fht", capacity=4, data_size=32, probing=probing
+    )
+    for i in range(1000):
+        hash_table[i] = str(i)
+    for i in range(0, 1000, 2):
+        del hash_table[i]
+    hash_table.close()
+
+    with FileHashTable.open(tmp_path / "grow.fht") as reopened:
+        assert reopened.probing == probing
+        assert reopened.capacity > 4
+        assert len(reopened) == 500
+        assert all(reopened[i] == str(i) for i in range(1, 1000, 2))
+        assert 0 not in reopened
+    assert not (tmp_path / "grow.fht.tmp").exists()
+
+
+# Robin Hood no se admite en disco.
+def test_should_not_create_robin_hood_files(tmp_path):
+    with pytest.raises(ValueError):
+        FileHashTable.create(tmp_path / "bad.fht", probing="robinhood")
+
+
+# Abrir un fichero que no es una tabla lanza ValueError.
+def test_should_not_open_other_files(tmp_path):
+    (tmp_path / "other.txt").write_bytes(b"not a hash table")
+    with pytest.raises(ValueError):
+        FileHashTable.open(tmp_path / "other.txt")
+
+
+# Si el escritor cae sin flush(), al reabrir se recuentan los pares.
+def test_should_recount_after_crash(hash_table):
+    hash_table["gracias"] = "thank you"
+    hash_table._map[_LENGTH:_LENGTH + 8] = bytes(8)  # longitud corrupta
+    assert hash_table._map[_DIRTY] == 1
+    hash_table._map.close()
+    hash_table._file.close()
+
+    with FileHashTable.open(hash_table.path, writable=True) as reopened:
+        assert len(reopened) == 4
+        assert reopened._map[_DIRTY] == 0
+
+
+# Si el escritor cae a mitad de una escritura (secuencia impar), los
+# lectores dejan de esperarla tras WRITER_TIMEOUT segundos, una sola vez.
+def test_should_not_wait_for_dead_writer(hash_table, monkeypatch):
+    monkeypatch.setattr(file_hashtable, "WRITER_TIMEOUT", 0.05)
+    hash_table._begin_write()
+
+    with FileHashTable.open(hash_table.path) as reader:
+        assert reader["hola"] == "hello"
+        start = time.monotonic()
+        assert reader.get("missing_key") is None
+        assert time.monotonic() - start < 0.05
@@ -0,0 +1,279 @@
+import copy
+import pickle
+import random
+from unittest.mock import patch
+
+import pytest
+
+from hashset import HashSet
+from hashtable import PROBING_STRATEGIES, HashTable
+
+
+# Clave que cuenta las llamadas a __hash__ y __eq__ para comprobar que el
+# conjunto reutiliza los hashes almacenados.
+class CountingKey:
+    hash_calls = 0
+    eq_calls = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        CountingKey.hash_calls += 1
+        return self.value
+
+    def __eq__(self, other):
+        CountingKey.eq_calls += 1
+        return isinstance(other, CountingKey) and self.value == other.value
+
+
+@pytest.fixture
+def counting_key():
+    CountingKey.hash_calls = 0
+    CountingKey.eq_calls = 0
+    return CountingKey
+
+
+# Operaciones básicas de un conjunto.
+def test_should_add_remove_and_discard():
+    hash_set = HashSet()
+    hash_set.add("hola")
+    hash_set.add(98.6)
+    hash_set.add("hola")
+
+    assert len(hash_set) == 2
+    assert "hola" in hash_set
+    assert "missing_key" not in hash_set
+
+    hash_set.remove("hola")
+    hash_set.discard("missing_key")
+
+    assert list(hash_set) == [98.6]
+    with pytest.raises(KeyError):
+        hash_set.remove("hola")
+
+
+# Solo guarda claves: no hay columna de valores.
+def test_should_not_store_values():
+    hash_set = HashSet.from_iterable(range(100))
+    assert not hasattr(hash_set, "_values")
+    assert "_values" not in HashSet.__slots__
+
+
+# Cada operación con nombre, cada operador y cada versión en el sitio se
+# comporta como la de set, con cualquier estrategia de sondeo.
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_should_behave_like_set(probing):
+    rng = random.Random(probing)
+    for _ in range(50):
+        left = set(rng.sample(range(60), rng.randrange(40)))
+        right = set(rng.sample(range(60), rng.randrange(40)))
+        a = HashSet.from_iterable(left, probing=probing)
+        b = HashSet.from_iterable(right, probing=probing)
+
+        assert set(a | b) == left | right
+        assert set(a & b) == left & right
+        assert set(a - b) == left - right
+        assert set(a ^ b) == left ^ right
+        assert set(a.union(right, [99])) == left | right | {99}
+        assert set(a.intersection(list(right))) == left & right
+        assert set(a.difference(list(right))) == left - right
+        assert set(a.symmetric_difference(list(right))) == left ^ right
+        assert (a <= b) == (left <= right)
+        assert (a < b) == (left < right)
+        assert (a >= b) == (left >= right)
+        assert (a > b) == (left > right)
+        assert a.issubset(list(right)) == left.issubset(right)
+        assert a.issuperset(list(right)) == left.issuperset(right)
+        assert a.isdisjoint(b) == left.isdisjoint(right)
+        assert a.isdisjoint(list(right)) == left.isdisjoint(right)
+
+        for operator in ("__ior__", "__iand__", "__isub__", "__ixor__"):
+            in_place = a.copy()
+            expected = set(left)
+            assert getattr(in_place, operator)(b) is in_place
+            getattr(expected, operator)(right)
+            assert set(in_place) == expected
+            assert len(in_place) == len(expected)
+            assert all(key in in_place for key in expected)
+
+        for method in (
+            "update",
+            "intersection_update",
+            "difference_update",
+            "symmetric_difference_update",
+        ):
+            in_place = a.copy()
+            expected = set(left)
+            getattr(in_place, method)(list(right) * 2)
+            getattr(expected, method)(right)
+            assert set(in_place) == expected
+
+
+# Los operandos no se modifican y el resultado es un HashSet.
+def test_should_return_new_hashsets():
+    a = HashSet.from_iterable("abc")
+    b = HashSet.from_iterable("bcd")
+
+    for result in (a | b, a & b, a - b, a ^ b, a.union(), a.intersection()):
+        assert type(result) is HashSet
+        assert result is not a
+    assert set(a) == set("abc")
+    assert set(b) == set("bcd")
+
+
+# Los operadores solo admiten otro HashSet, como los de set.
+def test_should_not_mix_operators_with_other_types():
+    hash_set = HashSet.from_iterable("abc")
+    with pytest.raises(TypeError):
+        hash_set | {"d"}
+    with pytest.raises(TypeError):
+        hash_set <= ["a"]
+    assert hash_set != {"a", "b", "c"}
+
+
+# Operar con el propio conjunto.
+def test_should_operate_with_itself():
+    hash_set = HashSet.from_iterable(range(10))
+    hash_set |= hash_set
+    hash_set &= hash_set
+    assert set(hash_set) == set(range(10))
+
+    other = hash_set.copy()
+    other -= other
+    assert len(other) == 0
+    hash_set ^= hash_set
+    assert len(hash_set) == 0
+    assert hash_set.capacity == HashSet.from_iterable(range(10)).capacity
+
+
+# Las operaciones entre HashSet reutilizan los hashes almacenados y solo
+# recorren el operando pequeño: cada clave del pequeño se busca una vez.
+def test_should_reuse_stored_hashes(counting_key):
+    large = HashSet.from_iterable(counting_key(i) for i in range(1000))
+    small = HashSet.from_iterable(counting_key(i) for i in range(995, 1005))
+    counting_key.hash_calls = 0
+    counting_key.eq_calls = 0
+
+    for result in (large & small, small & large):
+        assert {key.value for key in result} == set(range(995, 1000))
+    assert len(large | small) == 1005
+    assert len(large ^ small) == 1000
+    assert len(small - large) == 5
+    large.intersection_update(small)
+    assert len(large) == 5
+
+    assert counting_key.hash_calls == 0
+    assert counting_key.eq_calls <= 6 * 5
+
+
+# Las comprobaciones de subconjunto y disjunción terminan en la primera
+# clave que decide el resultado.
+def test_should_exit_early_from_subset_and_disjoint_checks(counting_key):
+    small = HashSet.from_iterable(counting_key(i) for i in range(100))
+    large = HashSet.from_iterable(counting_key(i) for i in range(1, 1000))
+
+    with patch.object(HashSet, "_contains", wraps=large._contains) as contains:
+        assert not small.issubset(large)
+        assert contains.call_count == 1
+        contains.reset_mock()
+        assert not large.isdisjoint(small)
+        assert contains.call_count == 2
+        contains.reset_mock()
+        assert not large.issubset(small)
+        contains.assert_not_called()
+
+
+# Igualdad por contenido, sin importar el orden ni la capacidad.
+def test_should_compare_equal_by_contents():
+    a = HashSet.from_iterable([1, 2, 3])
+    b = HashSet(capacity=64)
+    for key in (3, 1, 2):
+        b.add(key)
+
+    assert a == b
+    assert a != HashSet.from_iterable([1, 2])
+    assert a != HashSet.from_iterable([1, 2, 4])
+    assert a != HashTable.from_dict({1: None, 2: None, 3: None})
+
+
+# Un HashTable sirve como operando por sus claves.
+def test_should_accept_hashtable_keys():
+    hash_set = HashSet.from_iterable("abc")
+    hash_table = HashTable.from_dict({"b": 1, "c": 2, "d": 3})
+
+    assert set(hash_set.intersection(hash_table)) == {"b", "c"}
+    assert set(hash_set.union(hash_table)) == set("abcd")
+    assert HashSet.from_iterable(hash_table) == HashSet.from_iterable("bcd")
+
+
+# Con todas las claves colisionando las operaciones siguen siendo
+# correctas.
+@patch("builtins.hash", return_value=24)
+def test_should_handle_collisions(mock_hash):
+    a = HashSet.from_iterable(range(10))
+    b = HashSet.from_iterable(range(5, 15))
+
+    assert set(a & b) == set(range(5, 10))
+    assert set(a ^ b) == set(range(5)) | set(range(10, 15))
+
+
+# Funciona durante un redimensionado incremental.
+def test_should_work_with_incremental_resize():
+    a = HashSet(incremental_resize=True)
+    a.add(0)
+    while a._old is None:
+        a.add(len(a))
+    b = HashSet.from_iterable(range(3, 100))
+    size = len(a)
+
+    assert set(a & b) == set(range(3, size))
+    assert set(a ^ b) == {0, 1, 2} | set(range(size, 100))
+    assert a.issubset(range(100))
+    a -= b
+    assert set(a) == {0, 1, 2}
+
+
+# Representación, copia y pickle conservan contenido y configuración.
+def test_should_copy_pickle_and_represent():
+    hash_set = HashSet.from_iterable(["a", 1], probing="cuckoo")
+    hash_set.discard(1)
+    hash_set.add((2, 3))
+
+    assert str(hash_set) == "{'a', (2, 3)}"
+    assert repr(hash_set) == "HashSet.from_iterable(['a', (2, 3)])"
+    assert eval(repr(hash_set)) == hash_set
+    for clone in (
+        copy.copy(hash_set),
+        copy.deepcopy(hash_set),
+        pickle.loads(pickle.dumps(hash_set)),
+    ):
+        assert clone == hash_set
+        assert clone.probing == "cuckoo"
+
+
+# deepcopy reconstruye la copia si las claves copiadas tienen otro hash
+# (por identidad del objeto).
+def test_should_deepcopy_identity_hashed_keys():
+    class Key:
+        pass
+
+    hash_set = HashSet.from_iterable(Key() for _ in range(50))
+
+    clone = copy.deepcopy(hash_set)
+
+    assert len(clone) == 50
+    assert all(key in clone for key in clone)
+
+
+# clear vacía el conjunto sin perder la configuración.
+def test_should_clear():
+    hash_set = HashSet(capacity=16, probing="robinhood")
+    hash_set.update(range(100))
+    hash_set.clear()
+
+    assert len(hash_set) == 0
+    assert hash_set.capacity == 16
+    assert hash_set.probing == "robinhood"
+    hash_set.add(1)
+    assert list(hash_set) == [1]
@@ -1,9 +1,30 @@
+import copy
+import io
+import os
+import pickle
+import random
+import subprocess
+import sys
 from unittest.mock import patch
 
 import pytest
 from pytest_unordered import unordered
 
-from hashtable import DELETED, HashTable
+import hashtable as hashtable_module
+from hashtable import (
+    CUCKOO_BUCKET_SIZE,
+    CUCKOO_HASHES,
+    CUCKOO_SEEDS,
+    CUCKOO_STASH_SIZE,
+    DELETED,
+    EMPTY_INDEX,
+    INCREMENTAL_REHASH_STEP,
+    PROBING_STRATEGIES,
+    SNAPSHOT_BLOCK_SIZE,
+    HashTable,
+    HashTableSnapshot,
+    ResizeEvent,
+)
 
 
 # Fixture que devuelve una tabla con 3 entradas de ejemplo. Usada por
@@ -27,6 +48,18 @@ def test_should_create_hashtable_with_default_capacity():
     assert HashTable().capacity == 8
 
 
+# El factor de carga máximo por defecto es 2/3.
+def test_should_create_hashtable_with_default_max_load_factor():
+    assert HashTable().max_load_factor == 2 / 3
+
+
+# El factor de carga máximo debe estar en (0, 1].
+@pytest.mark.parametrize("max_load_factor", [0, -0.5, 1.5])
+def test_should_not_create_hashtable_with_invalid_load_factor(max_load_factor):
+    with pytest.raises(ValueError):
+        HashTable(max_load_factor=max_load_factor)
+
+
 # Una tabla nueva y vacía debe reportar longitud 0.
 def test_should_report_length_of_empty_hash_table():
     assert len(HashTable(capacity=100)) == 0
@@ -277,13 +310,14 @@ def test_should_use_dict_literal_for_str(hash_table):
     }
 
 
-# from_dict debe crear una tabla con las mismas entradas y capacidad
+# from_dict debe crear una tabla con las mismas entradas y sin superar
+# el factor de carga máximo.
 def test_should_create_hashtable_from_dict(hash_table):
     dictionary = {"hola": "hello", 98.6: 37, False: True}
 
     hash_table = HashTable.from_dict(dictionary)
 
-    assert hash_table.capacity == len(dictionary)
+    assert hash_table.load_factor <= hash_table.max_load_factor
     assert hash_table.keys == set(dictionary.keys())
     assert hash_table.pairs == set(dictionary.items())
     assert unordered(hash_table.values) == list(dictionary.values())
@@ -360,6 +394,113 @@ def test_should_compare_equal_different_capacity():
     assert h1 == h2
 
 
+# La igualdad admite valores no hashables y se decide por el contenido.
+def test_should_compare_unhashable_values():
+    h1 = HashTable.from_dict({"a": [1, 2], "b": {"x": 1}})
+    h2 = HashTable.from_dict({"b": {"x": 1}, "a": [1, 2]})
+    h3 = HashTable.from_dict({"a": [1, 2], "b": {"x": 2}})
+
+    assert h1 == h2
+    assert h1 != h3
+    assert h1 != HashTable.from_dict({"a": [1, 2], "c": {"x": 1}})
+
+
+# La igualdad busca cada par con su hash almacenado, sin construir pares
+# ni llamar a hash(); las tablas de distinto tamaño se descartan sin
+# buscar nada.
+def test_should_compare_by_probing_stored_hashes(counting_key):
+    h1 = HashTable.from_dict({counting_key(i): i for i in range(100)})
+    h2 = HashTable.from_dict({key: key.value for key in reversed(list(h1))})
+    counting_key.hash_calls = 0
+
+    with patch.object(HashTable, "_lookup", wraps=h2._lookup) as lookup:
+        assert h1 == h2
+        assert lookup.call_count == 100
+        lookup.reset_mock()
+        del h2[counting_key(5)]
+        lookup.reset_mock()
+        assert h1 != h2
+        lookup.assert_not_called()
+
+    assert counting_key.hash_calls == 1
+    assert counting_key.eq_calls == 1
+
+
+# Dos tablas con las mismas entradas en el mismo orden (como una copia)
+# se comparan sin buscar ninguna clave.
+def test_should_compare_copies_without_probing():
+    h1 = HashTable.from_dict({i: [i] for i in range(100)})
+    del h1[50]
+    h2 = h1.copy()
+    h3 = h1.copy()
+    h3[10] = [11]
+
+    with patch.object(HashTable, "_lookup") as lookup:
+        assert h1 == h2
+        assert h1 != h3
+        lookup.assert_not_called()
+
+
+# La huella de contenido no depende del orden, la capacidad ni la
+# estrategia, y se mantiene igual a la recalculada tras inserciones,
+# actualizaciones, borrados y redimensionados (también incrementales).
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_should_maintain_fingerprint(probing):
+    rng = random.Random(probing)
+    hash_table = HashTable(
+        capacity=4, min_load_factor=0.1, probing=probing, incremental_resize=True
+    )
+    hash_table.enable_fingerprint()
+    expected = {}
+    for _ in range(3000):
+        key = rng.randrange(200)
+        if rng.random() < 0.6:
+            hash_table[key] = expected[key] = rng.choice([key, [key], "x", None])
+        elif key in expected:
+            del hash_table[key]
+            del expected[key]
+
+    fresh = HashTable.from_dict(dict(reversed(list(expected.items()))))
+    fresh.enable_fingerprint()
+    assert hash_table.fingerprint == fresh.fingerprint
+    assert hash_table == fresh
+
+
+# Con huella en ambas tablas, las distintas se descartan sin buscar.
+def test_should_reject_different_fingerprints_without_probing():
+    h1 = HashTable.from_dict({i: i for i in range(100)})
+    h2 = HashTable.from_dict({i: i for i in range(100)})
+    h2[50] = "changed"
+    h1.enable_fingerprint()
+    h2.enable_fingerprint()
+
+    with patch.object(HashTable, "_get") as get:
+        assert h1 != h2
+        get.assert_not_called()
+
+    h2[50] = 50.0
+    assert h1.fingerprint == h2.fingerprint
+    assert h1 == h2
+
+
+# La huella está desactivada por defecto, se conserva al copiar y al
+# guardar una instantánea y se puede desactivar.
+def test_should_copy_and_disable_fingerprint():
+    hash_table = HashTable.from_dict({"a": 1, "b": [2]})
+    assert hash_table.fingerprint is None
+
+    hash_table.enable_fingerprint()
+    fingerprint = hash_table.fingerprint
+    assert hash_table.copy().fingerprint == fingerprint
+    assert copy.deepcopy(hash_table).fingerprint == fingerprint
+    assert pickle.loads(pickle.dumps(hash_table)).fingerprint == fingerprint
+    assert dump_and_load(hash_table).fingerprint == fingerprint
+
+    hash_table.disable_fingerprint()
+    assert hash_table.fingerprint is None
+    assert dump_and_load(hash_table).fingerprint is None
+
+
 # Forzamos hash constante para simular colisiones y verificar el comportamiento
 @patch("builtins.hash", return_value=24)
 def test_should_detect_and_resolve_hash_collisions(mock_hash):
@@ -376,10 +517,11 @@ def test_should_detect_and_resolve_hash_collisions(mock_hash):
     assert hash_table._slots[26] == (False, True)
 
 
-# Forzamos side_effects en hash para comprobar wrapping del índice.
+# Forzamos side_effects en hash para comprobar wrapping del índice. Con
+# factor de carga 1 la tabla se llena sin redimensionar.
 @patch("builtins.hash", side_effect=[2, 1, 1])
 def test_should_wrap_index_around_when_collides(mock_hash):
-    hash_table = HashTable(capacity=3)
+    hash_table = HashTable(capacity=3, max_load_factor=1)
     hash_table["hola"] = "hello"
     hash_table[98.6] = 37
     hash_table[False] = True
@@ -391,8 +533,8 @@ def test_should_wrap_index_around_when_collides(mock_hash):
     assert hash_table._slots[0] == (False, True)
 
 
-# No debemos sobrescribir una ranura marcada DELETED cuando insertamos
-def test_should_not_overwrite_deleted(hash_table):
+# Una clave nueva reutiliza la ranura marcada DELETED de su cadena.
+def test_should_reuse_deleted(hash_table):
     del hash_table["hola"]
     deleted_slot = hash_table._slots.index(DELETED)
 
@@ -402,9 +544,91 @@ def test_should_not_overwrite_deleted(hash_table):
     with patch("builtins.hash", return_value=deleted_slot):
         hash_table["gracias"] = "thank you"
 
-    # Aún debe haber al menos un DELETED en los slots (no se sobrescribe)
     assert len(hash_table) == 3
-    assert DELETED in hash_table._slots
+    assert DELETED not in hash_table._slots
+    assert hash_table._slots[deleted_slot] == ("gracias", "thank you")
+
+
+# Si la clave existe más allá de un marcador DELETED se actualiza en su
+# sitio, sin duplicarla en la ranura eliminada.
+@patch("builtins.hash", return_value=24)
+def test_should_not_duplicate_key_after_deleted(mock_hash):
+    hash_table = HashTable(capacity=100)
+    hash_table["hola"] = "hello"
+    hash_table[98.6] = 37
+    del hash_table["hola"]
+
+    hash_table[98.6] = 38
+
+    assert len(hash_table) == 1
+    assert hash_table._slots[24] is DELETED
+    assert hash_table._slots[25] == (98.6, 38)
+
+
+# Con muchos marcadores DELETED la tabla se compacta en lugar de crecer.
+def test_should_compact_instead_of_growing():
+    hash_table = HashTable(capacity=8, max_load_factor=0.75)
+    for i in range(6):
+        hash_table[i] = i
+    for i in range(4):
+        del hash_table[i]
+
+    for i in range(10, 14):
+        hash_table[i] = i
+
+    assert hash_table.capacity == 8
+    assert DELETED not in hash_table._slots
+    assert dict(hash_table.pairs) == {4: 4, 5: 5, 10: 10, 11: 11, 12: 12, 13: 13}
+
+
+# Bajo una carga continua de inserciones y borrados la capacidad y los
+# marcadores DELETED siguen acotados por el número de claves vivas.
+def test_should_keep_capacity_bounded_under_churn():
+    hash_table = HashTable(capacity=8)
+    for i in range(10_000):
+        hash_table[i] = i
+        if i >= 4:
+            del hash_table[i - 4]
+
+    assert len(hash_table) == 4
+    assert hash_table.capacity <= 16
+    assert hash_table.load_factor <= hash_table.max_load_factor
+
+
+# Con min_load_factor la tabla encoge al quedarse casi vacía, sin bajar
+# de la capacidad inicial.
+def test_should_shrink_when_under_min_load_factor():
+    hash_table = HashTable(capacity=8, min_load_factor=0.25)
+    for i in range(100):
+        hash_table[i] = i
+    grown_capacity = hash_table.capacity
+
+    for i in range(98):
+        del hash_table[i]
+
+    assert hash_table.capacity < grown_capacity
+    assert hash_table.capacity == 8
+    assert dict(hash_table.pairs) == {98: 98, 99: 99}
+
+
+# Por defecto la tabla no encoge.
+def test_should_not_shrink_by_default():
+    hash_table = HashTable(capacity=8)
+    for i in range(100):
+        hash_table[i] = i
+    grown_capacity = hash_table.capacity
+
+    for i in range(98):
+        del hash_table[i]
+
+    assert hash_table.capacity == grown_capacity
+
+
+# min_load_factor debe quedar por debajo de la mitad del máximo para que
+# encoger no provoque un crecimiento inmediato.
+def test_should_not_create_hashtable_with_invalid_min_load_factor():
+    with pytest.raises(ValueError):
+        HashTable(max_load_factor=0.5, min_load_factor=0.25)
 
 
 # Insertar una entrada adicional en una tabla pequeña debe forzar
@@ -427,6 +651,63 @@ def test_should_double_capacity():
     }
 
 
+# Con factor de carga 1 la tabla solo crece cuando no queda ninguna ranura.
+def test_should_double_capacity_only_when_full():
+    hash_table = HashTable(capacity=3, max_load_factor=1)
+    hash_table["hola"] = "hello"
+    hash_table[98.6] = 37
+    hash_table[False] = True
+
+    assert hash_table.capacity == 3
+
+    hash_table["gracias"] = "thank you"
+
+    assert hash_table.capacity == 6
+    assert len(hash_table) == 4
+
+
+# La tabla crece en cuanto superaría el factor de carga máximo, de modo
+# que nunca se llena por completo.
+def test_should_grow_when_exceeding_max_load_factor():
+    hash_table = HashTable(capacity=8, max_load_factor=0.5)
+    for i in range(4):
+        hash_table[i] = i
+
+    assert hash_table.capacity == 8
+
+    hash_table[4] = 4
+
+    assert hash_table.capacity == 16
+    assert hash_table.load_factor <= 0.5
+    assert dict(hash_table.pairs) == {i: i for i in range(5)}
+
+
+# Los marcadores DELETED cuentan para el factor de carga.
+def test_should_count_deleted_in_load_factor(hash_table):
+    del hash_table["hola"]
+    assert len(hash_table) == 2
+    assert hash_table.load_factor == 3 / 100
+
+
+# La longitud se mantiene con contadores: no cambia al actualizar y baja
+# al borrar.
+def test_should_keep_length_on_update_and_delete(hash_table):
+    hash_table["hola"] = "hallo"
+    assert len(hash_table) == 3
+
+    del hash_table[98.6]
+    assert len(hash_table) == 2
+
+    hash_table[98.6] = 37
+    assert len(hash_table) == 3
+
+
+# len() no debe recorrer los slots ni construir pares.
+def test_should_report_length_without_scanning_slots(hash_table):
+    with patch.object(HashTable, "pairs", property(lambda self: 1 / 0)):
+        assert len(hash_table) == 3
+
+
 # Cuando todas las claves colisionan por hash, la lectura debe seguir
 # devolviendo los valores correctos.
 @patch("builtins.hash", return_value=24)
@@ -443,11 +724,13 @@ def test_should_get_collided_values(mock_hash):
     assert hash_table[False] is True
 
 
-# Simula varios hashes para insertar y borrar y comprobar que las búsquedas
-# ignoran marcadores DELETED y siguen encontrando otras claves.
-@patch("builtins.hash", side_effect=[0, 1, 2, 0, 1, 0])
+# Fuerza una misma cadena de sondeo para insertar y borrar y comprobar que
+# las búsquedas ignoran marcadores DELETED y siguen encontrando otras
+# claves. El hash de cada clave debe ser estable, ya que la tabla compara
+# el hash almacenado antes que la clave.
+@patch("builtins.hash", return_value=0)
 def test_should_not_get_deleted_values(mock_hash):
-    hash_table = HashTable(capacity=3)
+    hash_table = HashTable(capacity=3, max_load_factor=1)
     hash_table["hola"] = "hello"
     hash_table[98.6] = 37
     hash_table[False] = True
@@ -470,4 +753,1087 @@ def test_pairs_should_not_contain_deleted(hash_table):
     del hash_table["hola"]
     del hash_table[98.6]
 
-    assert hash_table.pairs == {(False, True)}
\ No newline at end of file
+    assert hash_table.pairs == {(False, True)}
+
+# La iteración, values y str siguen el orden de inserción gracias a las
+# entradas densas, incluso tras borrar y redimensionar.
+def test_should_iterate_in_insertion_order():
+    hash_table = HashTable(capacity=4)
+    for key in ["d", "a", "c", "b", "e"]:
+        hash_table[key] = key.upper()
+    del hash_table["c"]
+    hash_table["c"] = "C"
+
+    assert list(hash_table) == ["d", "a", "b", "e", "c"]
+    assert hash_table.values == ["D", "A", "B", "E", "C"]
+    assert str(hash_table) == "{'d': 'D', 'a': 'A', 'b': 'B', 'e': 'E', 'c': 'C'}"
+
+
+# Actualizar un valor no cambia la posición de la clave.
+def test_should_keep_position_on_update():
+    hash_table = HashTable.from_dict({"a": 1, "b": 2, "c": 3}, capacity=8)
+    hash_table["a"] = 10
+    assert list(hash_table) == ["a", "b", "c"]
+
+
+# La clase usa __slots__: las instancias no tienen __dict__.
+def test_should_not_have_instance_dict():
+    with pytest.raises(AttributeError):
+        HashTable().__dict__
+
+
+# El array de índices usa el entero más pequeño que cabe en la capacidad.
+@pytest.mark.parametrize("capacity, itemsize", [
+    (8, 1),
+    (127, 1),
+    (128, 2),
+    (40_000, 4),
+])
+def test_should_use_smallest_index_type(capacity, itemsize):
+    assert HashTable(capacity)._indices.itemsize == itemsize
+
+
+# El almacenamiento compacto ocupa bastante menos que una lista de slots
+# con un Pair por entrada.
+def test_should_use_less_memory_than_pair_slots():
+    hash_table = HashTable(capacity=8)
+    for i in range(10_000):
+        hash_table[i] = i
+    compact = sum(
+        sys.getsizeof(storage)
+        for storage in (
+            hash_table._indices,
+            hash_table._hashes,
+            hash_table._keys,
+            hash_table._values,
+        )
+    )
+    slots = hash_table._slots
+    pair_slots = sys.getsizeof(slots) + sum(
+        sys.getsizeof(pair) for pair in slots if pair is not None
+    )
+    assert compact * 2 < pair_slots
+
+
+# Clave que cuenta las llamadas a __hash__ y __eq__ para comprobar que la
+# tabla reutiliza los hashes almacenados.
+class CountingKey:
+    hash_calls = 0
+    eq_calls = 0
+
+    def __init__(self, value, hash_value=None):
+        self.value = value
+        self.hash_value = value if hash_value is None else hash_value
+
+    def __hash__(self):
+        CountingKey.hash_calls += 1
+        return self.hash_value
+
+    def __eq__(self, other):
+        CountingKey.eq_calls += 1
+        return isinstance(other, CountingKey) and self.value == other.value
+
+
+@pytest.fixture
+def counting_key():
+    CountingKey.hash_calls = 0
+    CountingKey.eq_calls = 0
+    return CountingKey
+
+
+# Redimensionar reutiliza los hashes almacenados: una sola llamada a
+# __hash__ por inserción, sin importar cuántas veces crezca la tabla.
+def test_should_not_rehash_keys_on_resize(counting_key):
+    hash_table = HashTable(capacity=2)
+    for i in range(1000):
+        hash_table[counting_key(i)] = i
+
+    assert hash_table.capacity > 1000
+    assert counting_key.hash_calls == 1000
+    assert counting_key.eq_calls == 0
+
+
+# Al sondear se comparan los hashes antes que las claves: claves con
+# hashes distintos que caen en la misma ranura no llaman a __eq__.
+def test_should_compare_hashes_before_keys(counting_key):
+    hash_table = HashTable(capacity=100)
+    for i in range(10):
+        hash_table[counting_key(i, hash_value=24 + 100 * i)] = i
+
+    assert hash_table[counting_key(9, hash_value=24 + 900)] == 9
+    assert counting_key.eq_calls == 1
+
+
+# Una clave se encuentra por identidad sin llamar a __eq__, como en dict
+# (por ejemplo NaN, que no es igual a sí mismo).
+def test_should_find_key_by_identity(counting_key):
+    nan = float("nan")
+    key = counting_key(1)
+    hash_table = HashTable()
+    hash_table[nan] = "nan"
+    hash_table[key] = "key"
+
+    assert hash_table[nan] == "nan"
+    assert hash_table[key] == "key"
+    assert counting_key.eq_calls == 0
+
+
+# Una estrategia de sondeo desconocida debe rechazarse.
+def test_should_not_create_hashtable_with_unknown_probing():
+    with pytest.raises(ValueError):
+        HashTable(probing="cuadratic")
+
+
+# El sondeo lineal sigue siendo la estrategia por defecto.
+def test_should_use_linear_probing_by_default():
+    assert HashTable().probing == "linear"
+
+
+# Cada estrategia se comporta como un dict bajo una secuencia aleatoria de
+# inserciones, actualizaciones, lecturas y borrados.
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_should_behave_like_dict_with_any_probing(probing):
+    rng = random.Random(probing)
+    hash_table = HashTable(capacity=4, min_load_factor=0.1, probing=probing)
+    expected = {}
+    for _ in range(5000):
+        key = rng.randrange(300)
+        action = rng.random()
+        if action < 0.5:
+            hash_table[key] = expected[key] = rng.random()
+        elif action < 0.8:
+            assert hash_table.get(key) == expected.get(key)
+        elif key in expected:
+            del hash_table[key]
+            del expected[key]
+        else:
+            with pytest.raises(KeyError):
+                del hash_table[key]
+    assert len(hash_table) == len(expected)
+    assert dict(hash_table.pairs) == expected
+
+
+# Con todas las claves colisionando, cada estrategia inserta, lee y borra
+# correctamente y llena la tabla por completo si el factor de carga es 1.
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+@patch("builtins.hash", return_value=24)
+def test_should_resolve_collisions_with_any_probing(mock_hash, probing):
+    hash_table = HashTable(capacity=5, max_load_factor=1, probing=probing)
+    for key in "abcde":
+        hash_table[key] = key.upper()
+
+    assert hash_table.capacity == 5
+    assert None not in hash_table._slots
+
+    del hash_table["b"]
+    del hash_table["d"]
+
+    assert [hash_table[key] for key in "ace"] == ["A", "C", "E"]
+    assert "b" not in hash_table
+    assert "d" not in hash_table
+
+
+# Robin Hood borra desplazando la cadena hacia atrás, sin marcadores.
+@patch("builtins.hash", return_value=24)
+def test_should_not_leave_deleted_with_robin_hood(mock_hash):
+    hash_table = HashTable(capacity=100, probing="robinhood")
+    hash_table["hola"] = "hello"
+    hash_table[98.6] = 37
+    hash_table[False] = True
+
+    del hash_table["hola"]
+
+    assert DELETED not in hash_table._slots
+    assert hash_table._slots[24] == (98.6, 37)
+    assert hash_table._slots[25] == (False, True)
+    assert hash_table._slots[26] is None
+
+
+# Robin Hood mantiene cada cadena ordenada: una clave nunca está más
+# lejos de su origen que la siguiente más uno.
+def test_should_keep_robin_hood_invariant():
+    hash_table = HashTable(capacity=64, max_load_factor=0.9, probing="robinhood")
+    for i in range(57):
+        hash_table[i * 7919 % 1000] = i
+    capacity = hash_table.capacity
+
+    def distance(index):
+        entry = hash_table._indices[index]
+        return (index - hash_table._hashes[entry]) % capacity
+
+    for index in range(capacity):
+        next_index = (index + 1) % capacity
+        if hash_table._indices[next_index] >= 0 and distance(next_index):
+            assert hash_table._indices[index] >= 0
+            assert distance(next_index) <= distance(index) + 1
+
+
+# Con cuckoo ninguna búsqueda, con acierto o con fallo, visita más de
+# CUCKOO_HASHES cubos aunque la tabla esté casi llena.
+def test_should_bound_lookups_with_cuckoo():
+    hash_table = HashTable(capacity=1024, max_load_factor=0.95, probing="cuckoo")
+    for i in range(970):
+        hash_table[i * 7919] = i
+    hash_table.enable_stats()
+
+    for i in range(2000):
+        assert hash_table.get(i * 7919) == (i if i < 970 else None)
+
+    stats = hash_table.stats()
+    assert stats.capacity == 1024
+    assert sum(stats.hit_probe_lengths.values()) == 970
+    assert max(stats.hit_probe_lengths) <= CUCKOO_HASHES * CUCKOO_BUCKET_SIZE
+    assert list(stats.miss_probe_lengths) == [CUCKOO_HASHES * CUCKOO_BUCKET_SIZE]
+
+
+# Si los desalojos no bastan, la tabla cambia de semillas en lugar de
+# crecer: incluso al 100% de carga el stash queda pequeño.
+def test_should_reseed_cuckoo_table_instead_of_growing():
+    hash_table = HashTable(capacity=128, max_load_factor=1, probing="cuckoo")
+    for i in range(128):
+        hash_table[i * 7919] = i
+
+    assert hash_table.capacity == 128
+    assert hash_table._seeds != CUCKOO_SEEDS
+    assert len(hash_table._stash) <= CUCKOO_STASH_SIZE
+    assert all(hash_table[i * 7919] == i for i in range(128))
+
+
+# Las claves con el mismo hash que no caben en sus cubos van al stash:
+# se siguen encontrando y borrando y la tabla no crece de más.
+@patch("builtins.hash", return_value=24)
+def test_should_stash_colliding_keys_with_cuckoo(mock_hash):
+    hash_table = HashTable(probing="cuckoo")
+    for i in range(20):
+        hash_table[i] = str(i)
+
+    assert len(hash_table._stash) == 20 - CUCKOO_HASHES * CUCKOO_BUCKET_SIZE
+    assert hash_table.capacity == 32
+
+    for i in range(0, 20, 2):
+        del hash_table[i]
+
+    assert dict(hash_table.pairs) == {i: str(i) for i in range(1, 20, 2)}
+    assert 0 not in hash_table
+    assert hash_table[19] == "19"
+
+
+# Cuckoo borra dejando la ranura vacía, sin marcadores.
+@patch("builtins.hash", return_value=24)
+def test_should_not_leave_deleted_with_cuckoo(mock_hash):
+    hash_table = HashTable(capacity=100, probing="cuckoo")
+    hash_table["hola"] = "hello"
+    hash_table[98.6] = 37
+    hash_table[False] = True
+
+    del hash_table["hola"]
+
+    assert DELETED not in hash_table._slots
+    assert hash_table._slots.count(None) == 98
+    assert hash_table[98.6] == 37
+    assert hash_table[False] is True
+
+
+# El sondeo perturbado recorre todas las ranuras aunque la capacidad no
+# sea potencia de dos.
+def test_should_visit_every_slot_with_perturbed_probing():
+    hash_table = HashTable(capacity=100, probing="perturbed")
+    for hash_value in (0, 24, -1, 2**61 - 1):
+        assert set(hash_table._probe(hash_value)) == set(range(100))
+
+
+# from_dict dimensiona la tabla de antemano y carga las entradas en una
+# sola pasada: un hash por clave y ninguna redimensión.
+def test_should_presize_from_dict(counting_key):
+    dictionary = {counting_key(i): i for i in range(1000)}
+    counting_key.hash_calls = 0
+
+    with patch.object(HashTable, "_make_room") as make_room:
+        hash_table = HashTable.from_dict(dictionary)
+
+    make_room.assert_not_called()
+    assert counting_key.hash_calls == 1000
+    assert counting_key.eq_calls == 0
+    assert len(hash_table) == 1000
+    assert hash_table.load_factor <= hash_table.max_load_factor
+    assert list(hash_table.values) == list(range(1000))
+
+
+# from_dict acepta diccionarios vacíos y opciones del constructor.
+def test_should_create_hashtable_from_empty_dict_with_options():
+    hash_table = HashTable.from_dict({}, probing="robinhood")
+    assert len(hash_table) == 0
+    assert hash_table.probing == "robinhood"
+
+
+# Una capacidad explícita demasiado pequeña se amplía a la necesaria.
+def test_should_not_create_too_small_hashtable_from_dict():
+    hash_table = HashTable.from_dict({i: i for i in range(10)}, capacity=2)
+    assert hash_table.load_factor <= hash_table.max_load_factor
+
+
+# from_items carga un iterable de pares; el último valor de una clave
+# repetida gana.
+def test_should_create_hashtable_from_items():
+    hash_table = HashTable.from_items([("a", 1), ("b", 2), ("a", 3)])
+    assert dict(hash_table.pairs) == {"a": 3, "b": 2}
+    assert list(hash_table) == ["a", "b"]
+
+
+# Con size_hint, from_items no redimensiona aunque reciba un generador.
+def test_should_presize_from_items_with_size_hint():
+    items = ((i, str(i)) for i in range(1000))
+    with patch.object(HashTable, "_make_room") as make_room:
+        hash_table = HashTable.from_items(items, size_hint=1000)
+    make_room.assert_not_called()
+    assert len(hash_table) == 1000
+
+
+# update acepta dicts, HashTables e iterables de pares.
+@pytest.mark.parametrize("other", [
+    {"hola": "hallo", "gracias": "thank you"},
+    HashTable.from_dict({"hola": "hallo", "gracias": "thank you"}),
+    [("hola", "hallo"), ("gracias", "thank you")],
+])
+def test_should_update_from_mapping_or_iterable(hash_table, other):
+    hash_table.update(other)
+    assert dict(hash_table.pairs) == {
+        "hola": "hallo",
+        98.6: 37,
+        False: True,
+        "gracias": "thank you",
+    }
+
+
+# update redimensiona como mucho una vez y reutiliza los hashes
+# almacenados en otra HashTable.
+def test_should_update_with_single_resize(counting_key):
+    other = HashTable.from_dict({counting_key(i): i for i in range(1000)})
+    hash_table = HashTable()
+    counting_key.hash_calls = 0
+
+    with patch.object(
+        HashTable, "_resize_and_rehash", autospec=True,
+        side_effect=HashTable._resize_and_rehash,
+    ) as resize:
+        hash_table.update(other)
+
+    assert resize.call_count == 1
+    assert counting_key.hash_calls == 0
+    assert len(hash_table) == 1000
+
+
+# Las ranuras DELETED_INDEX de los huecos que popitem recorta siguen
+# contando para el factor de carga: insertar y sacar pares en bucle no
+# llena la tabla de marcadores.
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_should_not_fill_with_tombstones_on_popitem_churn(probing):
+    hash_table = HashTable(capacity=300, probing=probing)
+    for key in range(0, 60000, 2):
+        hash_table[key] = key
+        hash_table[key + 1] = key
+        hash_table.popitem()
+        hash_table.popitem()
+        assert hash_table.load_factor <= hash_table.max_load_factor
+
+    assert len(hash_table) == 0
+    assert EMPTY_INDEX in hash_table._indices
+
+
+# setdefault, pop y popitem se comportan como los de dict.
+def test_should_setdefault_pop_and_popitem(hash_table):
+    assert hash_table.setdefault("hola", "other") == "hello"
+    assert hash_table.setdefault("gracias") is None
+    assert hash_table.pop("gracias") is None
+    assert hash_table.pop("gracias", "default") == "default"
+    with pytest.raises(KeyError):
+        hash_table.pop("gracias")
+
+    assert hash_table.popitem() == (False, True)
+    assert hash_table.popitem() == (98.6, 37)
+    hash_table["adiós"] = "bye"
+    assert hash_table.popitem() == ("adiós", "bye")
+    assert hash_table.popitem() == ("hola", "hello")
+    assert len(hash_table) == 0
+    with pytest.raises(KeyError):
+        hash_table.popitem()
+
+
+# update_with guarda el resultado de la función e increment suma al
+# valor actual, empezando en default y en 0 si la clave falta.
+def test_should_update_with_and_increment(hash_table):
+    assert hash_table.update_with("hola", str.upper) == "HELLO"
+    assert hash_table.update_with("list", lambda items: items + [1], []) == [1]
+    assert hash_table.increment(98.6) == 38
+    assert hash_table.increment("counter", 5) == 5
+    assert hash_table.increment("counter", -2) == 3
+    assert hash_table.increment("total", 0.5) == 0.5
+
+    assert dict(hash_table.items_view()) == {
+        "hola": "HELLO",
+        98.6: 38,
+        False: True,
+        "list": [1],
+        "counter": 3,
+        "total": 0.5,
+    }
+
+
+# Cada operación llama a hash() una vez y sondea la tabla una sola vez,
+# tanto si la clave está como si no.
+@pytest.mark.parametrize("operation", [
+    lambda table, key: table.setdefault(key, 0),
+    lambda table, key: table.pop(key, None),
+    lambda table, key: table.update_with(key, lambda value: value, 0),
+    lambda table, key: table.increment(key),
+])
+@pytest.mark.parametrize("present", [False, True])
+def test_should_probe_once(counting_key, operation, present):
+    hash_table = HashTable.from_dict({counting_key(i): i for i in range(10)})
+    key = counting_key(5 if present else 50)
+    counting_key.hash_calls = 0
+
+    with patch.object(
+        HashTable, "_lookup", autospec=True, side_effect=HashTable._lookup,
+    ) as lookup:
+        operation(hash_table, key)
+
+    assert lookup.call_count == 1
+    assert counting_key.hash_calls == 1
+
+
+# Con cualquier estrategia, durante redimensionados incrementales y con
+# huella, las operaciones se comportan como las de dict y mantienen la
+# huella.
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_should_upsert_like_dict(probing):
+    rng = random.Random(probing)
+    hash_table = HashTable(
+        capacity=4, min_load_factor=0.1, probing=probing, incremental_resize=True
+    )
+    hash_table.enable_fingerprint()
+    expected = {}
+    for _ in range(3000):
+        key = rng.randrange(200)
+        operation = rng.randrange(5)
+        if operation == 0:
+            value = expected.setdefault(key, key)
+            assert hash_table.setdefault(key, key) == value
+        elif operation == 1:
+            assert hash_table.pop(key, None) == expected.pop(key, None)
+        elif operation == 2 and expected:
+            assert hash_table.popitem() == expected.popitem()
+        elif operation == 3:
+            expected[key] = expected.get(key, 0) + 2
+            assert hash_table.increment(key, 2) == expected[key]
+        else:
+            expected[key] = -expected.get(key, 1)
+            assert hash_table.update_with(key, lambda value: -value, 1) == (
+                expected[key]
+            )
+        assert len(hash_table) == len(expected)
+
+    assert list(hash_table) == list(expected)
+    fresh = HashTable.from_dict(expected)
+    fresh.enable_fingerprint()
+    assert hash_table.fingerprint == fresh.fingerprint
+
+
+# Si la función de update_with cambia la tabla, el resultado se guarda
+# igualmente en la clave.
+def test_should_update_with_function_that_mutates_table():
+    hash_table = HashTable(capacity=4, incremental_resize=True)
+
+    def grow(value):
+        for i in range(100):
+            hash_table[i] = i
+        return value + 1
+
+    assert hash_table.update_with("counter", grow, 0) == 1
+    assert hash_table.update_with("counter", grow, 0) == 2
+    assert hash_table["counter"] == 2
+    assert len(hash_table) == 101
+
+
+# copy preserva la configuración y el orden, y es independiente.
+def test_should_copy_configuration_and_storage():
+    hash_table = HashTable(capacity=16, max_load_factor=0.5, probing="perturbed")
+    for key in "abcde":
+        hash_table[key] = key
+    del hash_table["b"]
+
+    copy = hash_table.copy()
+    copy["f"] = "f"
+    del copy["a"]
+
+    assert copy.probing == "perturbed"
+    assert copy.max_load_factor == 0.5
+    assert list(hash_table) == ["a", "c", "d", "e"]
+    assert list(copy) == ["c", "d", "e", "f"]
+
+
+# copy no vuelve a calcular hashes ni inserta las claves.
+def test_should_copy_without_rehashing(counting_key):
+    hash_table = HashTable.from_dict({counting_key(i): i for i in range(100)})
+    counting_key.hash_calls = 0
+    assert len(hash_table.copy()) == 100
+    assert counting_key.hash_calls == 0
+
+
+# Escribe la tabla con dump() y la vuelve a leer con load().
+def dump_and_load(hash_table):
+    file = io.BytesIO()
+    hash_table.dump(file)
+    file.seek(0)
+    return HashTable.load(file)
+
+
+# dump/load conserva pares, orden, capacidad y el array de índices con
+# cualquier tipo de claves y valores (binario en bloque o pickle).
+@pytest.mark.parametrize(
+    "keys",
+    [
+        ["hola", "adiós", "", "\udc80"],
+        [b"hola", b"", b"\x00\xff"],
+        [0, -1, 2**40, -(2**63)],
+        [2**70, 1],
+        ["hola", 98.6, False, (1, 2)],
+    ],
+)
+def test_should_dump_and_load(keys):
+    hash_table = HashTable(probing="perturbed")
+    for i, key in enumerate(keys):
+        hash_table[key] = keys[-1 - i]
+
+    loaded = dump_and_load(hash_table)
+
+    assert loaded == hash_table
+    assert list(loaded) == list(hash_table)
+    assert loaded.capacity == hash_table.capacity
+    assert loaded.probing == "perturbed"
+    assert loaded._slots == hash_table._slots
+
+
+# La instantánea conserva los huecos de los borrados y la configuración.
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_should_dump_and_load_deleted_entries(probing):
+    hash_table = HashTable(capacity=16, max_load_factor=0.5, probing=probing)
+    for key in "abcde":
+        hash_table[key] = key
+    del hash_table["b"]
+    del hash_table["d"]
+
+    loaded = dump_and_load(hash_table)
+    assert loaded._slots == hash_table._slots
+    loaded["f"] = "f"
+
+    assert loaded.max_load_factor == 0.5
+    assert list(loaded) == ["a", "c", "e", "f"]
+    assert len(loaded) == 4
+
+
+# load reutiliza el array de índices sin volver a insertar las claves. El
+# hash de las que no son str, bytes ni int puede cambiar entre procesos,
+# así que se recalcula una vez por clave para comprobarlo.
+def test_should_load_without_rehashing(counting_key):
+    hash_table = HashTable.from_dict({counting_key(i): i for i in range(100)})
+    counting_key.hash_calls = 0
+
+    loaded = dump_and_load(hash_table)
+
+    assert counting_key.hash_calls == 100
+    assert counting_key.eq_calls == 0
+    assert loaded._indices == hash_table._indices
+    assert loaded[counting_key(42)] == 42
+
+
+# Si el hash de una clave cambia (uno que depende de la identidad del
+# objeto, en otro proceso), load reconstruye la tabla.
+def test_should_rehash_keys_with_changed_hash(counting_key):
+    hash_table = HashTable.from_dict({counting_key(i): i for i in range(100)})
+    file = io.BytesIO()
+    hash_table.dump(file)
+    file.seek(0)
+    with patch.object(counting_key, "__hash__", lambda key: key.value + 1000):
+        loaded = HashTable.load(file)
+
+        assert loaded._hashes.tolist() == list(range(1000, 1100))
+        assert all(loaded[counting_key(i)] == i for i in range(100))
+
+
+# En otro proceso con la misma semilla de str, las claves con hash por
+# identidad (clases, funciones, object()) se siguen encontrando.
+def test_should_load_identity_hashed_keys_in_other_process(tmp_path):
+    path = tmp_path / "table.bin"
+    dump = (
+        "import sys; from hashtable import HashTable\n"
+        "table = HashTable.from_dict({int: 1, len: 2, 'a': 3, 4: 4})\n"
+        "with open(sys.argv[1], 'wb') as file: table.dump(file)\n"
+    )
+    load = (
+        "import sys; from hashtable import HashTable\n"
+        "with open(sys.argv[1], 'rb') as file: table = HashTable.load(file)\n"
+        "print(table[int], table[len], table['a'], table[4], len(table))\n"
+    )
+    env = {**os.environ, "PYTHONHASHSEED": "0"}
+    for code in (dump, load):
+        result = subprocess.run(
+            [sys.executable, "-c", code, str(path)],
+            capture_output=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(hashtable_module.__file__)),
+            env=env,
+            text=True,
+        )
+
+    assert result.stdout.split() == ["1", "2", "3", "4", "4"]
+
+
+# Con otra semilla de hash (otro proceso), load recalcula los hashes.
+def test_should_rehash_snapshot_from_other_hash_seed(monkeypatch):
+    hash_table = HashTable.from_dict({f"key{i}": i for i in range(100)})
+    file = io.BytesIO()
+    hash_table.dump(file)
+    monkeypatch.setattr(hashtable_module, "_SNAPSHOT_HASH_PROBE", "other")
+    hashes = iter(range(10**6, 2 * 10**6))
+    with patch("builtins.hash", side_effect=lambda key: next(hashes)):
+        file.seek(0)
+        loaded = HashTable.load(file)
+
+    assert loaded._hashes.tolist() == list(range(10**6 + 1, 10**6 + 101))
+    assert loaded.pairs == hash_table.pairs
+
+
+# load rechaza datos que no son una instantánea.
+def test_should_not_load_other_data():
+    with pytest.raises(ValueError):
+        HashTable.load(io.BytesIO(b"not a snapshot"))
+
+
+# pickle usa la instantánea binaria; copy.copy es superficial y
+# copy.deepcopy copia también los valores.
+def test_should_pickle_and_copy(hash_table):
+    value = []
+    hash_table["list"] = value
+    del hash_table[98.6]
+
+    assert list(pickle.loads(pickle.dumps(hash_table))) == list(hash_table)
+    assert copy.copy(hash_table)["list"] is value
+    deep = copy.deepcopy(hash_table)
+    assert list(deep) == list(hash_table)
+    assert deep["list"] == value
+    assert deep["list"] is not value
+    assert deep._keys[1] is DELETED
+
+
+# Las claves copiadas por deepcopy con hash por identidad (y los valores,
+# en la huella) tienen otro hash: la copia se reconstruye con los nuevos.
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_should_deepcopy_identity_hashed_keys(probing):
+    class Key:
+        pass
+
+    hash_table = HashTable(probing=probing)
+    for i in range(50):
+        hash_table[Key()] = Key()
+    hash_table["hola"] = "hello"
+    del hash_table["hola"]
+    hash_table.enable_fingerprint()
+
+    deep = copy.deepcopy(hash_table)
+
+    assert len(deep) == 50
+    assert all(key in deep for key in deep)
+    assert all(key not in deep for key in hash_table)
+    rebuilt = HashTable.from_items(deep.items_view())
+    rebuilt.enable_fingerprint()
+    assert deep.fingerprint == rebuilt.fingerprint
+
+
+# Las vistas iteran el almacenamiento sin construir pairs, keys ni values.
+def test_should_iterate_views_lazily(hash_table):
+    failing = property(lambda self: 1 / 0)
+    with patch.object(HashTable, "pairs", failing), \
+            patch.object(HashTable, "keys", failing), \
+            patch.object(HashTable, "values", failing):
+        assert list(hash_table) == ["hola", 98.6, False]
+        assert list(hash_table.keys_view()) == ["hola", 98.6, False]
+        assert list(hash_table.values_view()) == ["hello", 37, True]
+        assert list(hash_table.items_view()) == [
+            ("hola", "hello"),
+            (98.6, 37),
+            (False, True),
+        ]
+
+
+# Las vistas admiten len() e in sin copiar.
+def test_should_support_len_and_in_on_views(hash_table):
+    assert len(hash_table.keys_view()) == 3
+    assert len(hash_table.values_view()) == 3
+    assert len(hash_table.items_view()) == 3
+    assert "hola" in hash_table.keys_view()
+    assert "missing_key" not in hash_table.keys_view()
+    assert 37 in hash_table.values_view()
+    assert ("hola", "hello") in hash_table.items_view()
+    assert ("hola", "hallo") not in hash_table.items_view()
+
+
+# Las vistas de claves y pares admiten operaciones de conjuntos.
+def test_should_support_set_operations_on_views(hash_table):
+    keys = hash_table.keys_view()
+    assert keys & {"hola", "missing_key"} == {"hola"}
+    assert keys | {"gracias"} == {"hola", 98.6, False, "gracias"}
+    assert keys - {"hola"} == {98.6, False}
+    assert keys <= {"hola", 98.6, False, "gracias"}
+    assert keys.isdisjoint({"missing_key"})
+    assert hash_table.items_view() == {("hola", "hello"), (98.6, 37), (False, True)}
+
+
+# Las vistas son vivas: reflejan cambios posteriores de la tabla.
+def test_should_reflect_changes_in_views(hash_table):
+    keys = hash_table.keys_view()
+    values = hash_table.values_view()
+    del hash_table["hola"]
+    hash_table["gracias"] = "thank you"
+
+    assert list(keys) == [98.6, False, "gracias"]
+    assert list(values) == [37, True, "thank you"]
+
+
+# Cambiar el tamaño de la tabla durante la iteración lanza RuntimeError.
+@pytest.mark.parametrize("mutate", [
+    lambda table: table.__setitem__("gracias", "thank you"),
+    lambda table: table.__delitem__(98.6),
+])
+@pytest.mark.parametrize("iterate", [
+    iter,
+    lambda table: iter(table.values_view()),
+    lambda table: iter(table.items_view()),
+])
+def test_should_raise_on_mutation_during_iteration(hash_table, iterate, mutate):
+    iterator = iterate(hash_table)
+    next(iterator)
+    mutate(hash_table)
+    with pytest.raises(RuntimeError):
+        next(iterator)
+
+
+# Actualizar valores durante la iteración está permitido, como en dict.
+def test_should_allow_value_updates_during_iteration(hash_table):
+    for key in hash_table:
+        hash_table[key] = str(key)
+    assert hash_table.values == ["hola", "98.6", "False"]
+
+
+# Con redimensionado incremental la inserción que dispara el crecimiento
+# solo migra unas pocas entradas; el resto se migra en las siguientes
+# operaciones.
+def test_should_resize_incrementally():
+    hash_table = HashTable(capacity=128, incremental_resize=True)
+    for i in range(85):
+        hash_table[i] = i
+    assert hash_table._old is None
+
+    hash_table[85] = 85
+
+    assert hash_table.capacity == 256
+    assert hash_table._old is not None
+    assert hash_table._migrated <= INCREMENTAL_REHASH_STEP
+
+    for i in range(86):
+        assert hash_table[i] == i
+
+    assert hash_table._old is None
+    assert len(hash_table) == 86
+
+
+# Durante la migración se pueden leer, actualizar y borrar claves que
+# siguen en la tabla antigua, y el orden de inserción se conserva.
+def test_should_access_old_table_during_incremental_resize():
+    hash_table = HashTable(capacity=128, incremental_resize=True)
+    for i in range(86):
+        hash_table[i] = i
+    assert hash_table._old is not None
+
+    hash_table[80] = "updated"
+    del hash_table[81]
+    hash_table["new"] = "new"
+
+    assert hash_table[80] == "updated"
+    assert 81 not in hash_table
+    assert len(hash_table) == 86
+    assert list(hash_table) == [i for i in range(86) if i != 81] + ["new"]
+    assert hash_table._old is None
+    assert hash_table[80] == "updated"
+    with pytest.raises(KeyError):
+        hash_table[81]
+
+
+# El modo incremental se comporta como un dict con cualquier estrategia.
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_should_behave_like_dict_with_incremental_resize(probing):
+    rng = random.Random(probing)
+    hash_table = HashTable(
+        capacity=4,
+        min_load_factor=0.1,
+        probing=probing,
+        incremental_resize=True,
+    )
+    expected = {}
+    for _ in range(5000):
+        key = rng.randrange(300)
+        action = rng.random()
+        if action < 0.5:
+            hash_table[key] = expected[key] = rng.random()
+        elif action < 0.8:
+            assert hash_table.get(key) == expected.get(key)
+        elif key in expected:
+            del hash_table[key]
+            del expected[key]
+        else:
+            with pytest.raises(KeyError):
+                del hash_table[key]
+        assert len(hash_table) == len(expected)
+    assert dict(hash_table.pairs) == expected
+
+
+# Un borrado que encoge la tabla durante un redimensionado incremental
+# de crecimiento termina antes el que estaba en curso, sin perder las
+# entradas que quedaban por migrar.
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_should_shrink_during_incremental_growth(probing):
+    hash_table = HashTable(
+        capacity=4096,
+        max_load_factor=1,
+        min_load_factor=0.49,
+        probing=probing,
+        incremental_resize=True,
+    )
+    for i in range(4097):
+        hash_table[i] = i
+    deleted = 0
+    while hash_table.capacity != 4096:
+        del hash_table[deleted]
+        deleted += 1
+
+    assert len(hash_table) == 4097 - deleted
+    assert all(hash_table[i] == i for i in range(deleted, 4097))
+    assert dict(hash_table.pairs) == {i: i for i in range(deleted, 4097)}
+
+
+# Sin enable_stats() la tabla no cambia de clase y solo hay métricas
+# estructurales.
+def test_should_report_structural_stats_without_recording(hash_table):
+    del hash_table["hola"]
+    stats = hash_table.stats()
+
+    assert type(hash_table) is HashTable
+    assert stats.size == 2
+    assert stats.capacity == 100
+    assert stats.tombstones == 1
+    assert stats.load_factor == hash_table.load_factor
+    assert stats.hit_probe_lengths == {}
+    assert stats.resizes == 0
+
+
+# Los histogramas de sondeo distinguen aciertos y fallos.
+@patch("builtins.hash", return_value=24)
+def test_should_record_probe_lengths(mock_hash):
+    hash_table = HashTable(capacity=100)
+    hash_table.enable_stats()
+    hash_table["hola"] = "hello"
+    hash_table[98.6] = 37
+    hash_table[False] = True
+
+    assert hash_table[False] is True
+    assert "missing_key" not in hash_table
+    stats = hash_table.stats()
+
+    assert stats.hit_probe_lengths == {3: 1}
+    assert stats.miss_probe_lengths == {1: 1, 2: 1, 3: 1, 4: 1}
+    assert stats.longest_cluster == 3
+
+
+# La racha más larga tiene en cuenta la vuelta al principio de la tabla.
+@patch("builtins.hash", side_effect=[3, 3, 3])
+def test_should_measure_wrapped_cluster(mock_hash):
+    hash_table = HashTable(capacity=5, max_load_factor=1)
+    for key in "abc":
+        hash_table[key] = key
+
+    assert [slot is None for slot in hash_table._slots] == [
+        False, True, True, False, False
+    ]
+    assert hash_table.stats().longest_cluster == 3
+
+
+# Cada redimensionado se cuenta, se cronometra y avisa al callback.
+@pytest.mark.parametrize("incremental_resize", [False, True])
+def test_should_record_resizes(incremental_resize):
+    events = []
+    hash_table = HashTable(capacity=4, incremental_resize=incremental_resize)
+    hash_table.enable_stats(on_resize=events.append)
+    for i in range(20):
+        hash_table[i] = i
+
+    stats = hash_table.stats()
+    assert stats.resizes == len(events) == 3
+    assert stats.resize_seconds >= sum(event.seconds for event in events)
+    assert events[0] == ResizeEvent(4, 8, 2, events[0].seconds)
+    assert [event.new_capacity for event in events] == [8, 16, 32]
+
+
+# Con las métricas activadas la tabla se comporta igual: es igual a una
+# sin ellas, sus copias no están instrumentadas y se pueden desactivar.
+def test_should_enable_and_disable_stats(hash_table):
+    other = hash_table.copy()
+    hash_table.enable_stats()
+
+    assert hash_table == other and other == hash_table
+    assert repr(hash_table) == repr(other)
+    copy_ = hash_table.copy()
+    assert copy_.stats().hit_probe_lengths == {}
+    assert type(copy_) is HashTable
+    assert list(pickle.loads(pickle.dumps(hash_table))) == list(hash_table)
+
+    hash_table.disable_stats()
+    assert type(hash_table) is HashTable
+    assert hash_table.stats().resizes == 0
+
+
+# Una instantánea conserva el contenido del momento en que se tomó aunque
+# la tabla se actualice, borre, inserte, vacíe con popitem y redimensione
+# después, con todas las estrategias de sondeo.
+@pytest.mark.parametrize("incremental_resize", [False, True])
+@pytest.mark.parametrize("probing", PROBING_STRATEGIES)
+def test_snapshot_should_not_see_later_writes(probing, incremental_resize):
+    size = 3 * SNAPSHOT_BLOCK_SIZE
+    hash_table = HashTable(
+        probing=probing, incremental_resize=incremental_resize
+    )
+    for i in range(size):
+        hash_table[i] = i
+    expected = {i: i for i in range(size)}
+    snapshot = hash_table.snapshot()
+
+    for i in range(0, size, 7):
+        hash_table[i] = -i
+    for i in range(1, size, 5):
+        del hash_table[i]
+    hash_table.increment(2)
+    hash_table.update_with(4, str)
+    for _ in range(10):
+        hash_table.popitem()
+    for i in range(size, 2 * size):
+        hash_table[i] = i
+
+    assert dict(snapshot.items_view()) == expected
+    assert list(snapshot) == list(expected)
+    assert all(snapshot[i] == i for i in range(size))
+    assert size not in snapshot
+    assert snapshot == HashTable.from_dict(expected)
+    assert hash_table[0] == 0 and 1 not in hash_table
+
+
+# Varias instantáneas sucesivas ven cada una su propio estado.
+def test_snapshots_should_be_independent():
+    hash_table = HashTable.from_dict({"a": 1})
+    first = hash_table.snapshot()
+    hash_table["a"] = 2
+    second = hash_table.snapshot()
+    hash_table["a"] = 3
+
+    assert (first["a"], second["a"], hash_table["a"]) == (1, 2, 3)
+
+
+# Tomar la instantánea no copia el almacenamiento: comparte las columnas
+# y solo copia los bloques que la tabla modifica después.
+def test_snapshot_should_share_unmodified_blocks():
+    hash_table = HashTable.from_dict(
+        {i: i for i in range(4 * SNAPSHOT_BLOCK_SIZE)}
+    )
+    snapshot = hash_table.snapshot()
+
+    assert snapshot._values._column is hash_table._values
+    assert snapshot._values._blocks == {}
+    hash_table[0] = "x"
+    assert list(snapshot._values._blocks) == [0]
+    assert snapshot._keys._blocks == snapshot._indices._blocks == {}
+
+
+# Las instantáneas son de solo lectura.
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda table: table.__setitem__("hola", 1),
+        lambda table: table.__delitem__("hola"),
+        lambda table: table.update({"x": 1}),
+        lambda table: table.setdefault("x"),
+        lambda table: table.pop("hola"),
+        lambda table: table.popitem(),
+        lambda table: table.update_with("hola", str),
+        lambda table: table.increment(98.6),
+        lambda table: table.enable_fingerprint(),
+        lambda table: table.enable_stats(),
+    ],
+)
+def test_snapshot_should_be_read_only(hash_table, write):
+    snapshot = hash_table.snapshot()
+
+    with pytest.raises(TypeError):
+        write(snapshot)
+    assert snapshot == hash_table
+
+
+# copy(), pickle y repr convierten la instantánea en una HashTable normal
+# e independiente.
+def test_should_copy_and_pickle_snapshot(hash_table):
+    snapshot = hash_table.snapshot()
+    hash_table["hola"] = "adiós"
+
+    copy_ = snapshot.copy()
+    assert type(copy_) is HashTable
+    copy_["nuevo"] = 1
+    assert "nuevo" not in snapshot
+    assert copy_.capacity == snapshot.capacity == hash_table.capacity
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert type(restored) is HashTable and restored == snapshot
+    assert copy.deepcopy(snapshot) == snapshot
+    assert eval(repr(snapshot)) == snapshot
+    assert snapshot.snapshot() is snapshot
+    assert snapshot["hola"] == "hello"
+    assert snapshot != hash_table
+
+
+# Si popitem acorta las columnas compartidas en más de un bloque, copy(),
+# dump() y pickle de la instantánea siguen teniendo todas sus entradas.
+def test_should_materialize_snapshot_after_popitem():
+    size = 3 * SNAPSHOT_BLOCK_SIZE
+    expected = {i: i for i in range(size)}
+    hash_table = HashTable.from_dict(expected)
+    snapshot = hash_table.snapshot()
+    for _ in range(size - SNAPSHOT_BLOCK_SIZE // 2):
+        hash_table.popitem()
+    hash_table["nuevo"] = 1
+
+    file = io.BytesIO()
+    snapshot.dump(file)
+    file.seek(0)
+    for clone in (
+        snapshot.copy(),
+        HashTable.load(file),
+        pickle.loads(pickle.dumps(snapshot)),
+    ):
+        assert len(clone._keys) == size
+        assert dict(clone.items_view()) == expected
+        assert all(clone[key] == key for key in expected)
+
+
+# Las instantáneas descartadas no se siguen actualizando.
+def test_discarded_snapshots_should_be_forgotten(hash_table):
+    for _ in range(10):
+        hash_table.snapshot()
+    snapshot = hash_table.snapshot()
+
+    assert isinstance(snapshot, HashTableSnapshot)
+    assert sum(map(len, hash_table._snapshots.values())) == 4
@@ -0,0 +1,138 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from int_hashtable import SCALAR_FALLBACK_SIZE, IntHashTable  # noqa: E402
+
+
+# Fixture con una tabla de 3 entradas de ejemplo.
+@pytest.fixture
+def hash_table():
+    sample_data = IntHashTable()
+    sample_data[1] = 10
+    sample_data[-5] = 50
+    sample_data[2**62] = 62
+    return sample_data
+
+
+# La capacidad se redondea a potencia de dos.
+def test_should_round_capacity_to_power_of_two():
+    assert IntHashTable(capacity=10).capacity == 16
+    with pytest.raises(ValueError):
+        IntHashTable(capacity=0)
+
+
+# El interfaz de mapping funciona con claves sueltas.
+def test_should_insert_get_and_delete(hash_table):
+    assert len(hash_table) == 3
+    assert hash_table[1] == 10
+    assert hash_table[np.int32(-5)] == 50
+    assert hash_table.get(7, "default") == "default"
+    assert 2**62 in hash_table
+    assert "1" not in hash_table
+
+    hash_table[1] = 11
+    del hash_table[-5]
+
+    assert hash_table[1] == 11
+    assert -5 not in hash_table
+    with pytest.raises(KeyError):
+        hash_table[-5]
+    with pytest.raises(KeyError):
+        del hash_table[-5]
+    assert hash_table.pairs == {(1, 11), (2**62, 62)}
+    assert hash_table.keys == {1, 2**62}
+    assert sorted(hash_table.values) == [11, 62]
+    assert hash_table == IntHashTable.from_arrays([1, 2**62], [11, 62])
+
+
+# Solo se admiten claves enteras de 64 bits.
+@pytest.mark.parametrize(
+    "key, error",
+    [
+        ("1", TypeError),
+        (1.0, TypeError),
+        (True, TypeError),
+        (2**63, OverflowError),
+    ],
+)
+def test_should_reject_invalid_keys(hash_table, key, error):
+    with pytest.raises(error):
+        hash_table[key] = 1
+    with pytest.raises(error):
+        hash_table.put_many([key], [1])
+
+
+# Las operaciones por lotes equivalen a las de claves sueltas.
+def test_should_get_put_and_check_many(hash_table):
+    hash_table.put_many(np.array([1, 3, 4]), np.array([100, 300, 400]))
+
+    result = hash_table.get_many([1, -5, 3, 4, 9], default=-1)
+
+    assert result.tolist() == [100, 50, 300, 400, -1]
+    assert hash_table.contains_many([9, 2**62]).tolist() == [False, True]
+    assert len(hash_table) == 5
+    assert hash_table.get_many([]).tolist() == []
+
+
+# Si una clave se repite en el lote gana el último valor.
+def test_should_keep_last_duplicate_in_batch():
+    hash_table = IntHashTable()
+    hash_table.put_many([7, 8, 7, 7], [1, 2, 3, 4])
+
+    assert len(hash_table) == 2
+    assert hash_table[7] == 4
+
+
+# values admite un escalar y otros tipos de ancho fijo.
+def test_should_put_scalar_and_float_values():
+    hash_table = IntHashTable(value_dtype=np.float64)
+    hash_table.put_many(range(100), 0.5)
+
+    assert hash_table.value_dtype == np.float64
+    assert hash_table.get_many([0, 99, 100], default=np.nan)[:2].tolist() == [
+        0.5,
+        0.5,
+    ]
+
+
+# Con muchas claves la tabla crece y se comporta como un dict, también
+# con claves que colisionan y borrados de por medio.
+def test_should_behave_like_dict_in_batches():
+    rng = random.Random(0)
+    hash_table = IntHashTable()
+    expected = {}
+    for _ in range(20):
+        keys = [rng.randrange(-5000, 5000) for _ in range(500)]
+        values = [rng.randrange(10**9) for _ in keys]
+        hash_table.put_many(keys, values)
+        expected.update(zip(keys, values))
+        for key in rng.sample(sorted(expected), 100):
+            del hash_table[key]
+            del expected[key]
+    queries = list(range(-6000, 6000))
+
+    result = hash_table.get_many(queries, default=-1)
+
+    assert result.tolist() == [expected.get(key, -1) for key in queries]
+    assert len(hash_table) == len(expected)
+    assert hash_table.load_factor <= 2 / 3
+
+
+# Las cadenas de colisión largas se terminan por el camino escalar.
+def test_should_resolve_long_collision_chains(monkeypatch):
+    import int_hashtable
+
+    monkeypatch.setattr(
+        int_hashtable,
+        "_mix_array",
+        lambda keys: np.zeros(len(keys), dtype=np.uint64),
+    )
+    monkeypatch.setattr(int_hashtable, "_mix", lambda key: 0)
+    keys = np.arange(4 * SCALAR_FALLBACK_SIZE)
+    hash_table = IntHashTable.from_arrays(keys, keys * 2)
+
+    assert hash_table.get_many(keys).tolist() == (keys * 2).tolist()
+    assert hash_table[5] == 10
@@ -0,0 +1,152 @@
+import multiprocessing
+import pickle
+import time
+
+import pytest
+
+import shared_hashtable
+from codec import decode, encode, stable_hash
+from hashtable import HashTable
+from shared_hashtable import SharedHashTable
+
+
+# Fixture con una tabla compartida de 3 entradas de ejemplo que se destruye
+# al terminar el test.
+@pytest.fixture
+def hash_table():
+    sample_data = SharedHashTable.create(
+        {"hola": "hello", 98.6: 37, False: True}
+    )
+    yield sample_data
+    sample_data.close()
+    sample_data.unlink()
+
+
+# Búsqueda desde otro proceso, que recibe la tabla por su nombre.
+def lookup(hash_table, key):
+    return hash_table.get(key)
+
+
+# encode y decode conservan str, bytes, int y cualquier objeto serializable.
+@pytest.mark.parametrize(
+    "value", ["hola", "", b"\x00\xff", 0, -1, 255, -(2**80), 98.6, (1, "a")]
+)
+def test_should_encode_and_decode(value):
+    assert decode(encode(value)) == value
+    assert decode(memoryview(encode(value))) == value
+
+
+# El hash estable no depende del proceso.
+def test_should_hash_stably():
+    assert stable_hash(encode("hola")) == stable_hash(encode("hola"))
+    assert stable_hash(encode("hola")) != stable_hash(encode("hello"))
+    assert 0 <= stable_hash(encode("hola")) < 2**64
+
+
+# Operaciones de lectura sobre una tabla creada desde un diccionario.
+def test_should_create_from_mapping(hash_table):
+    assert len(hash_table) == 3
+    assert hash_table["hola"] == "hello"
+    assert hash_table[98.6] == 37
+    assert hash_table.get("missing_key", "default") == "default"
+    assert False in hash_table
+    with pytest.raises(KeyError):
+        hash_table["missing_key"]
+    assert hash_table.pairs == {("hola", "hello"), (98.6, 37), (False, True)}
+    assert hash_table.keys == {"hola", 98.6, False}
+    assert hash_table.to_hashtable() == HashTable.from_dict(
+        {"hola": "hello", 98.6: 37, False: True}
+    )
+
+
+# Un lector adjunto ve las escrituras del escritor, pero no puede escribir.
+def test_should_share_writes_with_attached_readers(hash_table):
+    with SharedHashTable.attach(hash_table.name) as reader:
+        hash_table["hola"] = "hi"
+        hash_table["gracias"] = "thank you"
+        del hash_table[98.6]
+
+        assert reader["hola"] == "hi"
+        assert reader["gracias"] == "thank you"
+        assert 98.6 not in reader
+        assert len(reader) == 3
+        with pytest.raises(TypeError):
+            reader["hola"] = "hello"
+        with pytest.raises(TypeError):
+            del reader["hola"]
+
+
+# Las claves borradas liberan su bucket para nuevas inserciones.
+def test_should_reuse_deleted_buckets():
+    hash_table = SharedHashTable.create(capacity=8, arena_size=4096)
+    try:
+        for i in range(100):
+            hash_table[i] = i
+            del hash_table[i]
+        assert len(hash_table) == 0
+    finally:
+        hash_table.unlink()
+
+
+# Una tabla llena lanza OverflowError y resized() crea otra mayor.
+def test_should_raise_when_full():
+    hash_table = SharedHashTable.create(capacity=4, arena_size=4096)
+    try:
+        hash_table[1] = 1
+        hash_table[2] = 2
+        with pytest.raises(OverflowError):
+            hash_table[3] = 3
+        bigger = hash_table.resized()
+        try:
+            bigger[3] = 3
+            assert bigger.pairs == {(1, 1), (2, 2), (3, 3)}
+        finally:
+            bigger.unlink()
+    finally:
+        hash_table.unlink()
+
+
+# Una arena llena también lanza OverflowError.
+def test_should_raise_when_arena_is_full():
+    hash_table = SharedHashTable.create(capacity=64, arena_size=16)
+    try:
+        with pytest.raises(OverflowError):
+            hash_table["key"] = "x" * 100
+    finally:
+        hash_table.unlink()
+
+
+# No se puede adjuntar a un bloque que no sea una tabla compartida.
+def test_should_not_attach_to_other_blocks():
+    shm = multiprocessing.shared_memory.SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError):
+            SharedHashTable.attach(shm.name)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# Al serializar solo viaja el nombre y otro proceso busca en el mismo bloque.
+def test_should_be_shared_with_worker_processes(hash_table):
+    assert len(pickle.dumps(hash_table)) < 200
+    with multiprocessing.Pool(2) as pool:
+        results = pool.starmap(
+            lookup, [(hash_table, "hola"), (hash_table, "missing_key")]
+        )
+    assert results == ["hello", None]
+
+
+# Si el escritor muere a mitad de una escritura (secuencia impar), los
+# lectores dejan de esperarla tras WRITER_TIMEOUT segundos, una sola vez.
+def test_should_not_wait_for_dead_writer(hash_table, monkeypatch):
+    monkeypatch.setattr(shared_hashtable, "WRITER_TIMEOUT", 0.05)
+    hash_table._begin_write()
+    reader = SharedHashTable.attach(hash_table.name)
+    try:
+        assert reader["hola"] == "hello"
+        start = time.monotonic()
+        assert reader.get("missing_key") is None
+        assert time.monotonic() - start < 0.05
+    finally:
+        reader.close()